@@ -0,0 +1,88 @@
+"""Benchmark NbCache write/read.
+
+Compare the previous path: pickle of NbTree.model_dump() and NbTree(**tree_d) validation
+with the pickle and JSON lines shards loaded without validation,
+the read of the single model (other models are lazy) and the memory-mapped shards,
+objects are decoded on access.
+"""
+import pickle
+import tempfile
+import timeit
+from pathlib import Path
+
+from netbox3.nb_cache import NbCache
+from netbox3.nb_tree import NbTree
+
+REPEAT = 3
+
+
+def make_tree(count: int) -> NbTree:
+    """Create NbTree with ip-addresses and interfaces."""
+    tree = NbTree()
+    for idx in range(1, count + 1):
+        tree.ipam.ip_addresses[idx] = {  # pylint: disable=E1101
+            "id": idx,
+            "url": f"https://netbox/api/ipam/ip-addresses/{idx}/",
+            "address": f"10.{idx // 65536 % 256}.{idx // 256 % 256}.{idx % 256}/24",
+            "vrf": {"id": 1, "url": "https://netbox/api/ipam/vrfs/1/", "name": "VRF1"},
+            "tags": [{"id": 1, "name": "TAG1"}],
+            "custom_fields": {"env": "prod"},
+        }
+        tree.dcim.interfaces[idx] = {  # pylint: disable=E1101
+            "id": idx,
+            "url": f"https://netbox/api/dcim/interfaces/{idx}/",
+            "name": f"GigabitEthernet0/{idx}",
+            "device": {"id": 1, "url": "https://netbox/api/dcim/devices/1/", "name": "DEVICE1"},
+            "enabled": True,
+        }
+    return tree
+
+
+def write_previous(tree: NbTree, path: str) -> None:
+    """Previous path, full dump."""
+    with open(path, "wb") as fh:
+        pickle.dump({"tree": tree.model_dump(), "status": {}}, fh)
+
+
+def read_previous(path: str) -> NbTree:
+    """Previous path, pydantic validation."""
+    with open(path, "rb") as fh:
+        data = pickle.load(fh)
+    return NbTree(**data["tree"])
+
+
+for count in [10000, 100000]:
+    tree_ = make_tree(count)
+    with tempfile.TemporaryDirectory() as root:
+        path0 = str(Path(root, "previous.pickle"))
+        path1 = str(Path(root, "netbox.pickle"))
+        path2 = str(Path(root, "netbox.jsonl"))
+        path3 = str(Path(root, "netbox.mmap"))
+        cache1 = NbCache(tree=tree_, cache=path1)
+        cache2 = NbCache(tree=tree_, cache=path2)
+        cache3 = NbCache(tree=tree_, cache=path3)
+
+        w0 = min(timeit.repeat(lambda: write_previous(tree_, path0), number=1, repeat=REPEAT))
+        w1 = min(timeit.repeat(cache1.write_cache, number=1, repeat=REPEAT))
+        w2 = min(timeit.repeat(cache2.write_cache, number=1, repeat=REPEAT))
+        w3 = min(timeit.repeat(cache3.write_cache, number=1, repeat=REPEAT))
+        r0 = min(timeit.repeat(lambda: read_previous(path0), number=1, repeat=REPEAT))
+        r1 = min(timeit.repeat(NbCache(cache=path1).read_cache, number=1, repeat=REPEAT))
+        r2 = min(timeit.repeat(NbCache(cache=path2).read_cache, number=1, repeat=REPEAT))
+        r3 = min(timeit.repeat(lambda: NbCache(cache=path1).read_cache(models=["ipam"]),
+                               number=1, repeat=REPEAT))
+        r4 = min(timeit.repeat(NbCache(cache=path3).read_cache, number=1, repeat=REPEAT))
+        assert NbCache(cache=path2).read_cache()[0] == read_previous(path0)
+        tree3 = NbCache(cache=path3).read_cache()[0]
+        assert tree3.ipam.ip_addresses == tree_.ipam.ip_addresses  # pylint: disable=E1101
+
+        print(f"{count=} write: previous={w0:.3f}s pickle={w1:.3f}s jsonl={w2:.3f}s "
+              f"mmap={w3:.3f}s")
+        print(f"{count=} read:  previous={r0:.3f}s pickle={r1:.3f}s jsonl={r2:.3f}s "
+              f"pickle models=ipam {r3:.3f}s mmap={r4:.3f}s")
+# count=10000 write: previous=0.094s pickle=0.031s jsonl=0.018s mmap=0.062s
+# count=10000 read:  previous=0.051s pickle=0.032s jsonl=0.036s
+#   pickle models=ipam 0.014s mmap=0.001s
+# count=100000 write: previous=0.979s pickle=0.474s jsonl=0.187s mmap=0.504s
+# count=100000 read:  previous=0.700s pickle=0.392s jsonl=0.568s
+#   pickle models=ipam 0.236s mmap=0.000s
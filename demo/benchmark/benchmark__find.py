@@ -0,0 +1,40 @@
+"""Benchmark Forager.find_root().
+
+Compare the previous linear scan of all objects for each query
+with the lazily built secondary indexes.
+"""
+import timeit
+
+from netbox3.foragers.forager import _find
+from netbox3.foragers.indexer import Indexer
+
+QUERIES = 1000
+
+
+def make_objects(count: int) -> dict:
+    """Create interfaces of devices."""
+    return {
+        idx: {
+            "id": idx,
+            "name": f"GigabitEthernet0/{idx % 48}",
+            "device": {"id": idx // 48, "name": f"DEVICE{idx // 48}"},
+            "tags": [{"id": idx % 10, "name": f"TAG{idx % 10}"}],
+        }
+        for idx in range(1, count + 1)
+    }
+
+
+for count in [10000, 100000]:
+    objects_d = make_objects(count)
+    objects = list(objects_d.values())
+    names = [f"DEVICE{i % (count // 48)}" for i in range(QUERIES)]
+
+    t0 = timeit.timeit(lambda: [_find(objects, device__name=n, tags__name="TAG1")
+                                for n in names], number=1)
+    indexer = Indexer(objects_d)
+    t1 = timeit.timeit(lambda: [indexer.find(device__name=n, tags__name="TAG1")
+                                for n in names], number=1)
+    assert all(_find(objects, device__name=n) == indexer.find(device__name=n) for n in names[:10])
+    print(f"{count=} {QUERIES=} scan={t0:.3f}s index={t1:.3f}s")
+# count=10000 QUERIES=1000 scan=16.529s index=0.043s
+# count=100000 QUERIES=1000 scan=151.972s index=0.497s
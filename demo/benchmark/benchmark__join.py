@@ -0,0 +1,53 @@
+"""Benchmark Joiner.join_ipam_ipv4().
+
+Prefixes /16 /24 /28 with consistent depth and ip-addresses in the /28 prefixes.
+The previous nested loops over depth, ip-addresses and prefixes are compared
+with the prefix trie lookups, results in the comments below.
+"""
+import timeit
+
+from netbox3.foragers.joiner import Joiner
+from netbox3.nb_tree import NbTree
+
+
+def make_tree(count: int) -> NbTree:
+    """Create NbTree with aggregates, prefixes and ip-addresses."""
+    tree = NbTree()
+    tree.ipam.aggregates[1] = {"id": 1, "prefix": "10.0.0.0/8", "family": {"value": 4}}
+    id_ = 0
+    for idx in range(count):
+        for prefix, depth in [
+            (f"10.{idx // 256 % 256}.0.0/16", 0),
+            (f"10.{idx // 256 % 256}.{idx % 256}.0/24", 1),
+            (f"10.{idx // 256 % 256}.{idx % 256}.0/28", 2),
+        ]:
+            if depth == 0 and idx % 256:
+                continue
+            id_ += 1
+            tree.ipam.prefixes[id_] = {"id": id_, "prefix": prefix, "family": {"value": 4},
+                                       "vrf": None, "_depth": depth}
+        for host in range(1, 4):
+            id_ += 1
+            tree.ipam.ip_addresses[id_] = {
+                "id": id_,
+                "address": f"10.{idx // 256 % 256}.{idx % 256}.{host}/28",
+                "family": {"value": 4},
+                "vrf": None,
+            }
+    return tree
+
+
+for count in [1000, 10000]:
+    tree_ = make_tree(count)
+    seconds = timeit.timeit(lambda: Joiner(tree_).join_ipam_ipv4(), number=1)
+    prefixes = len(tree_.ipam.prefixes)  # pylint: disable=E1101
+    ip_addresses = len(tree_.ipam.ip_addresses)  # pylint: disable=E1101
+    print(f"{count=} {prefixes=} {ip_addresses=} join_ipam_ipv4={seconds:.3f}s")
+# previous nested loops:
+# count=1000 prefixes=2004 ip_addresses=3000 join_ipam_ipv4=193.760s
+# prefix trie:
+# count=1000 prefixes=2004 ip_addresses=3000 join_ipam_ipv4=0.422s
+# count=10000 prefixes=20040 ip_addresses=30000 join_ipam_ipv4=4.431s
+# prefix trie, IPv4 value type:
+# count=1000 prefixes=2004 ip_addresses=3000 join_ipam_ipv4=0.076s
+# count=10000 prefixes=20040 ip_addresses=30000 join_ipam_ipv4=0.776s
@@ -0,0 +1,74 @@
+"""Benchmark nb_tree.join_tree().
+
+Compare the previous deepcopy of the whole tree with the structural sharing
+(only the changed nested dictionaries are copied) and the in_place join.
+"""
+import time
+import tracemalloc
+from copy import deepcopy
+
+from netbox3 import nb_tree
+from netbox3.nb_tree import NbTree
+
+
+def make_tree(count: int) -> NbTree:
+    """Create NbTree with devices, interfaces and ip-addresses."""
+    tree = NbTree()
+    for idx in range(1, count + 1):
+        device = {"id": idx // 10 + 1, "url": f"/api/dcim/devices/{idx // 10 + 1}/"}
+        interface = {"id": idx, "url": f"/api/dcim/interfaces/{idx}/"}
+        tree.dcim.devices[device["id"]] = {  # pylint: disable=E1101
+            **device,
+            "name": f"DEVICE{device['id']}",
+            "custom_fields": {"env": {"name": "prod", "values": list(range(5))}},
+            "tags": [{"id": 1, "name": "TAG1", "slug": "tag1"}],
+        }
+        tree.dcim.interfaces[idx] = {  # pylint: disable=E1101
+            **interface,
+            "name": f"GigabitEthernet0/{idx}",
+            "device": dict(device),
+            "custom_fields": {"description": {"text": "uplink", "values": list(range(5))}},
+        }
+        tree.ipam.ip_addresses[idx] = {  # pylint: disable=E1101
+            "id": idx,
+            "url": f"/api/ipam/ip-addresses/{idx}/",
+            "address": f"10.{idx // 65536 % 256}.{idx // 256 % 256}.{idx % 256}/24",
+            "assigned_object_id": idx,
+            "assigned_object": dict(interface),
+            "custom_fields": {"owner": {"name": "noc", "values": list(range(5))}},
+        }
+    return tree
+
+
+def measure(func) -> str:
+    """Time and peak memory."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return f"{seconds:.3f}s peak={peak / 2 ** 20:.0f}MiB"
+
+
+for count in [10000, 100000]:
+    tree_ = make_tree(count)
+    previous = measure(lambda: nb_tree.join_tree(deepcopy(tree_), in_place=True))
+    sharing = measure(lambda: nb_tree.join_tree(tree_))
+    in_place = measure(lambda: nb_tree.join_tree(tree_, in_place=True))
+    print(f"{count=} deepcopy: {previous}")
+    print(f"{count=} sharing:  {sharing}")
+    print(f"{count=} in_place: {in_place}")
+# count=10000 deepcopy: 2.212s peak=28MiB
+# count=10000 sharing:  0.750s peak=13MiB
+# count=10000 in_place: 0.594s peak=2MiB
+# count=100000 deepcopy: 24.414s peak=272MiB
+# count=100000 sharing:  12.038s peak=130MiB
+# count=100000 in_place: 7.096s peak=23MiB
+# UrlIndex, URLs are pre-indexed, each other URL is parsed once:
+# count=10000 deepcopy: 2.399s peak=28MiB
+# count=10000 sharing:  0.723s peak=14MiB
+# count=10000 in_place: 0.376s peak=4MiB
+# count=100000 deepcopy: 23.475s peak=272MiB
+# count=100000 sharing:  6.037s peak=150MiB
+# count=100000 in_place: 3.649s peak=41MiB
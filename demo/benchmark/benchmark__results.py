@@ -0,0 +1,50 @@
+"""Benchmark deduplication of Netbox objects.
+
+Compare the previous path: sorted() by id and vlist.no_dupl()
+with the id-keyed Results accumulator.
+"""
+import random
+import timeit
+from operator import itemgetter
+
+from vhelpers import vlist
+
+from netbox3.api.results import Results
+
+REPEAT = 3
+
+
+def make_pages(count: int, overlap: float, limit: int = 1000) -> list:
+    """Create pages of Netbox objects where part of the objects is duplicated."""
+    objects = [{"id": i, "url": f"/api/ipam/ip-addresses/{i}", "address": "10.0.0.1/24"}
+               for i in range(count)]
+    duplicates = random.sample(objects, int(count * overlap))
+    items = objects + duplicates
+    random.shuffle(items)
+    return [items[i:i + limit] for i in range(0, len(items), limit)]
+
+
+def no_dupl(pages: list) -> list:
+    """Previous path."""
+    items = [d for page in pages for d in page]
+    items = sorted(items, key=itemgetter("id"))
+    return vlist.no_dupl(items)
+
+
+def results(pages: list) -> list:
+    """Results accumulator path."""
+    results_ = Results()
+    for page in pages:
+        results_.extend(page)
+    return results_.objects()
+
+
+for count in [1000, 5000, 20000]:
+    pages_ = make_pages(count=count, overlap=0.1)
+    assert no_dupl(pages_) == results(pages_)
+    seconds1 = min(timeit.repeat(lambda: no_dupl(pages_), number=1, repeat=REPEAT))
+    seconds2 = min(timeit.repeat(lambda: results(pages_), number=1, repeat=REPEAT))
+    print(f"{count=} no_dupl={seconds1:.4f}s Results={seconds2:.4f}s x{seconds1 / seconds2:.0f}")
+# count=1000 no_dupl=0.0215s Results=0.0003s x84
+# count=5000 no_dupl=0.4806s Results=0.0019s x259
+# count=20000 no_dupl=10.1085s Results=0.0092s x1093
@@ -9,16 +9,19 @@ logging.getLogger().addHandler(logging.StreamHandler())
 
 HOST = "demo.netbox.dev"
 TOKEN = "1234567890123456789012345678901234567890"
-nb = NbApi(host=HOST, token=TOKEN)
+nb = NbApi(host=HOST, token=TOKEN, threads=4, batch_size=100)
 
 
 def create__ipam__ip_addresses():
     """Create /ipam/ip-addresses objects."""
+    items = []
     for idx1 in range(10 + 1):
         for idx2 in range(255 + 1):
             address = f"10.200.{idx1}.{idx2}/24"
-            response = nb.ipam.ip_addresses.create(address=address)
-            print(response, address)
+            items.append({"address": address})
+    outcomes = nb.ipam.ip_addresses.create_bulk(items)
+    for outcome in outcomes:
+        print(outcome.status_code, outcome.data["address"], outcome.error)
 
 
 if __name__ == "__main__":
@@ -20,7 +20,7 @@ nbf.join_tree()
 aggregate = nbf.ipam.aggregates.find_tree(family__value=4)[0]
 print(f"aggregate ipv4: ", aggregate["ipv4"])
 print(f"aggregate sub_prefixes: ", [d["prefix"] for d in aggregate["sub_prefixes"]])
-# aggregate ipv4:  <IPv4Obj 10.0.0.0/8>
+# aggregate ipv4:  <IPv4 10.0.0.0/8>
 # aggregate sub_prefixes:  ['10.3.0.0/23', '10.3.0.0/23', '10.3.0.0/23', ...
 
 prefix = nbf.ipam.prefixes.find_tree(family__value=4, vrf=None)[0]
@@ -28,7 +28,7 @@ print(f"prefix ipv4: ", prefix["ipv4"])
 print(f"prefix aggregate: ", prefix["aggregate"].get("prefix"))
 print(f"prefix super_prefix: ", prefix["super_prefix"].get("prefix"))
 print(f"prefix sub_prefixes: ", [d["prefix"] for d in prefix["sub_prefixes"]])
-# prefix ipv4:  <IPv4Obj 10.112.0.0/15>
+# prefix ipv4:  <IPv4 10.112.0.0/15>
 # prefix aggregate:  10.0.0.0/8
 # prefix super_prefix:  None
 # prefix sub_prefixes:  ['10.112.0.0/17', '10.112.128.0/17']
@@ -36,5 +36,5 @@ print(f"prefix sub_prefixes: ", [d["prefix"] for d in prefix["sub_prefixes"]])
 ip_address = nbf.ipam.ip_addresses.find_tree(family__value=4, vrf=None)[0]
 print(f"ip_address ipv4: ", ip_address["ipv4"])
 print(f"ip_address super_prefix: ", ip_address["super_prefix"].get("prefix"))
-# ip_address ipv4:  <IPv4Obj 10.3.0.1/24>
+# ip_address ipv4:  <IPv4 10.3.0.1/24>
 # ip_address super_prefix:  10.3.0.0/24
@@ -45,3 +45,12 @@ pprint(nbf.status["meta"])
 # {"host": "demo.netbox.dev",
 #  "url": "https://demo.netbox.dev/api/",
 #  "write_time": "2020-12-31 23:59:59"}
+
+# Load only the required models, other models are loaded on the first access.
+nbf = NbForager(host=HOST, cache=CACHE)
+nbf.read_cache(models=["ipam.aggregates"])
+print(nbf.root.tenancy.lazy_models())  # ["tenant_groups"]
+pprint(nbf.root.tenancy.tenant_groups)
+# {1: {"id": 1,
+#      "name": "Customers",
+#      ...
@@ -4,29 +4,37 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import re
 import time
 import urllib
-from operator import itemgetter
-from queue import Queue
-from threading import Thread
-from typing import Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import partial
+from typing import Any, Callable, Iterator, Optional
 from urllib.parse import urlencode, ParseResult
 
 import netports
-import requests
 from requests import Session, Response
-from requests.exceptions import ReadTimeout, ConnectionError as RequestsConnectionError
+from requests.exceptions import ConnectTimeout, ReadTimeout, RequestException, Timeout
+from requests.exceptions import ConnectionError as RequestsConnectionError
 from vhelpers import vdict, vlist, vparam
 
 from netbox3 import helpers as h
 from netbox3.api import extended_get
 from netbox3.api.extended_get import ParamPath, DParamPath
+from netbox3.api.http_cache import CachedPage, ResponseCache, init_response_cache
+from netbox3.api.id_cache import IdCache
+from netbox3.api.limiter import Limiter, TokenBucket, init_limiter, init_pacer
+from netbox3.api.results import Results
+from netbox3.api.retry import RetryPolicy, init_retry_policy, init_retry_statuses
+from netbox3.api.session import init_session
 from netbox3.exceptions import NbApiError
-from netbox3.types_ import DAny, DStr, LDAny, LStr, DLInt, DList, LDList, DLStr, DDAny
-from netbox3.types_ import TLists, OUParam, LParam
+from netbox3.types_ import DAny, DStr, LDAny, LInt, LStr, DLInt, DList, LDList, DLStr, DDAny, LLDAny
+from netbox3.types_ import TLists, OUParam, LParam, LCallable
 
 LONERS: DLStr = {
     "any": ["q"],
@@ -60,11 +68,24 @@ class BaseC:
         "verify",
         "limit",
         "url_length",
+        "batch_size",
         "threads",
         "interval",
+        "preflight",
+        "rate_limit",
+        "burst",
+        "max_in_flight",
         "timeout",
         "max_retries",
         "sleep",
+        "max_sleep",
+        "retry_statuses",
+        "deadline",
+        "http_cache",
+        "http_cache_ttl",
+        "http_cache_size",
+        "http_cache_dir",
+        "id_cache_ttl",
         "default_get",
         "loners",
     ]
@@ -123,13 +144,34 @@ class BaseC:
             if the URL length exceeds maximum length due to a long list of
             GET parameters. Default is `2047`.
 
+        :param int batch_size: Split the bulk create/update/delete to multiple requests
+            if the count of objects exceeds this value. Default is `100`.
+
         :param int threads: Threads count. <=1 is loop mode, >=2 is threading mode.
             Default id `1`.
 
         :param float interval: Wait this time between the threading requests (seconds).
+            Paces the start of the threads, the first `threads` requests of each threaded
+            query, the next requests are sent as the threads become free.
             Default is `0`. Useful to optimize session spikes and achieve
             script stability in Docker with limited resources.
 
+        :param bool preflight: Threading mode pagination.
+            `True` - Request the count of objects (brief=1&limit=1) before requesting the pages,
+            `False` - Request the first page, get the count of objects from it and
+            request only the remaining pages in parallel. Saves one request per query.
+            Default is `True`.
+
+        :param float rate_limit: Maximum count of requests per second to the Netbox,
+            shared by all threads and connectors. Default is `0` no limit.
+
+        :param int burst: Count of requests that can be sent at once above the `rate_limit`.
+            Default is `1`.
+
+        :param int max_in_flight: Maximum count of requests being processed by the Netbox
+            at the same time, shared by all threads and connectors. Default is `0` no limit.
+            Protects the Netbox workers from overload when many threads are used.
+
         :param int timeout: Session timeout (seconds). Default is `60`.
 
         :param int max_retries: Retries the request multiple times if the Netbox API
@@ -138,16 +180,48 @@ class BaseC:
             not stable.
 
         :param int sleep: Interval (seconds) before the next retry after
-            session timeout reached. Default is `10`.
+            session timeout reached or retryable status code received. The interval grows
+            exponentially with random jitter on each next retry. Default is `10`.
+
+        :param int max_sleep: Maximum interval (seconds) between retries. Default is `60`.
+
+        :param list retry_statuses: Status codes of the Netbox response that need to retry,
+            the `Retry-After` header of 429 and 503 is honoured.
+            Default is `[429, 502, 503, 504]`.
+
+        :param int deadline: Overall time limit (seconds) of the request with all retries.
+            Default is `0` no limit.
 
         :param bool strict: When querying objects by tag, if there are no tags present,
             the Netbox API response returns a status_code=400. True - ConnectionError is
             raised when status_code=400. False - a warning message is logged and an
             empty list is returned with status_code=200. Default is `False`.
 
+        :param bool http_cache: Cache the GET responses in the connector layer.
+            `True` - Fresh cached responses are returned without request, stale responses
+            are revalidated by the Netbox using ETag/Last-Modified headers,
+            `False` - Do not cache. Default is `False`. Useful for the reference models
+            that rarely change, such as dcim/device-types/ or extras/content-types/.
+
+        :param int http_cache_ttl: Time (seconds) during which the cached response is
+            returned without revalidation. Default is `0` always revalidate.
+
+        :param int http_cache_size: Maximum total size (bytes) of the cached responses
+            in memory and on disk, the least recently used responses are evicted.
+            Default is `100_000_000` (100MB).
+
+        :param str http_cache_dir: Path to the directory to store the cached responses
+            on disk (JSON files separated by the token hash), to be reused by the next runs.
+            The directory must be writable only by the user, the files are trusted
+            as the Netbox responses. Default is `""` memory only.
+
         :param bool extended_get: True - Extend filtering parameters in GET request,
             ``{parameter}`` can be used instead of ``{parameter}_id``. Default is `True`.
 
+        :param int id_cache_ttl: Time (seconds) during which the ids resolved by
+            the extended filtering parameters are reused by the next requests.
+            Default is `0` do not cache.
+
         :param dict default_get: Set default filtering parameters, to be used in each
             GET request.
 
@@ -160,23 +234,45 @@ class BaseC:
         self.verify: bool = _init_verify(**kwargs)
         self.limit: int = int(kwargs.get("limit") or 1000)
         self.url_length = int(kwargs.get("url_length") or 2047)
+        self.batch_size: int = max(int(kwargs.get("batch_size") or 100), 1)
         # Multithreading
         self.threads: int = _init_threads(**kwargs)
         self.interval: float = float(kwargs.get("interval") or 0.0)
+        self.preflight: bool = _init_preflight(**kwargs)
+        self.rate_limit: float = float(kwargs.get("rate_limit") or 0.0)
+        self.burst: int = int(kwargs.get("burst") or 1)
+        self.max_in_flight: int = int(kwargs.get("max_in_flight") or 0)
         # Errors processing
         self.timeout: float = float(kwargs.get("timeout") or 60)
         self.max_retries: int = int(kwargs.get("max_retries") or 0)
         self.sleep: float = float(kwargs.get("sleep") or 10)
+        self.max_sleep: float = float(kwargs.get("max_sleep") or 60)
+        self.retry_statuses: LInt = init_retry_statuses(kwargs.get("retry_statuses"))
+        self.deadline: float = float(kwargs.get("deadline") or 0)
         self.strict: bool = bool(kwargs.get("strict"))
+        # Response cache
+        self.http_cache: bool = bool(kwargs.get("http_cache"))
+        self.http_cache_ttl: float = float(kwargs.get("http_cache_ttl") or 0)
+        self.http_cache_size: int = int(kwargs.get("http_cache_size") or 100_000_000)
+        self.http_cache_dir: str = str(kwargs.get("http_cache_dir") or "")
         # Settings
         self.extended_get: bool = bool(kwargs.get("extended_get"))
+        self.id_cache_ttl: float = float(kwargs.get("id_cache_ttl") or 0)
         self.default_get: DDAny = dict(kwargs.get("default_get") or {})
         self.loners: DLStr = dict(kwargs.get("loners") or {})
 
         self._default_get: DList = self._init_default_get()
         self._loners: LStr = self._init_loners()
-        self._results: LDAny = []  # cache for received objects from Netbox
-        self._session: Session = requests.session()
+        self._session: Session = kwargs.get("session") or init_session(self.threads)
+        self._executor: Executor = kwargs.get("executor") or init_executor(self.threads)
+        self._pacer: TokenBucket = kwargs.get("pacer") or init_pacer(self.interval)
+        self._limiter: Limiter = kwargs.get("limiter") or init_limiter(**kwargs)
+        self._retry_policy: RetryPolicy = init_retry_policy(**kwargs)
+        id_cache: Optional[IdCache] = kwargs.get("id_cache")
+        self._id_cache: IdCache = IdCache(ttl=self.id_cache_ttl) if id_cache is None else id_cache
+        self._response_cache: Optional[ResponseCache] = kwargs.get("response_cache")
+        if self._response_cache is None:
+            self._response_cache = init_response_cache(**kwargs)
 
     def __repr__(self) -> str:
         """__repr__."""
@@ -232,7 +328,7 @@ class BaseC:
 
         :return: A list of the Netbox objects.
         """
-        self._results = []
+        results = Results()  # request context, objects of this call only
 
         # slice params
         params_ld = h.slice_params_ld(
@@ -244,28 +340,91 @@ class BaseC:
 
         # threads
         if self.threads > 1:
-            counts_w_params: LDAny = self._query_pages_count(params_ld)
-            params_ld_: LDAny = self._slice_params_counters(counts_w_params)
-            self._query_threads(method=self._query_data_thread, params_ld=params_ld_)
+            if self.preflight:
+                counts_w_params: LDAny = self._query_pages_count(params_ld)
+                params_ld_: LDAny = self._slice_params_counters(counts_w_params)
+            else:
+                first_pages: LDAny = self._query_first_pages(params_ld)
+                params_ld_ = self._slice_params_remaining(first_pages)
+                for first_page in first_pages:
+                    results.extend(first_page["results"])
+            pages: LLDAny = self._query_threads(method=self._request_data, params_ld=params_ld_)
+            for page in pages:
+                results.extend(page)
         # loop
         else:
             for params_d in params_ld:
-                results_: LDAny = self._query_loop(self.path, params_d)
-                self._results.extend(results_)
+                for results_ in self._iter_loop(self.path, params_d):
+                    results.extend(results_)
 
-        # save
-        results: LDAny = sorted(self._results, key=itemgetter("id"))
-        results = vlist.no_dupl(results)
-        self._results = []
-        return results
+        return results.objects()
+
+    async def _aquery_params_ld(self, params_ld: LDList) -> LDAny:
+        """Retrieve data from the Netbox in asyncio mode.
 
-    def _query_count(self, path: str, params_d: DAny) -> None:
-        """Retrieve counters of interested objects from the Netbox.
+        Runs the same slice, count, offset pipeline as the threading mode,
+        the number of requests in flight is limited by the threads count.
+
+        :param params_ld: Parameters to request from the Netbox.
+
+        :return: A list of the Netbox objects.
+        """
+        # slice params
+        params_ld = h.slice_params_ld(
+            url=self.url,
+            max_len=self.url_length,
+            keys=self._slices,
+            params_ld=params_ld,
+        )
+
+        semaphore = asyncio.Semaphore(self.threads)
+        pages: LLDAny = []
+        if self.preflight:
+            counts_w_params: LDAny = await self._arun(semaphore, self._request_count, params_ld)
+            params_ld_: LDAny = self._slice_params_counters(counts_w_params)
+        else:
+            first_pages: LDAny = await self._arun(semaphore, self._request_first_page, params_ld)
+            params_ld_ = self._slice_params_remaining(first_pages)
+            pages.extend([d["results"] for d in first_pages])
+        pages_: LLDAny = await self._arun(semaphore, self._request_data, params_ld_)
+        pages.extend(pages_)
+
+        results = Results()
+        for page in pages:
+            results.extend(page)
+        return results.objects()
+
+    async def _arun(
+        self,
+        semaphore: asyncio.Semaphore,
+        method: Callable,
+        params_ld: LDAny,
+    ) -> list:
+        """Run blocking request method in executor, limited by semaphore.
+
+        :param semaphore: Limits the number of requests in flight.
+        :param method: Method that need call with parameters.
+        :param params_ld: Parameters to request from the Netbox, one request per item.
+
+        :return: Results of the method, in the same order as the parameters.
+        """
+        loop = asyncio.get_running_loop()
+
+        async def run(idx: int, params_d: DAny) -> Any:
+            async with semaphore:
+                task = partial(method, self.path, params_d)
+                pace = idx < self.threads
+                return await loop.run_in_executor(self._executor, self._run_task, task, pace)
+
+        return list(await asyncio.gather(*[run(i, d) for i, d in enumerate(params_ld)]))
+
+    def _request_count(self, path: str, params_d: DAny) -> DAny:
+        """Request counter of interested objects from the Netbox.
 
         :param path: Section of the URL that points to the model.
         :param params_d: Parameters to request from the Netbox.
 
-        :return: None. Update self object.
+        :return: Dictionary with count and related parameters.
         """
         params_d_ = params_d.copy()
         params_d_["brief"] = 1
@@ -280,8 +439,32 @@ class BaseC:
             data: DAny = json.loads(html)
             count = int(data["count"])
 
-        result = {"count": count, "params_d": params_d}
-        self._results.append(result)
+        return {"count": count, "params_d": params_d}
+
+    def _request_first_page(self, path: str, params_d: DAny) -> DAny:
+        """Request the first page and counter of interested objects from the Netbox.
+
+        :param path: Section of the URL that points to the model.
+        :param params_d: Parameters to request from the Netbox.
+
+        :return: Dictionary with count, related parameters and objects of the first page.
+        """
+        params_d_ = params_d.copy()
+        params_d_["limit"] = self.limit
+        params_d_["offset"] = 0
+        params_l: LParam = vparam.from_dict(params_d_)
+        url = f"{self.url_base}{path}?{urlencode(params_l)}"
+        response: Response = self._retry_requests(url)
+
+        count = 0
+        results: LDAny = []
+        if response.ok:
+            html: str = response.content.decode("utf-8")
+            data: DAny = json.loads(html)
+            count = int(data["count"])
+            results = list(data["results"])
+
+        return {"count": count, "params_d": params_d, "results": results}
 
     def _query_loop(self, path: str, params_d: DList) -> LDAny:
         """Retrieve data from Netbox in loop mode.
@@ -292,29 +475,45 @@ class BaseC:
         :param path: Section of the URL that points to the model.
         :param params_d: Parameters to request from the Netbox.
 
-        :return: Netbox objects. Update self _results.
+        :return: Netbox objects.
+        """
+        results: LDAny = []
+        for results_ in self._iter_loop(path, params_d):
+            results.extend(results_)
+        return results
+
+    def _iter_loop(self, path: str, params_d: DList) -> Iterator[LDAny]:
+        """Retrieve data from Netbox in loop mode, page by page.
+
+        The next page is requested only when the previous one has been consumed.
+
+        :param path: Section of the URL that points to the model.
+        :param params_d: Parameters to request from the Netbox.
+
+        :return: Generator of Netbox objects, one list per page.
         """
         offset = 0
         max_limit: int = self._set_limit(params_d)
         params_l: LParam = vparam.from_dict(params_d)
 
-        results: LDAny = []
+        count = 0
         while True:
             params_i = [*params_l, ("offset", offset)]
             url = f"{self.url_base}{path}?{urlencode(params_i)}"
             response: Response = self._retry_requests(url)
+            results_: LDAny = []
             if response.ok:
                 html: str = response.content.decode("utf-8")
                 data: DAny = json.loads(html)
-                results_: LDAny = list(data["results"])
-                results.extend(results_)
-            else:
-                results_ = []
+                results_ = list(data["results"])
+            count += len(results_)
+            if results_:
+                yield results_
 
             # stop requests if limit reached
             if self.limit != len(results_):
                 break
-            if max_limit and max_limit <= len(results):
+            if max_limit and max_limit <= count:
                 break
 
             # next iteration
@@ -322,8 +521,6 @@ class BaseC:
                 time.sleep(self.interval)
             offset += self.limit
 
-        return results
-
     def _set_limit(self, params_d: DList) -> int:
         """Update limit valur in params_d based on limit and max_limit
 
@@ -342,25 +539,22 @@ class BaseC:
         params_d["limit"] = [limit]
         return max_limit
 
-    def _query_data_thread(self, path: str, params_d: DAny) -> None:
-        """Retrieve data from the Netbox.
-
-        If the number of items in the result exceeds the limit, iterate through the offset
-        in a loop mode.
+    def _request_data(self, path: str, params_d: DAny) -> LDAny:
+        """Request a single page of data from the Netbox.
 
         :param path: Section of the URL that points to the model.
         :param params_d: Parameters to request from the Netbox.
 
-        :return: Netbox objects. Update self _results.
+        :return: Netbox objects.
         """
         params_l: LParam = vparam.from_dict(params_d)
         url = f"{self.url_base}{path}?{urlencode(params_l)}"
         response: Response = self._retry_requests(url)
-        if response.ok:
-            html: str = response.content.decode("utf-8")
-            data: DAny = json.loads(html)
-            results_: LDAny = list(data["results"])
-            self._results.extend(results_)
+        if not response.ok:
+            return []
+        html: str = response.content.decode("utf-8")
+        data: DAny = json.loads(html)
+        return list(data["results"])
 
     def _query_pages_count(self, params_ld: LDList) -> LDAny:
         """Retrieve counters of interested objects from Netbox in threaded mode.
@@ -369,45 +563,57 @@ class BaseC:
 
         :return: List of dict with counters and parameters of interested objects.
         """
-        self._results = []
-        self._query_threads(method=self._query_count, params_ld=params_ld)
-        results: LDAny = self._results
-        self._results = []
-        return results
+        return self._query_threads(method=self._request_count, params_ld=params_ld)
 
-    def _query_threads(self, method: Callable, params_ld: LDAny) -> None:
+    def _query_first_pages(self, params_ld: LDList) -> LDAny:
+        """Retrieve the first pages and counters of interested objects in threaded mode.
+
+        :param params_ld: Parameters to request from the Netbox.
+
+        :return: List of dict with counters, parameters and objects of the first pages.
+        """
+        return self._query_threads(method=self._request_first_page, params_ld=params_ld)
+
+    def _query_threads(self, method: Callable, params_ld: LDAny) -> list:
         """Retrieve data from Netbox in threaded mode.
 
         :param method: Method that need call with parameters.
         :param params_ld: Parameters to request from the Netbox.
 
-        :return: None. Save results to self._results.
+        :return: Results of the method calls, collected for this call only.
         """
-        queue: Queue = Queue()
-        for params_d in params_ld:
-            queue.put((method, params_d))
+        tasks: LCallable = [partial(method, self.path, d) for d in params_ld]
+        return self._run_tasks(tasks)
 
-        for idx in range(self.threads):
-            if self.interval:
-                time.sleep(self.interval)
-            thread = Thread(name=f"Thread-{idx}", target=self._run_queue, args=(queue,))
-            thread.start()
-        queue.join()
+    def _run_tasks(self, tasks: LCallable) -> list:
+        """Run tasks in the worker pool shared by all connectors.
 
-    def _run_queue(self, queue: Queue) -> None:
-        """Process tasks from the queue.
+        :param tasks: Callables without arguments.
 
-        This method dequeues and executes tasks until the queue is empty.
-        Each task is expected to be a callable method with its corresponding params_d parameters.
+        :return: Results of the tasks in the same order.
 
-        :param queue: A queue containing (method, params_d) pairs to be executed.
+        :raise: The exception of the first failed task.
+        """
+        futures = [
+            self._executor.submit(self._run_task, task, idx < self.threads)
+            for idx, task in enumerate(tasks)
+        ]
+        return [future.result() for future in futures]
+
+    def _run_task(self, task: Callable, pace: bool = False) -> Any:
+        """Run the task, the first tasks of the call wait for the pacer.
+
+        Only the first `threads` tasks of the call are paced by `interval`,
+        like the start of the threads, the next tasks are run without waiting.
 
-        :return: None. Update self _results list.
+        :param task: Callable without arguments.
+        :param pace: True - wait for the pacer before the task, False - run right away.
+
+        :return: Result of the task.
         """
-        while not queue.empty():
-            method, params_d = queue.get()
-            method(self.path, params_d)
-            queue.task_done()
+        if pace:
+            self._pacer.acquire()
+        return task()
 
     # ============================== helper ==============================
 
@@ -444,59 +650,200 @@ class BaseC:
         raise ConnectionError(f"Netbox server error: {msg}")
 
     def _retry_requests(self, url: str) -> Response:
-        """Retry multiple requests if the session times out.
+        """Retry multiple requests if the session times out or Netbox is overloaded.
 
         Multiple requests are useful if Netbox is overloaded and cannot process the request
-        right away, but can do so after a sleep interval.
+        right away, but can do so after a sleep interval. The delay between attempts grows
+        exponentially with jitter, `Retry-After` header of 429 and 503 responses is honoured.
+        Timeouts and connection errors are retried the same way as in _retry_write().
+        If the response cache is enabled, fresh cached pages are returned without request
+        and stale pages are revalidated by If-None-Match/If-Modified-Since headers.
 
         :param url: The URL that needs to be requested.
 
         :return: The response.
 
-        :raise: ConnectionError if the limit of retries is reached.
+        :raise: ConnectionError if the status code is not retryable or the limit
+            of retries is reached on the retryable status code or the connection error.
+        """
+        cache: Optional[ResponseCache] = self._response_cache
+        page: Optional[CachedPage] = None
+        headers: DStr = self._headers()
+        if cache is not None:
+            page = cache.get(url)
+            if page is not None:
+                if cache.is_fresh(page):
+                    return page.response()
+                headers.update(page.headers())
+
+        policy: RetryPolicy = self._retry_policy
+        start = time.monotonic()
+        attempt = 0
+        connection_error: Optional[RequestsConnectionError] = None
+        while True:
+            attempt += 1
+            response: Optional[Response] = None
+            connection_error = None
+            try:
+                with self._limiter:
+                    response = self._session.get(
+                        url=url,
+                        headers=headers,
+                        verify=self.verify,
+                        timeout=self.timeout,
+                    )
+            except (ReadTimeout, ConnectTimeout) as ex:
+                attempts = f"{attempt} of {policy.max_retries}"
+                error = type(ex).__name__
+                msg = f"Session timeout={self.timeout!r}sec reached, {error=}, {attempts=}."
+                logging.warning(msg)
+            except RequestsConnectionError as ex:
+                connection_error = ex
+                attempts = f"{attempt} of {policy.max_retries}"
+                logging.warning(f"Netbox connection error: {ex}, {attempts=}.")
+            else:
+                if cache is not None:
+                    if response.status_code == 304 and page is not None:
+                        return cache.revalidated(page)
+                    cache.put(url, response)
+                if response.ok:
+                    return response
+                if not policy.is_retry_status(response):
+                    return self._check_status_code(response)
+                attempts = f"{attempt} of {policy.max_retries}"
+                msg = self._msg_status_code(response)
+                logging.warning(f"{msg}, {attempts=}.")
+
+            delay = policy.delay(attempt, response)
+            if not policy.is_allowed(attempt=attempt, start=start, delay=delay):
+                break
+            logging.warning(f"Next attempt after sleep={delay:.1f}sec.")
+            time.sleep(delay)
+
+        if response is not None:
+            return self._check_status_code(response)
+        if connection_error is not None:
+            raise ConnectionError(f"Netbox connection error: {connection_error}")
+        msg = f"max_retries={policy.max_retries!r} reached."
+        logging.warning(msg)
+        return make_response(status_code=504, content=str.encode(msg))  # Gateway Timeout
+
+    def _retry_write(
+        self,
+        method: str,
+        url: str,
+        payload: Callable[[], Any],
+        before_retry: Callable[[], Optional[Response]],
+    ) -> Response:
+        """Send the write request, retry if the session times out or Netbox is overloaded.
+
+        The result of the timed out request is unknown, the objects may have been written.
+        Before each retry, the cached responses of the model are invalidated and
+        `before_retry` checks the objects in Netbox to avoid duplicates.
+        Uses the same retry policy as the GET requests, timeouts and connection errors
+        are retried. If Netbox is unreachable for the check, the result is unknown.
+
+        :param method: HTTP method: "post", "patch", "delete".
+        :param url: The URL that needs to be requested.
+        :param payload: Returns the data to send (None - no body), called before each attempt.
+        :param before_retry: Idempotency check, called before each retry.
+            Returns the response if no need to retry, None otherwise.
+
+        :return: The response of the last attempt. Response status_code=504
+            if the limit of retries is reached without response or the result is unknown.
         """
-        max_retries = self.max_retries + 1
-        counter = 0
-        while counter < max_retries:
-            counter += 1
+        policy: RetryPolicy = self._retry_policy
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            if attempt > 1:
+                self._invalidate_caches()  # the previous attempt may have written objects
+                try:
+                    response_ = before_retry()
+                except ConnectionError as ex:  # Netbox is unreachable, the result is unknown
+                    msg = f"Result unknown, {ex}"
+                    return make_response(status_code=504, content=msg.encode())
+                if response_ is not None:
+                    return response_
+            response: Optional[Response] = None
+            data = payload()
+            request: Callable = getattr(self._session, method)
             try:
-                response: Response = self._session.get(
-                    url=url,
+                with self._limiter:
+                    response = request(
+                        url=url,
+                        data=None if data is None else json.dumps(data),
+                        headers=self._headers(),
+                        verify=self.verify,
+                        timeout=self.timeout,
+                    )
+            except (Timeout, RequestsConnectionError) as ex:
+                msg = f"Netbox {method.upper()} {url} {type(ex).__name__}: {ex}"
+            else:
+                if not policy.is_retry_status(response):
+                    return response
+                msg = self._msg_status_code(response)
+            attempts = f"{attempt} of {policy.max_retries}"
+            logging.warning(f"{msg}, {attempts=}.")
+
+            delay = policy.delay(attempt, response)
+            if not policy.is_allowed(attempt=attempt, start=start, delay=delay):
+                break
+            logging.warning(f"Next attempt after sleep={delay:.1f}sec.")
+            time.sleep(delay)
+
+        if response is not None:
+            return response
+        return make_response(status_code=504, content=str.encode(msg))  # Gateway Timeout
+
+    def _invalidate_caches(self) -> None:
+        """Invalidate the cached ids and GET responses of the model after the write.
+
+        :return: None. Update the caches.
+        """
+        self._id_cache.invalidate(self.path)
+        if self._response_cache is not None:
+            self._response_cache.invalidate(self.url)
+
+    def _server_time(self) -> Optional[datetime]:
+        """Get the current time of the Netbox server from the Date header of the status page.
+
+        The response cache and the retries are skipped, the time must be current.
+
+        :return: Timezone-aware UTC time, None if the Date header is unavailable.
+        """
+        try:
+            with self._limiter:
+                response = self._session.get(
+                    url=f"{self.url_base}status/",
                     headers=self._headers(),
                     verify=self.verify,
                     timeout=self.timeout,
                 )
-            except ReadTimeout:
-                attempts = f"{counter} of {self.max_retries}"
-                msg = f"Session timeout={self.timeout!r}sec reached, {attempts=}."
-                logging.warning(msg)
-                if counter < max_retries:
-                    msg = f"Next attempt after sleep={self.sleep}sec."
-                    logging.warning(msg)
-                    time.sleep(self.sleep)
-                continue
-            except RequestsConnectionError as ex:
-                raise ConnectionError(f"Netbox connection error: {ex}") from ex
+            return parsedate_to_datetime(response.headers["Date"]).astimezone(timezone.utc)
+        except (RequestException, KeyError, TypeError, ValueError):
+            return None
 
-            if response.ok:
-                return response
-            msg = self._msg_status_code(response)
-            if self._is_status_code_5xx(response):
-                raise ConnectionError(f"Netbox server error: {msg}.")
-            if self._is_status_code_403_credentials_error(response):
-                raise ConnectionError(f"Netbox credentials error: {msg}.")
-            if self._is_status_code_400(response):
-                if self.strict:
-                    logging.warning(msg)
-                    return response
-            raise ConnectionError(f"ConnectionError: {msg}.")
+    def _check_status_code(self, response: Response) -> Response:
+        """Check the status code of the response that is not OK.
 
-        msg = f"max_retries={self.max_retries!r} reached."
-        logging.warning(msg)
-        response = Response()
-        response.status_code = 504  # Gateway Timeout
-        response._content = str.encode(msg)  # pylint: disable=protected-access
-        return response
+        :param response: The response.
+
+        :return: The response with status_code=400 if strict=True.
+
+        :raise: ConnectionError if the status code is an error.
+        """
+        msg = self._msg_status_code(response)
+        if self._is_status_code_5xx(response):
+            raise ConnectionError(f"Netbox server error: {msg}.")
+        if self._is_status_code_403_credentials_error(response):
+            raise ConnectionError(f"Netbox credentials error: {msg}.")
+        if self._is_status_code_400(response):
+            if self.strict:
+                logging.warning(msg)
+                return response
+        raise ConnectionError(f"ConnectionError: {msg}.")
 
     def _validate_params(self, **kwargs) -> LDList:
         """Validate and update params.
@@ -559,6 +906,21 @@ class BaseC:
             params.extend(params_)
         return params
 
+    def _slice_params_remaining(self, results: LDAny) -> LDAny:
+        """Generate sliced parameters for the pages remaining after the first page.
+
+        :param results: List of dicts with params_d and related counts of objects.
+        :return: Sliced parameters without the first page.
+        """
+        params: LDAny = []
+        for result in results:
+            count = result["count"]
+            if count <= self.limit:
+                continue
+            params_: LDAny = h.generate_offsets(count, self.limit, result["params_d"])
+            params.extend(params_[1:])
+        return params
+
     # ============================== is ==============================
 
     @staticmethod
@@ -613,7 +975,7 @@ class BaseC:
     def _change_params_name_to_id(self, params_d: DList) -> DList:
         """Change parameter with name to parameter with id.
 
-        Request all related objects from the Netbox, find the name, and replace it with the ID.
+        Request the related objects from the Netbox, find the name, and replace it with the ID.
         :param params_d: Parameters that need to update.
         :return: Updated parameters.
         """
@@ -626,12 +988,7 @@ class BaseC:
 
             for name, values in need_change.items():
                 param_path: ParamPath = mapping_d[name]
-                path = param_path.path
-                key = param_path.key
-
-                response: LDAny = self._query(path)
-
-                if ids := [d["id"] for d in response if d[key] in values]:
+                if ids := self._resolve_ids(param_path, values):
                     need_delete.extend([name, f"or_{name}"])
                     name_id = f"{name}_id"
                     need_add.setdefault(name_id, []).extend(ids)
@@ -640,6 +997,50 @@ class BaseC:
         params_d_.update(need_add)
         return params_d_
 
+    def _resolve_ids(self, param_path: ParamPath, values: list) -> LInt:
+        """Resolve the names (or other keys) of the related objects to ids.
+
+        Only the objects with the required names are requested from the Netbox,
+        the resolved ids are cached in the NbApi IdCache.
+        :param param_path: Mapping of the parameter to the related objects.
+        :param values: Names (or other key values) of the related objects.
+        :return: Ids of the related objects.
+        """
+        path, key = param_path.path, param_path.key
+        cache: IdCache = self._id_cache
+
+        ids_d: DLInt = {}
+        missing: list = []
+        for value in values:
+            ids = cache.get(path, key, value)
+            if ids is None:
+                missing.append(value)
+            else:
+                ids_d[value] = ids
+
+        if missing:
+            if param_path.is_filter:
+                params_ld: LDList = h.slice_params_ld(
+                    url=f"{self.url_base}{path}",
+                    max_len=self.url_length,
+                    keys=[key],
+                    params_ld=[{key: missing}],
+                )
+            else:
+                params_ld = [{}]
+            missing_: set = set(missing)
+            missed_ids: DLInt = {}
+            for params_d in params_ld:
+                for data in self._query_loop(path, params_d):
+                    value = data[key]
+                    if value in missing_:
+                        missed_ids.setdefault(value, []).append(data["id"])
+            for value, ids in missed_ids.items():
+                cache.set(path, key, value, ids)
+            ids_d.update(missed_ids)
+
+        return [i for v in values for i in ids_d.get(v, [])]
+
     @staticmethod
     def _msg_status_code(response: Response) -> str:
         """Return message ready for logging ConnectionError."""
@@ -657,6 +1058,32 @@ class BaseC:
 # ============================= helpers ==========================
 
 
+def make_response(status_code: int, content: bytes = b"") -> Response:
+    """Create the response without request.
+
+    :param status_code: Response status code.
+    :param content: Response body.
+
+    :return: Response object.
+    """
+    response = Response()
+    response.status_code = status_code
+    response._content = content  # pylint: disable=protected-access
+    return response
+
+
+def init_executor(threads: int = 1) -> Executor:
+    """Init worker pool for the threading mode.
+
+    Threads are started on demand and reused by the next requests.
+
+    :param threads: Maximum count of the worker threads.
+
+    :return: Executor object.
+    """
+    return ThreadPoolExecutor(max_workers=max(int(threads), 1), thread_name_prefix="netbox3")
+
+
 def _init_host(**kwargs) -> str:
     """Init Netbox host name."""
     host = str(kwargs.get("host") or "")
@@ -678,6 +1105,14 @@ def _init_port(**kwargs) -> int:
     return port
 
 
+def _init_preflight(**kwargs) -> bool:
+    """Init preflight, default True."""
+    preflight = kwargs.get("preflight")
+    if preflight is None:
+        return True
+    return bool(preflight)
+
+
 def _init_scheme(**kwargs) -> str:
     """Init scheme: https or http."""
     scheme = str(kwargs.get("scheme") or "").lower()
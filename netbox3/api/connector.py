@@ -4,13 +4,73 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import logging
+import time
+from datetime import datetime, timedelta
+from functools import partial
+from operator import itemgetter
+from typing import Any, Iterator, Optional
 
 from requests import Response
 from vhelpers import vdict
 
-from netbox3.api.base_c import BaseC
-from netbox3.types_ import DAny, LDAny, LDList
+from netbox3 import helpers as h
+from netbox3.api.base_c import BaseC, make_response
+from netbox3.api.outcome import LOutcome, Outcome, make_outcomes
+from netbox3.types_ import DAny, LDAny, LDList, SInt, LInt, LCallable, LStr, DLStr, ODAny
+from netbox3.types_ import LODAny
+
+# Natural keys of the objects, to find the objects created by the timed out request.
+# The first key is used as the filtering parameter, the other keys specify the scope,
+# the objects are matched by all keys. Models without the natural key are absent,
+# the result of the timed out create request of these models is unknown.
+# The keys are not unique for all models (duplicate IP addresses are allowed), so only
+# the single match created after the first attempt began is the created object.
+NATURAL_KEYS: DLStr = {
+    "circuits/circuit-types/": ["name"],
+    "circuits/circuits/": ["cid", "provider"],
+    "circuits/providers/": ["name"],
+    "dcim/console-ports/": ["name", "device"],
+    "dcim/console-server-ports/": ["name", "device"],
+    "dcim/device-bays/": ["name", "device"],
+    "dcim/device-roles/": ["name"],
+    "dcim/device-types/": ["model", "manufacturer"],
+    "dcim/devices/": ["name", "site", "tenant"],
+    "dcim/front-ports/": ["name", "device"],
+    "dcim/interfaces/": ["name", "device"],
+    "dcim/inventory-items/": ["name", "device", "parent"],
+    "dcim/locations/": ["name", "site", "parent"],
+    "dcim/manufacturers/": ["name"],
+    "dcim/module-bays/": ["name", "device"],
+    "dcim/module-types/": ["model", "manufacturer"],
+    "dcim/platforms/": ["name"],
+    "dcim/power-outlets/": ["name", "device"],
+    "dcim/power-ports/": ["name", "device"],
+    "dcim/racks/": ["name", "site", "location"],
+    "dcim/rear-ports/": ["name", "device"],
+    "dcim/regions/": ["name", "parent"],
+    "dcim/site-groups/": ["name", "parent"],
+    "dcim/sites/": ["name"],
+    "extras/tags/": ["name"],
+    "ipam/aggregates/": ["prefix"],
+    "ipam/asns/": ["asn"],
+    "ipam/ip-addresses/": ["address", "vrf"],
+    "ipam/prefixes/": ["prefix", "vrf"],
+    "ipam/rirs/": ["name"],
+    "ipam/roles/": ["name"],
+    "ipam/vlans/": ["vid", "group", "site"],
+    "tenancy/tenants/": ["name", "group"],
+    "virtualization/cluster-groups/": ["name"],
+    "virtualization/cluster-types/": ["name"],
+    "virtualization/clusters/": ["name", "group", "site"],
+    "virtualization/interfaces/": ["name", "virtual_machine"],
+    "virtualization/virtual-machines/": ["name", "cluster"],
+}
+
+# Object matched by the natural key, but not proved to be created by the request
+AMBIGUOUS: DAny = {}
 
 
 class Connector(BaseC):
@@ -25,23 +85,58 @@ class Connector(BaseC):
     def create(self, **kwargs) -> Response:
         """Create object in Netbox.
 
+        If the request times out, before the next retry the object is searched in Netbox
+        by the natural key (name, address, etc.) to avoid duplicates. The found object is
+        the created one if it is the single match created after the first attempt began.
+        If the model has no natural key (see NATURAL_KEYS) or the found object cannot be
+        proved to be created by the request, the request is not retried, the result is unknown.
+
         :param kwargs: Parameters of new object to create.
 
         :return: Session response.
 
             - <Response [201]> Object successfully created,
-            - <Response [400]> Object already exist.
+            - <Response [200]> Object created by the previous attempt that timed out,
+            - <Response [400]> Object already exist,
+            - <Response [504]> Result unknown, the request timed out.
         :rtype: Response
         """
-        response: Response = self._session.post(
+        start = time.monotonic()
+
+        def before_retry() -> Optional[Response]:
+            created: Optional[LODAny] = self._find_created([kwargs], start=start)
+            if created is None:
+                return _unknown_response(self.path)
+            if (written := created[0]) is AMBIGUOUS:
+                return _ambiguous_response(self.path)
+            if written:
+                return make_response(status_code=200, content=json.dumps(written).encode())
+            return None
+
+        response: Response = self._retry_write(
+            method="post",
             url=self.url,
-            data=json.dumps(kwargs),
-            headers=self._headers(),
-            verify=self.verify,
-            timeout=self.timeout,
+            payload=lambda: kwargs,
+            before_retry=before_retry,
         )
+        self._invalidate_caches()
         return response
 
+    def create_bulk(self, items: LDAny) -> LOutcome:
+        """Create multiple objects in Netbox.
+
+        Objects are split into batches of `batch_size`, each batch is created by a single
+        request, batches are sent in parallel using the threads of NbApi.
+
+        :param items: Data of new objects to create.
+        :type items: List[dict]
+
+        :return: Outcomes of the objects, in the same order as the items.
+            Each outcome has the id of the created object or the error message.
+        :rtype: List[Outcome]
+        """
+        return self._write_bulk(method="post", items=items)
+
     def create_d(self, **kwargs) -> DAny:
         """Create object in Netbox.
 
@@ -51,7 +146,8 @@ class Connector(BaseC):
         :rtype: dict
         """
         response: Response = self.create(**kwargs)
-        if not response.status_code == 201:
+        if response.status_code not in [200, 201]:
+            logging.warning(self._msg_status_code(response))
             return {}
         html: str = response.content.decode("utf-8")
         data: DAny = dict(json.loads(html))
@@ -66,18 +162,39 @@ class Connector(BaseC):
 
         :return: Session response.
 
-            - <Response [204]> Object successfully deleted,
+            - <Response [204]> Object successfully deleted (by this or the timed out attempt),
             - <Response [404]> Object not found.
         :rtype: Response
         """
-        response: Response = self._session.delete(
+        def before_retry() -> Optional[Response]:
+            if (self._find_written("delete", [{"id": id}]) or [None])[0]:
+                return make_response(status_code=204)
+            return None
+
+        response: Response = self._retry_write(
+            method="delete",
             url=f"{self.url}{id}",
-            headers=self._headers(),
-            verify=self.verify,
-            timeout=self.timeout,
+            payload=lambda: None,
+            before_retry=before_retry,
         )
+        self._invalidate_caches()
         return response
 
+    def delete_bulk(self, ids: LInt) -> LOutcome:
+        """Delete multiple objects in Netbox.
+
+        Ids are split into batches of `batch_size`, each batch is deleted by a single
+        request, batches are sent in parallel using the threads of NbApi.
+
+        :param ids: Object IDs.
+        :type ids: List[int]
+
+        :return: Outcomes of the objects, in the same order as the ids.
+        :rtype: List[Outcome]
+        """
+        items: LDAny = [{"id": int(i)} for i in ids]
+        return self._write_bulk(method="delete", items=items)
+
     # noinspection PyIncorrectDocstring
     def get(self, **kwargs) -> LDAny:
         """Request data from Netbox using `Schema ip_addresses`_.
@@ -121,6 +238,88 @@ class Connector(BaseC):
         self._check_reserved_keys(items=items)
         return items
 
+    # noinspection PyIncorrectDocstring
+    async def aget(self, **kwargs) -> LDAny:
+        """Request data from Netbox in asyncio mode.
+
+        Coroutine version of the ``get()`` method with the same filtering parameters.
+        Requests the count of objects and then the pages by offsets as coroutines,
+        the number of requests in flight is limited by the ``threads`` count.
+
+        :param kwargs: Netbox REST API `Schema ip_addresses`_.
+
+        :return: List of dictionaries containing Netbox objects.
+        :rtype: List[dict]
+
+        :example:
+            asyncio.run(NbApi(host="netbox", threads=100).dcim.interfaces.aget())
+        """
+        loop = asyncio.get_running_loop()
+        params_ld: LDList = await loop.run_in_executor(
+            self._executor, partial(self._validate_params, **kwargs)
+        )
+        items: LDAny = await self._aquery_params_ld(params_ld)
+        self._check_reserved_keys(items=items)
+        return items
+
+    # noinspection PyIncorrectDocstring
+    def iter_objects(self, sort: bool = False, **kwargs) -> Iterator[DAny]:
+        """Request data from Netbox and yield objects as each page is received.
+
+        Has the same filtering parameters as the ``get()`` method.
+        Objects are yielded without duplicates, memory usage does not depend on
+        the count of requested objects.
+
+        :param sort: True - Sort objects by id. All pages are received before the first
+            object is yielded. Default is `False`.
+        :type sort: bool
+
+        :param kwargs: Netbox REST API `Schema ip_addresses`_.
+
+        :return: Generator of Netbox objects.
+        :rtype: Iterator[dict]
+        """
+        ids: SInt = set()
+        objects: LDAny = []
+        for page in self.iter_pages(**kwargs):
+            for data in page:
+                id_ = data["id"]
+                if id_ in ids:
+                    continue
+                ids.add(id_)
+                if sort:
+                    objects.append(data)
+                else:
+                    yield data
+        if sort:
+            yield from sorted(objects, key=itemgetter("id"))
+
+    # noinspection PyIncorrectDocstring
+    def iter_pages(self, **kwargs) -> Iterator[LDAny]:
+        """Request data from Netbox and yield objects page by page.
+
+        Has the same filtering parameters as the ``get()`` method.
+        The next page is requested only when the previous one has been consumed.
+        The pages are not deduplicated, objects requested in an ``OR`` manner
+        can be present in different pages.
+
+        :param kwargs: Netbox REST API `Schema ip_addresses`_.
+
+        :return: Generator of lists of Netbox objects.
+        :rtype: Iterator[List[dict]]
+        """
+        params_ld: LDList = self._validate_params(**kwargs)
+        params_ld = h.slice_params_ld(
+            url=self.url,
+            max_len=self.url_length,
+            keys=self._slices,
+            params_ld=params_ld,
+        )
+        for params_d in params_ld:
+            for page in self._iter_loop(self.path, params_d):
+                self._check_reserved_keys(items=page)
+                yield page
+
     # noinspection PyIncorrectDocstring
     def update(self, **kwargs) -> Response:
         """Update object in Netbox.
@@ -140,15 +339,33 @@ class Connector(BaseC):
         if not id_:
             raise ValueError("id expected in the data.")
 
-        response: Response = self._session.patch(
+        response: Response = self._retry_write(
+            method="patch",
             url=f"{self.url}{id_}/",
-            data=json.dumps(kwargs),
-            headers=self._headers(),
-            verify=self.verify,
-            timeout=self.timeout,
+            payload=lambda: kwargs,
+            before_retry=lambda: None,
         )
+        self._invalidate_caches()
         return response
 
+    def update_bulk(self, items: LDAny) -> LOutcome:
+        """Update multiple objects in Netbox.
+
+        Objects are split into batches of `batch_size`, each batch is updated by a single
+        request, batches are sent in parallel using the threads of NbApi.
+
+        :param items: Data of objects to update, each item must have the id.
+        :type items: List[dict]
+
+        :return: Outcomes of the objects, in the same order as the items.
+        :rtype: List[Outcome]
+
+        :raise ValueError: If the id is absent in the item.
+        """
+        if [d for d in items if not d.get("id")]:
+            raise ValueError("id expected in the data.")
+        return self._write_bulk(method="patch", items=items)
+
     # noinspection PyIncorrectDocstring
     def update_d(self, **kwargs) -> DAny:
         """Update object in Netbox.
@@ -163,7 +380,234 @@ class Connector(BaseC):
         """
         response: Response = self.update(**kwargs)
         if not response.status_code == 200:
+            logging.warning(self._msg_status_code(response))
             return {}
         html: str = response.content.decode("utf-8")
         data: DAny = dict(json.loads(html))
         return data
+
+    # ============================= helpers ==============================
+
+    def _write_bulk(self, method: str, items: LDAny) -> LOutcome:
+        """Split objects into batches and write them to Netbox in parallel.
+
+        :param method: HTTP method: "post", "patch", "delete".
+        :param items: Data of objects to write.
+
+        :return: Outcomes of the objects, in the same order as the items.
+        """
+        tasks: LCallable = []
+        for start in range(0, len(items), self.batch_size):
+            batch: LDAny = items[start:start + self.batch_size]
+            tasks.append(partial(self._request_bulk, method, batch, start))
+
+        outcomes: LOutcome = []
+        for outcomes_ in self._run_tasks(tasks):
+            outcomes.extend(outcomes_)
+        if tasks:
+            self._invalidate_caches()
+        return outcomes
+
+    def _request_bulk(self, method: str, items: LDAny, start: int) -> LOutcome:
+        """Write the batch of objects to Netbox by a single request.
+
+        If the request times out, before the next retry the objects already written
+        by the previous attempt are searched in Netbox and excluded from the batch.
+
+        :param method: HTTP method: "post", "patch", "delete".
+        :param items: Data of objects to write.
+        :param start: Position of the first object in all items.
+
+        :return: Outcomes of the objects.
+        """
+        pending: LDAny = list(items)
+        indexes: LInt = list(range(start, start + len(items)))
+        outcomes: LOutcome = []
+        attempts = [0]
+        start_time = time.monotonic()
+
+        def payload() -> LDAny:
+            attempts[0] += 1
+            return pending
+
+        def before_retry() -> Optional[Response]:
+            written: Optional[LODAny] = self._find_written(method, pending, start=start_time)
+            if written is None:
+                return _unknown_response(self.path)
+            for position in reversed(range(len(pending))):
+                if (data := written[position]) is None:
+                    continue
+                if data is AMBIGUOUS:
+                    outcome = Outcome(index=indexes[position], status_code=504,
+                                      data=pending[position], error=_ambiguous_msg(self.path))
+                else:
+                    outcome = Outcome(index=indexes[position], status_code=200, data=data)
+                    outcome.id = int(data.get("id") or 0)
+                outcome.attempts = attempts[0]
+                outcomes.append(outcome)
+                del pending[position]
+                del indexes[position]
+            if not pending:
+                return make_response(status_code=200, content=b"[]")
+            return None
+
+        response: Response = self._retry_write(
+            method=method,
+            url=self.url,
+            payload=payload,
+            before_retry=before_retry,
+        )
+        for outcome in make_outcomes(response=response, items=pending, indexes=indexes):
+            outcome.attempts = attempts[0]
+            outcomes.append(outcome)
+        return sorted(outcomes, key=lambda o: o.index)
+
+    def _find_created(self, items: LDAny, start: float) -> Optional[LODAny]:
+        """Find the objects created by the previous attempt, by the natural key.
+
+        The natural key is not unique for all models, the matched object is created by
+        the request only if it is the single match created (Netbox server time) after
+        the first attempt began.
+
+        :param items: Data of the requested objects.
+        :param start: Monotonic time when the first attempt began.
+
+        :return: Netbox objects matched to the items, in the same order as the items.
+            None if the object is not found or the natural key is absent in the item.
+            AMBIGUOUS if the object is found, but not proved to be created by the request.
+            None instead of the list if the model has no natural key, the result is unknown.
+        """
+        keys: LStr = NATURAL_KEYS.get(self.path) or []
+        if not keys:
+            return None
+        key = keys[0]
+        values = list({d[key] for d in items if d.get(key) not in [None, ""]})
+        if not values:
+            return [None for _ in items]
+
+        params_ld: LDList = h.slice_params_ld(
+            url=self.url,
+            max_len=self.url_length,
+            keys=[key],
+            params_ld=[{key: values}],
+        )
+        objects: LDAny = []
+        for params_d in params_ld:
+            objects.extend(self._query_loop(self.path, params_d))
+
+        since: Optional[datetime] = None
+        if objects:
+            # the first attempt in the server time, the Date header has 1 second resolution
+            if now := self._server_time():
+                since = now - timedelta(seconds=time.monotonic() - start + 1)
+
+        created: LODAny = []
+        for item in items:
+            found: ODAny = None
+            if item.get(key) not in [None, ""]:
+                matches = [d for d in objects
+                           if all(_key_value(item.get(k)) == _key_value(d.get(k)) for k in keys)]
+                found = _created_since(matches, since)
+            created.append(found)
+        return created
+
+    def _find_written(self, method: str, items: LDAny, start: float) -> Optional[LODAny]:
+        """Find the objects written by the previous attempt.
+
+        :param method: HTTP method: "post", "patch", "delete".
+        :param items: Data of the requested objects.
+        :param start: Monotonic time when the first attempt began.
+
+        :return: Netbox objects (requested data if deleted) written by the previous attempt,
+            in the same order as the items. None if the object is not written,
+            AMBIGUOUS if the object may have been written. None instead of the list
+            if the result is unknown.
+        """
+        if method == "post":
+            return self._find_created(items, start=start)
+        if method == "delete":
+            ids = [d["id"] for d in items]
+            params_ld: LDList = h.slice_params_ld(
+                url=self.url,
+                max_len=self.url_length,
+                keys=["id"],
+                params_ld=[{"id": ids}],
+            )
+            present: SInt = set()
+            for params_d in params_ld:
+                present.update(d["id"] for d in self._query_loop(self.path, params_d))
+            return [None if d["id"] in present else d for d in items]
+        # "patch" is idempotent, no need to check
+        return [None for _ in items]
+
+
+# ============================= helpers ==========================
+
+
+def _unknown_response(path: str) -> Response:
+    """Response of the timed out create request, the objects may have been created."""
+    msg = f"Result unknown, {path=} has no natural key to find the created objects."
+    return make_response(status_code=504, content=msg.encode())  # Gateway Timeout
+
+
+def _ambiguous_msg(path: str) -> str:
+    """Error of the timed out create request, the found object may be created by others."""
+    return f"Result unknown, {path=} object found by the natural key, may be created earlier."
+
+
+def _ambiguous_response(path: str) -> Response:
+    """Response of the timed out create request, the found object may be created by others."""
+    msg = _ambiguous_msg(path)
+    return make_response(status_code=504, content=msg.encode())  # Gateway Timeout
+
+
+def _created_since(matches: LDAny, since: Optional[datetime]) -> ODAny:
+    """Get the single object created since the time.
+
+    :param matches: Netbox objects matched by the natural key.
+    :param since: Server time of the first attempt, None if unknown.
+
+    :return: The object created since the time. None if no objects are created since the time,
+        AMBIGUOUS if the created time is unknown or multiple objects are created.
+    """
+    if not matches:
+        return None
+    if since is None:
+        return AMBIGUOUS
+    created: LDAny = []
+    for data in matches:
+        time_ = _parse_created(data.get("created"))
+        if time_ is None:
+            return AMBIGUOUS
+        if time_ >= since:
+            created.append(data)
+    if not created:
+        return None
+    if len(created) > 1:
+        return AMBIGUOUS
+    return created[0]
+
+
+def _key_value(value: Any) -> Any:
+    """Value of the natural key, id of the related object."""
+    if isinstance(value, dict):
+        return value.get("id")
+    return value
+
+
+def _parse_created(value: Any) -> Optional[datetime]:
+    """Parse the created time of the Netbox object, None if the time is absent (date only).
+
+    :example:
+        _parse_created("2000-12-31T23:59:59.123456Z") -> datetime(2000, 12, 31, 23, 59, 59, ...)
+    """
+    value = str(value or "")
+    if "T" not in value:
+        return None
+    try:
+        time_ = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if time_.tzinfo is None:
+        return None
+    return time_
@@ -12,6 +12,9 @@ class ParamPath(BaseModel):
     param: str = Field(description="Parameter name that need to map")
     path: str = Field(description="app/model path to request objects for mapping")
     key: str = Field(default="name", description="Key to request objects for mapping")
+    is_filter: bool = Field(
+        default=True, description="Key can be used as filtering parameter in the request"
+    )
 
     @property
     def param_id(self) -> str:
@@ -46,10 +49,10 @@ def data(path: str) -> DParamPath:
         "site_group": ParamPath(param="site_group", path="dcim/site-groups/"),
         # extras
         "content_type": ParamPath(
-            param="content_type", path="extras/content-types/", key="display"
+            param="content_type", path="extras/content-types/", key="display", is_filter=False
         ),
         "for_object_type": ParamPath(
-            param="for_object_type", path="extras/content-types/", key="display"
+            param="for_object_type", path="extras/content-types/", key="display", is_filter=False
         ),
         # ipam
         "export_target": ParamPath(param="export_target", path="ipam/route-targets/"),
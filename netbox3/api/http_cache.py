@@ -0,0 +1,350 @@
+"""ResponseCache, cache of the Netbox GET responses with HTTP revalidation."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from pydantic import BaseModel, Field
+from requests import Response
+
+from netbox3.types_ import DAny, DStr
+
+
+class CachedPage(BaseModel):
+    """Cached response body with the validators."""
+
+    url: str = Field(description="Normalized URL")
+    content: bytes = Field(description="Response body")
+    etag: str = Field(default="", description="ETag header")
+    last_modified: str = Field(default="", description="Last-Modified header")
+    created: float = Field(default=0.0, description="Time of the last validation")
+
+    def headers(self) -> DStr:
+        """Conditional request headers If-None-Match, If-Modified-Since."""
+        headers: DStr = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def response(self) -> Response:
+        """Build response with the cached body, status_code=200."""
+        response = Response()
+        response.status_code = 200
+        response.url = self.url
+        response._content = self.content  # pylint: disable=protected-access
+        if self.etag:
+            response.headers["ETag"] = self.etag
+        if self.last_modified:
+            response.headers["Last-Modified"] = self.last_modified
+        return response
+
+
+class ResponseCache:
+    """Cache of the Netbox GET responses, keyed by the normalized URL.
+
+    Fresh entries (within `ttl`) are returned without request, stale entries
+    are revalidated by the Netbox using If-None-Match/If-Modified-Since headers.
+    The total size of the response bodies in memory is limited, the least recently
+    used entries are evicted. Entries can also be stored on disk to be reused by the next
+    runs, the size of the files is limited the same way, the oldest files are removed.
+    The entries of the model are invalidated by the writes of this process,
+    the writes of other clients are visible after `ttl`.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 0,
+        maxsize: int = 100_000_000,
+        directory: str = "",
+        token: str = "",
+    ):
+        """Init ResponseCache.
+
+        :param ttl: Time (seconds) during which the cached entry is returned without
+            revalidation. Default is `0` always revalidate.
+        :param maxsize: Maximum total size (bytes) of the response bodies in memory and
+            of the files on disk. The entry larger than `maxsize` is not cached.
+            Default is `100_000_000` (100MB).
+        :param directory: Path to the directory to store entries on disk, as JSON files.
+            The directory is trusted, the files are returned as the Netbox responses,
+            so it must be writable only by the user. Default is `""` memory only.
+        :param token: Netbox token, the entries on disk are separated by the token hash,
+            the responses of one token are not returned for another one.
+        """
+        self.ttl: float = max(float(ttl), 0.0)
+        self.maxsize: int = max(int(maxsize), 1)
+        self.directory: str = str(directory)
+        self._namespace: str = hashlib.sha256(str(token).encode()).hexdigest()
+        self._data: OrderedDict = OrderedDict()
+        self._size: int = 0
+        self._disk_size: Optional[int] = None
+        self._invalidated: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """__repr__."""
+        name = self.__class__.__name__
+        return f"<{name}: ttl={self.ttl} maxsize={self.maxsize} size={self.size}>"
+
+    def __len__(self) -> int:
+        """Count of entries in memory."""
+        return len(self._data)
+
+    # =========================== property ===========================
+
+    @property
+    def size(self) -> int:
+        """Total size (bytes) of the response bodies in memory."""
+        return self._size
+
+    # =========================== method =============================
+
+    def clear(self) -> None:
+        """Remove all entries from memory, entries on disk are kept."""
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Get the cached entry.
+
+        :param url: Requested URL.
+
+        :return: CachedPage object or None if the URL is not cached.
+        """
+        key = normalize_url(url)
+        with self._lock:
+            page: Optional[CachedPage] = self._data.get(key)
+            if page is not None:
+                self._data.move_to_end(key)
+                return page
+        page = self._read_page(key)
+        if page is not None and self._is_invalidated(page):
+            self._path(key).unlink(missing_ok=True)
+            return None
+        if page is not None:
+            self._set(page)
+        return page
+
+    def invalidate(self, url: str) -> None:
+        """Remove the entries of the model after the objects have been written.
+
+        The entries on disk are removed on the next read.
+
+        :param url: URL of the model, for example "https://netbox/api/dcim/sites/".
+            The entries of all URLs starting with this one are removed.
+
+        :return: None. Update self object.
+        """
+        prefix = normalize_url(url)
+        with self._lock:
+            self._invalidated[prefix] = time.time()
+            for key in [s for s in self._data if s.startswith(prefix)]:
+                self._size -= len(self._data.pop(key).content)
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        """Return True if the entry can be returned without revalidation."""
+        if not self.ttl:
+            return False
+        return time.time() - page.created < self.ttl
+
+    def put(self, url: str, response: Response) -> None:
+        """Put the response to the cache.
+
+        Only responses with status_code=200 and the ETag/Last-Modified header
+        (or any responses if ttl is set) are cached.
+
+        :param url: Requested URL.
+        :param response: Netbox response.
+
+        :return: None. Update self object.
+        """
+        if response.status_code != 200:
+            return
+        etag = str(response.headers.get("ETag") or "")
+        last_modified = str(response.headers.get("Last-Modified") or "")
+        if not (self.ttl or etag or last_modified):
+            return
+        page = CachedPage(
+            url=normalize_url(url),
+            content=response.content,
+            etag=etag,
+            last_modified=last_modified,
+            created=time.time(),
+        )
+        self._set(page)
+        self._write_page(page)
+
+    def revalidated(self, page: CachedPage) -> Response:
+        """Renew the entry after the Netbox responded 304 Not Modified.
+
+        :param page: CachedPage object.
+
+        :return: Response with the cached body.
+        """
+        page.created = time.time()
+        self._set(page)
+        self._write_page(page)
+        return page.response()
+
+    # =========================== helpers ============================
+
+    def _is_invalidated(self, page: CachedPage) -> bool:
+        """Return True if the entry is created before the invalidation of the model."""
+        with self._lock:
+            for prefix, invalidated in self._invalidated.items():
+                if page.url.startswith(prefix) and page.created <= invalidated:
+                    return True
+        return False
+
+    def _set(self, page: CachedPage) -> None:
+        """Set the entry in memory and evict the least recently used entries."""
+        with self._lock:
+            if (old := self._data.pop(page.url, None)) is not None:
+                self._size -= len(old.content)
+            if len(page.content) > self.maxsize:
+                return
+            self._data[page.url] = page
+            self._size += len(page.content)
+            while self._size > self.maxsize:
+                _, old = self._data.popitem(last=False)
+                self._size -= len(old.content)
+
+    def _path(self, key: str) -> Path:
+        """Path to the entry file on disk, separated by the token hash."""
+        name = hashlib.sha256(f"{self._namespace}\n{key}".encode()).hexdigest()
+        return Path(self.directory, f"{name}.json")
+
+    def _read_page(self, key: str) -> Optional[CachedPage]:
+        """Read the entry from disk."""
+        if not self.directory:
+            return None
+        path = self._path(key)
+        if not path.is_file():
+            return None
+        try:
+            page_d: DAny = json.loads(path.read_text(encoding="utf-8"))
+            page_d["content"] = base64.b64decode(page_d["content"], validate=True)
+            page = CachedPage(**page_d)
+        except (OSError, KeyError, TypeError, ValueError) as ex:
+            logging.warning("Invalid response cache %s, %s.", path, ex)
+            return None
+        if page.url != key:
+            return None
+        return page
+
+    def _write_page(self, page: CachedPage) -> None:
+        """Write the entry to disk and remove the oldest files above `maxsize`."""
+        if not self.directory:
+            return
+        path = self._path(page.url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        page_d: DAny = page.model_dump()
+        page_d["content"] = base64.b64encode(page.content).decode("ascii")
+        text = json.dumps(page_d)
+        if len(text) > self.maxsize:
+            path.unlink(missing_ok=True)
+            return
+        with self._disk_lock:
+            if self._disk_size is None:
+                self._disk_size = _dir_size(path.parent)
+            self._disk_size += len(text) - _file_size(path)
+            path.write_text(text, encoding="utf-8")
+            if self._disk_size > self.maxsize:
+                self._disk_size = _prune_dir(path.parent, maxsize=self.maxsize)
+
+
+# ============================= helpers ==========================
+
+
+def init_response_cache(**kwargs) -> Optional[ResponseCache]:
+    """Init response cache from the connector parameters.
+
+    :param http_cache: True - cache the GET responses, False - do not cache.
+    :param http_cache_ttl: Time (seconds) during which the entry is returned
+        without revalidation.
+    :param http_cache_size: Maximum total size (bytes) of the entries in memory and on disk.
+    :param http_cache_dir: Path to the directory to store entries on disk.
+    :param token: Netbox token, the entries on disk are separated by the token hash.
+
+    :return: ResponseCache object or None if cache is disabled.
+    """
+    if not kwargs.get("http_cache"):
+        return None
+    return ResponseCache(
+        ttl=float(kwargs.get("http_cache_ttl") or 0),
+        maxsize=int(kwargs.get("http_cache_size") or 100_000_000),
+        directory=str(kwargs.get("http_cache_dir") or ""),
+        token=str(kwargs.get("token") or ""),
+    )
+
+
+def normalize_url(url: str) -> str:
+    """Normalize URL, lowercase scheme and host, sort query parameters.
+
+    :param url: URL with query parameters.
+
+    :return: Normalized URL.
+
+    :example:
+        normalize_url("HTTPS://Netbox/api/ipam/vrfs/?offset=0&limit=1000") ->
+        "https://netbox/api/ipam/vrfs/?limit=1000&offset=0"
+    """
+    parsed = urlparse(url)
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    parsed = parsed._replace(
+        scheme=parsed.scheme.lower(),
+        netloc=parsed.netloc.lower(),
+        query=query,
+        fragment="",
+    )
+    return urlunparse(parsed)
+
+
+def _dir_size(path: Path) -> int:
+    """Total size of the entry files in the directory."""
+    return sum(_file_size(p) for p in path.glob("*.json"))
+
+
+def _file_size(path: Path) -> int:
+    """Size of the file, 0 if absent."""
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _prune_dir(path: Path, maxsize: int) -> int:
+    """Remove the oldest entry files until the total size is within the limit.
+
+    :param path: Directory of the entry files.
+    :param maxsize: Maximum total size (bytes) of the files.
+
+    :return: Total size of the remaining files.
+    """
+    files = []
+    for path_ in path.glob("*.json"):
+        try:
+            stat = path_.stat()
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path_))
+    size = sum(i[1] for i in files)
+    for _, size_, path_ in sorted(files, key=lambda i: i[0]):
+        if size <= maxsize:
+            break
+        path_.unlink(missing_ok=True)
+        size -= size_
+    return size
@@ -0,0 +1,92 @@
+"""IdCache, memoized name to id resolution for the extended_get."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from netbox3.types_ import LInt
+
+TKey = Tuple[str, str, Any]
+
+
+class IdCache:
+    """Cache of the object ids resolved by the name (or other key) for the extended_get.
+
+    Keyed by the model path, the key and the value, for example
+    ``("dcim/sites/", "name", "SITE1") -> [1]``. Entries expire after `ttl` seconds.
+    Entries of the model are invalidated when the model objects are created, updated
+    or deleted using the same NbApi.
+    """
+
+    def __init__(self, ttl: float = 0):
+        """Init IdCache.
+
+        :param ttl: Time (seconds) during which the resolved ids are reused.
+            Default is `0` do not cache.
+        """
+        self.ttl: float = max(float(ttl), 0.0)
+        self._data: Dict[TKey, Tuple[LInt, float]] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """__repr__."""
+        name = self.__class__.__name__
+        return f"<{name}: ttl={self.ttl} size={len(self)}>"
+
+    def __len__(self) -> int:
+        """Count of cached entries."""
+        return len(self._data)
+
+    # =========================== method =============================
+
+    def get(self, path: str, key: str, value: Any) -> Optional[LInt]:
+        """Get the cached ids.
+
+        :param path: app/model path of the resolved objects.
+        :param key: Key of the objects, for example "name".
+        :param value: Value of the key.
+
+        :return: Ids or None if the value is not cached or expired.
+        """
+        if not self.ttl:
+            return None
+        with self._lock:
+            item = self._data.get((path, key, value))
+            if item is None:
+                return None
+            ids, created = item
+            if time.monotonic() - created >= self.ttl:
+                del self._data[(path, key, value)]
+                return None
+            return list(ids)
+
+    def set(self, path: str, key: str, value: Any, ids: LInt) -> None:
+        """Cache the resolved ids.
+
+        :param path: app/model path of the resolved objects.
+        :param key: Key of the objects, for example "name".
+        :param value: Value of the key.
+        :param ids: Resolved object ids.
+
+        :return: None. Update self object.
+        """
+        if not self.ttl:
+            return
+        with self._lock:
+            self._data[(path, key, value)] = (list(ids), time.monotonic())
+
+    def invalidate(self, path: str = "") -> None:
+        """Remove the cached entries.
+
+        :param path: app/model path of the objects. Default is `""` remove all entries.
+
+        :return: None. Update self object.
+        """
+        with self._lock:
+            if not path:
+                self._data.clear()
+                return
+            for key in [k for k in self._data if k[0] == path]:
+                del self._data[key]
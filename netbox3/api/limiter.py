@@ -0,0 +1,121 @@
+"""Rate limiting of requests to the Netbox."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Token bucket, limits the rate of requests shared by all threads.
+
+    Tokens are refilled with the `rate` speed up to the `burst` count.
+    Each request takes one token, if the bucket is empty the request waits
+    until the next token is available.
+    """
+
+    def __init__(self, rate: float = 0.0, burst: int = 1):
+        """Init TokenBucket.
+
+        :param rate: Tokens per second. Default is `0` no limit.
+        :param burst: Maximum count of tokens in the bucket. Default is `1`.
+        """
+        self.rate: float = max(float(rate), 0.0)
+        self.burst: int = max(int(burst), 1)
+        self._tokens: float = float(self.burst)
+        self._time: float = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """__repr__."""
+        name = self.__class__.__name__
+        return f"<{name}: rate={self.rate} burst={self.burst}>"
+
+    def acquire(self) -> float:
+        """Take one token, wait if the bucket is empty.
+
+        :return: Waiting time (seconds).
+        """
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            tokens = self._tokens + (now - self._time) * self.rate
+            self._tokens = min(tokens, float(self.burst)) - 1
+            self._time = now
+            wait = 0.0
+            if self._tokens < 0:
+                wait = -self._tokens / self.rate
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class Limiter:
+    """Rate limiter and concurrency governor of the requests to the Netbox.
+
+    Shared by all connectors of NbApi, so the limits are applied to the whole
+    process and not to a single query. Used as a context manager around the request.
+    """
+
+    def __init__(self, rate: float = 0.0, burst: int = 1, max_in_flight: int = 0):
+        """Init Limiter.
+
+        :param rate: Maximum count of requests per second. Default is `0` no limit.
+        :param burst: Count of requests that can be sent at once above the `rate`.
+            Default is `1`.
+        :param max_in_flight: Maximum count of requests being processed by Netbox
+            at the same time. Default is `0` no limit.
+        """
+        self.bucket = TokenBucket(rate=rate, burst=burst)
+        self.max_in_flight: int = max(int(max_in_flight), 0)
+        self._semaphore = None
+        if self.max_in_flight:
+            self._semaphore = threading.BoundedSemaphore(self.max_in_flight)
+
+    def __repr__(self) -> str:
+        """__repr__."""
+        name = self.__class__.__name__
+        rate, burst = self.bucket.rate, self.bucket.burst
+        return f"<{name}: {rate=} {burst=} max_in_flight={self.max_in_flight}>"
+
+    def __enter__(self) -> Limiter:
+        """Wait for the free slot and the token before the request."""
+        if self._semaphore:
+            self._semaphore.acquire()  # pylint: disable=consider-using-with
+        self.bucket.acquire()
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Release the slot after the response."""
+        if self._semaphore:
+            self._semaphore.release()
+
+
+def init_pacer(interval: float = 0.0) -> TokenBucket:
+    """Init token bucket that paces the threading requests by interval.
+
+    :param interval: Wait this time between the threading requests (seconds).
+
+    :return: TokenBucket object.
+    """
+    rate = 0.0
+    if interval > 0:
+        rate = 1 / interval
+    return TokenBucket(rate=rate, burst=1)
+
+
+def init_limiter(**kwargs) -> Limiter:
+    """Init rate limiter and concurrency governor.
+
+    :param rate_limit: Maximum count of requests per second.
+    :param burst: Count of requests that can be sent at once above the `rate_limit`.
+    :param max_in_flight: Maximum count of requests processed at the same time.
+
+    :return: Limiter object.
+    """
+    return Limiter(
+        rate=float(kwargs.get("rate_limit") or 0.0),
+        burst=int(kwargs.get("burst") or 1),
+        max_in_flight=int(kwargs.get("max_in_flight") or 0),
+    )
@@ -0,0 +1,78 @@
+"""Outcome, result of the write request for the single object."""
+
+from __future__ import annotations
+
+import json
+from typing import List
+
+from pydantic import BaseModel, Field
+from requests import Response
+
+from netbox3.types_ import DAny, LDAny, LInt, OLInt
+
+
+class Outcome(BaseModel):
+    """Result of the create/update/delete request for the single object."""
+
+    index: int = Field(description="Position of the object in the requested items")
+    id: int = Field(default=0, description="Netbox object id, 0 if unknown")
+    status_code: int = Field(default=0, description="Response status code, 0 if no response")
+    data: DAny = Field(default={}, description="Netbox object data or requested data")
+    error: str = Field(default="", description="Error message")
+    attempts: int = Field(default=1, description="Count of the requests sent")
+
+    @property
+    def ok(self) -> bool:
+        """True if the object has been successfully written."""
+        return 200 <= self.status_code < 300 and not self.error
+
+
+LOutcome = List[Outcome]
+
+
+def make_outcomes(response: Response, items: LDAny, indexes: OLInt = None) -> LOutcome:
+    """Create outcomes of the bulk request.
+
+    Netbox processes the bulk request atomically, all objects are written or none.
+    :param response: Response of the bulk request.
+    :param items: Requested objects.
+    :param indexes: Positions of the requested objects in all items.
+        Default is `None` positions in the requested objects.
+    :return: Outcomes in the same order as the requested items.
+    """
+    indexes_: LInt = list(range(len(items))) if indexes is None else indexes
+    data = _loads(response)
+    outcomes: LOutcome = []
+    for idx, item in enumerate(items):
+        outcome = Outcome(index=indexes_[idx], status_code=response.status_code, data=item)
+        outcome.id = int(item.get("id") or 0)
+        if response.ok:
+            if isinstance(data, list) and len(data) == len(items):
+                outcome.data = dict(data[idx])
+                outcome.id = int(outcome.data.get("id") or outcome.id)
+        else:
+            outcome.error = _error(data, idx, len(items)) or response.reason or "error"
+        outcomes.append(outcome)
+    return outcomes
+
+
+# ============================= helpers ==========================
+
+
+def _loads(response: Response):
+    """Load JSON data from the response, text if the content is not JSON."""
+    try:
+        return json.loads(response.content.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError):
+        return response.text
+
+
+def _error(data, idx: int, count: int) -> str:
+    """Get the error message of the object from the response data."""
+    if isinstance(data, list) and len(data) == count:
+        if error := data[idx]:
+            return json.dumps(error)
+        return "not written, other objects failed in the same batch"
+    if isinstance(data, (dict, list)):
+        return json.dumps(data)
+    return str(data or "")
@@ -0,0 +1,50 @@
+"""Results, accumulator of Netbox objects keyed by id."""
+
+from __future__ import annotations
+
+from netbox3.types_ import DiDAny, LDAny, OLDAny
+
+
+class Results:
+    """Accumulator of Netbox objects keyed by id.
+
+    Merges pages of Netbox objects incrementally. The first object with the same id
+    is kept, duplicates from overlapping sliced or ``OR`` requests are skipped.
+    """
+
+    def __init__(self, items: OLDAny = None):
+        """Init Results.
+
+        :param items: Netbox objects to merge.
+        """
+        self._data: DiDAny = {}
+        if items:
+            self.extend(items)
+
+    def __len__(self) -> int:
+        """Count of unique Netbox objects."""
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        """__repr__."""
+        name = self.__class__.__name__
+        return f"<{name}: {len(self)}>"
+
+    def extend(self, items: LDAny) -> None:
+        """Merge Netbox objects, skip objects with already present id.
+
+        :param items: Netbox objects.
+
+        :return: None. Update self object.
+        """
+        data = self._data
+        for item in items:
+            data.setdefault(item["id"], item)
+
+    def objects(self) -> LDAny:
+        """Get unique Netbox objects sorted by id.
+
+        :return: List of Netbox objects.
+        """
+        data = self._data
+        return [data[i] for i in sorted(data)]
@@ -0,0 +1,150 @@
+"""Retry policy of the requests to the Netbox."""
+
+from __future__ import annotations
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from requests import Response
+
+from netbox3.types_ import LInt
+
+RETRY_STATUSES = [429, 502, 503, 504]
+
+
+class RetryPolicy:
+    """Retry policy, exponential backoff with jitter.
+
+    The delay before the next attempt grows exponentially from `sleep` up to `max_sleep`,
+    a random jitter spreads the retries of multiple threads over time.
+    The `Retry-After` header of the 429 and 503 responses takes precedence over the backoff.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 0,
+        sleep: float = 10,
+        max_sleep: float = 60,
+        retry_statuses: Optional[LInt] = None,
+        deadline: float = 0,
+    ):
+        """Init RetryPolicy.
+
+        :param max_retries: Maximum count of retries. Default is `0` no retries.
+        :param sleep: Base delay (seconds) before the first retry. Default is `10`.
+        :param max_sleep: Maximum delay (seconds) between retries. Default is `60`.
+        :param retry_statuses: Response status codes that need to retry.
+            Default is `[429, 502, 503, 504]`.
+        :param deadline: Overall time limit (seconds) of the request with all retries.
+            Default is `0` no limit.
+        """
+        self.max_retries: int = max(int(max_retries), 0)
+        self.sleep: float = max(float(sleep), 0.0)
+        self.max_sleep: float = max(float(max_sleep), self.sleep)
+        self.retry_statuses: LInt = init_retry_statuses(retry_statuses)
+        self.deadline: float = max(float(deadline), 0.0)
+
+    def __repr__(self) -> str:
+        """__repr__."""
+        name = self.__class__.__name__
+        return f"<{name}: max_retries={self.max_retries} sleep={self.sleep}>"
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before the next attempt, exponential backoff with full jitter.
+
+        :param attempt: Number of the failed attempt, starting from 1.
+
+        :return: Delay (seconds).
+        """
+        ceiling = min(self.max_sleep, self.sleep * 2 ** max(attempt - 1, 0))
+        return random.uniform(0, ceiling)
+
+    def delay(self, attempt: int, response: Optional[Response] = None) -> float:
+        """Delay before the next attempt, `Retry-After` header or backoff.
+
+        :param attempt: Number of the failed attempt, starting from 1.
+        :param response: Response of the failed attempt, None if timed out.
+
+        :return: Delay (seconds).
+        """
+        if response is not None and response.status_code in [429, 503]:
+            retry_after = get_retry_after(response)
+            if retry_after is not None:
+                return retry_after
+        return self.backoff(attempt)
+
+    def is_retry_status(self, response: Response) -> bool:
+        """Return True if the response status code needs to retry."""
+        return response.status_code in self.retry_statuses
+
+    def is_allowed(self, attempt: int, start: float, delay: float) -> bool:
+        """Return True if the next attempt is allowed.
+
+        :param attempt: Number of the failed attempt, starting from 1.
+        :param start: Monotonic time of the first attempt.
+        :param delay: Delay (seconds) before the next attempt.
+
+        :return: True - if retries and deadline are not exhausted, False - otherwise.
+        """
+        if attempt > self.max_retries:
+            return False
+        if self.deadline:
+            if time.monotonic() + delay - start > self.deadline:
+                return False
+        return True
+
+
+# ============================= helpers ==========================
+
+
+def get_retry_after(response: Response) -> Optional[float]:
+    """Get delay from the `Retry-After` header, seconds or HTTP-date.
+
+    :param response: Response with header.
+
+    :return: Delay (seconds) or None if the header is absent or invalid.
+    """
+    value = str(response.headers.get("Retry-After") or "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    return max(date.timestamp() - time.time(), 0.0)
+
+
+def init_retry_policy(**kwargs) -> RetryPolicy:
+    """Init retry policy from the connector parameters.
+
+    :param max_retries: Maximum count of retries.
+    :param sleep: Base delay (seconds) before the first retry.
+    :param max_sleep: Maximum delay (seconds) between retries.
+    :param retry_statuses: Response status codes that need to retry.
+    :param deadline: Overall time limit (seconds) of the request with all retries.
+
+    :return: RetryPolicy object.
+    """
+    return RetryPolicy(
+        max_retries=int(kwargs.get("max_retries") or 0),
+        sleep=float(kwargs.get("sleep") or 10),
+        max_sleep=float(kwargs.get("max_sleep") or 60),
+        retry_statuses=kwargs.get("retry_statuses"),
+        deadline=float(kwargs.get("deadline") or 0),
+    )
+
+
+def init_retry_statuses(retry_statuses: Optional[LInt] = None) -> LInt:
+    """Init status codes that need to retry.
+
+    :param retry_statuses: Status codes, None - default `RETRY_STATUSES`.
+
+    :return: Sorted status codes.
+    """
+    if retry_statuses is None:
+        return list(RETRY_STATUSES)
+    return sorted({int(i) for i in retry_statuses})
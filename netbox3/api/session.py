@@ -0,0 +1,28 @@
+"""HTTP session shared by connectors."""
+
+from __future__ import annotations
+
+import requests
+from requests import Session
+from requests.adapters import HTTPAdapter
+
+POOL_MAXSIZE = 10  # requests default
+
+
+def init_session(threads: int = 1) -> Session:
+    """Init HTTP session with keep-alive connection pool.
+
+    The pool size follows the threads count, so that all threads can reuse
+    the opened connections instead of doing a new TLS handshake.
+
+    :param threads: Threads count.
+
+    :return: Session object.
+    """
+    pool_maxsize = max(int(threads), POOL_MAXSIZE)
+    adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+    session: Session = requests.session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
@@ -1,13 +1,15 @@
 # pylint: disable=R0904
 
 """NbBranch."""
-from typing import Any, Type, Dict, List
+from __future__ import annotations
+
+from typing import Any, Type, Dict, List, Tuple
 
 from vhelpers import vstr
 
 from netbox3 import wrappers
 from netbox3.exceptions import NbBranchError
-from netbox3.types_ import DAny, SeqStr, LStr, Int, Str
+from netbox3.types_ import DAny, ODAny, SeqStr, LStr, Int, Str
 
 
 class NbBranch:
@@ -54,6 +56,27 @@ class NbBranch:
         name = self.__class__.__name__
         return f"<{name}: {data}>"
 
+    # ======================= compiled key path =========================
+
+    @classmethod
+    def compile(cls, *keys: str, strict: bool = False) -> NbKeys:
+        """Compile the chain of keys to the reusable accessor.
+
+        The accessor is built once per chain of keys and applied to any number
+        of Netbox objects without creating NbBranch for each of them.
+
+        :param keys: Chaining dictionary keys to retrieve the desired value.
+        :param strict: True - if data is invalid raise NbBranchError,
+            False - if data is invalid return empty data with proper type.
+
+        :return: NbKeys accessor.
+
+        :example:
+            slug = NbBranch.compile("site", "slug")
+            slugs = [slug.str(d) for d in devices]
+        """
+        return NbKeys(*keys, strict=strict)
+
     # ====================== universal get methods =======================
 
     def any(self, *keys) -> Any:
@@ -91,25 +114,7 @@ class NbBranch:
 
         :raise NbBranchError: If strict=True and the value is not a digit or key is absent.
         """
-        data = self.data
-        try:
-            for key in keys:
-                data = data[key]
-        except (KeyError, TypeError) as ex:
-            if self.strict:
-                type_ = type(ex).__name__
-                raise NbBranchError(f"{type_}: {ex}, {keys=} in {self._source()}") from ex
-            return 0
-
-        if isinstance(data, int):
-            return data
-
-        if isinstance(data, str) and data.isdigit():
-            return int(data)
-
-        if self.strict:
-            raise NbBranchError(f"{keys=} {int} expected in {self._source()}.")
-        return 0
+        return _get_int(data=self.data, keys=keys, strict=self.strict)
 
     def list(self, *keys) -> List:
         """Get list value by keys.
@@ -205,24 +210,7 @@ class NbBranch:
 
         :raise NbBranchError: If strict=True and key absent or type not match.
         """
-        try:
-            for key in keys:
-                data = data[key]  # type: ignore
-        except (KeyError, TypeError) as ex:
-            if self.strict:
-                ex_type = type(ex).__name__
-                raise NbBranchError(f"{ex_type}: {ex}, {keys=} in {self._source()}.") from ex
-            return type_()
-
-        if type_ is type(None):
-            return data
-        if not isinstance(data, type_):
-            if self.strict:
-                ex_type = "TypeError"
-                raise NbBranchError(f"{ex_type}: {keys=} {type_} expected in {self._source()}.")
-            return type_()
-
-        return data
+        return _get_keys(type_=type_, keys=keys, data=data, strict=self.strict)
 
     def tags(self) -> LStr:
         """Get tag slugs from the data.
@@ -242,10 +230,91 @@ class NbBranch:
 
     def _source(self) -> Str:
         """Return URL of source object or data."""
-        if isinstance(self.data, dict):
-            if url := self.data.get("url"):
-                return str(url)
-        return str(self.data)
+        return _source(self.data)
+
+
+class NbKeys:
+    """Compiled chain of keys, extracts the typed value from the Netbox objects.
+
+    Has the same typed and strict semantics as NbBranch, created by NbBranch.compile().
+    """
+
+    __slots__ = ("keys", "strict")
+
+    def __init__(self, *keys: str, strict: bool = False):
+        """Init NbKeys.
+
+        :param keys: Chaining dictionary keys to retrieve the desired value.
+        :param strict: True - if data is invalid raise NbBranchError,
+            False - if data is invalid return empty data with proper type.
+        """
+        self.keys: Tuple[str, ...] = keys
+        self.strict: bool = strict
+
+    def __repr__(self):
+        """__repr__."""
+        name = self.__class__.__name__
+        return f"<{name}: {'/'.join(self.keys)}>"
+
+    def any(self, data: ODAny) -> Any:
+        """Get any value from the Netbox object.
+
+        :param data: Netbox object.
+
+        :return: Value or None if the value is absent.
+        """
+        try:
+            return _get_keys(type_=type(None), keys=self.keys, data=_init_data(data),
+                             strict=self.strict)
+        except NbBranchError:
+            return None
+
+    def dict(self, data: ODAny) -> Dict:
+        """Get dictionary value from the Netbox object.
+
+        :param data: Netbox object.
+
+        :return: Dictionary value or an empty dictionary if the value is absent.
+
+        :raise NbBranchError: If strict=True and the value is not a dictionary or key is absent.
+        """
+        return _get_keys(type_=dict, keys=self.keys, data=_init_data(data), strict=self.strict)
+
+    def int(self, data: ODAny) -> int:
+        """Get integer value from the Netbox object.
+
+        :param data: Netbox object.
+
+        :return: Integer value or 0 if the value is absent.
+
+        :raise NbBranchError: If strict=True and the value is not a digit or key is absent.
+        """
+        return _get_int(data=_init_data(data), keys=self.keys, strict=self.strict)
+
+    def list(self, data: ODAny) -> List:
+        """Get list value from the Netbox object.
+
+        :param data: Netbox object.
+
+        :return: List value or an empty list if the value is absent.
+
+        :raise NbBranchError: If strict=True and the value is not a list or key is absent.
+        """
+        return _get_keys(type_=list, keys=self.keys, data=_init_data(data), strict=self.strict)
+
+    def str(self, data: ODAny) -> str:
+        """Get string value from the Netbox object.
+
+        :param data: Netbox object.
+
+        :return: String value or an empty string if the value is absent.
+
+        :raise NbBranchError: If strict=True and the value is not a string or key is absent.
+        """
+        return _get_keys(type_=str, keys=self.keys, data=_init_data(data), strict=self.strict)
+
+
+# ============================= helpers ==============================
 
 
 def _init_data(data: DAny) -> DAny:
@@ -255,3 +324,76 @@ def _init_data(data: DAny) -> DAny:
     if isinstance(data, dict):
         return data
     raise TypeError(f"{data=} {dict} expected.")
+
+
+def _get_int(data: DAny, keys: SeqStr, strict: bool) -> int:
+    """Retrieve integer value from data using keys.
+
+    :param data: Dictionary.
+    :param keys: Chaining dictionary keys to retrieve the desired value.
+    :param strict: True - if data is invalid raise NbBranchError.
+
+    :return: Integer value or 0.
+
+    :raise NbBranchError: If strict=True and key absent or value is not a digit.
+    """
+    value: Any = data
+    try:
+        for key in keys:
+            value = value[key]
+    except (KeyError, TypeError) as ex:
+        if strict:
+            type_ = type(ex).__name__
+            raise NbBranchError(f"{type_}: {ex}, {keys=} in {_source(data)}") from ex
+        return 0
+
+    if isinstance(value, int):
+        return value
+
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+
+    if strict:
+        raise NbBranchError(f"{keys=} {int} expected in {_source(data)}.")
+    return 0
+
+
+def _get_keys(type_: Type, keys: SeqStr, data: DAny, strict: bool) -> Any:
+    """Retrieve values from data using keys and check their data types.
+
+    :param type_: Data type.
+    :param keys: Chaining dictionary keys to retrieve the desired value.
+    :param data: Dictionary.
+    :param strict: True - if data is invalid raise NbBranchError.
+
+    :return: Value with proper data type.
+
+    :raise NbBranchError: If strict=True and key absent or type not match.
+    """
+    value: Any = data
+    try:
+        for key in keys:
+            value = value[key]
+    except (KeyError, TypeError) as ex:
+        if strict:
+            ex_type = type(ex).__name__
+            raise NbBranchError(f"{ex_type}: {ex}, {keys=} in {_source(data)}.") from ex
+        return type_()
+
+    if type_ is type(None):
+        return value
+    if not isinstance(value, type_):
+        if strict:
+            ex_type = "TypeError"
+            raise NbBranchError(f"{ex_type}: {keys=} {type_} expected in {_source(data)}.")
+        return type_()
+
+    return value
+
+
+def _source(data: Any) -> Str:
+    """Return URL of source object or data."""
+    if isinstance(data, dict):
+        if url := data.get("url"):
+            return str(url)
+    return str(data)
@@ -0,0 +1,313 @@
+"""Cache backends, formats of the NbCache files."""
+
+from __future__ import annotations
+
+import json
+import mmap
+import pickle
+import struct
+from array import array
+from bisect import bisect_left
+from copy import deepcopy
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, MutableMapping, Tuple, Type
+
+from netbox3.nb_tree import NbTree
+from netbox3.types_ import DAny, DiDAny
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+FORMAT = 2  # version of the cache layout
+MAGIC = b"NB3MMAP1"  # packed shard of the MmapBackend
+HEADER = struct.Struct("<8sQ")  # magic, count of objects
+
+
+class CacheBackend:
+    """Base of the cache backends, serialize records to the file one by one."""
+
+    suffix = ""
+
+    def __repr__(self) -> str:
+        """__repr__."""
+        return f"<{self.__class__.__name__}>"
+
+    # =========================== method =============================
+
+    def dump(self, fh: BinaryIO, records: Iterable[DAny]) -> None:
+        """Write records to the file.
+
+        :param fh: File opened in binary mode for writing.
+        :param records: Records to write.
+
+        :return: None. Update the file.
+        """
+        for record in records:
+            self._dump_record(fh, record)
+
+    def load(self, fh: BinaryIO) -> Iterator[DAny]:
+        """Read records from the file.
+
+        :param fh: File opened in binary mode for reading.
+
+        :return: Generator of records.
+        """
+        return self._load_records(fh)
+
+    # =========================== helpers ============================
+
+    def _dump_record(self, fh: BinaryIO, record: DAny) -> None:
+        """Write the single record to the file."""
+        raise NotImplementedError
+
+    def _load_records(self, fh: BinaryIO) -> Iterator[DAny]:
+        """Read records from the file."""
+        raise NotImplementedError
+
+
+class PickleBackend(CacheBackend):
+    """Pickle stream, default backend."""
+
+    suffix = ".pickle"
+
+    def _dump_record(self, fh: BinaryIO, record: DAny) -> None:
+        """Write the single record to the file."""
+        pickle.dump(record, fh, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _load_records(self, fh: BinaryIO) -> Iterator[DAny]:
+        """Read records from the file."""
+        while True:
+            try:
+                yield pickle.load(fh)
+            except EOFError:
+                return
+
+
+class JsonlBackend(CacheBackend):
+    """JSON lines, one record per line. Uses orjson if installed, json otherwise.
+
+    Objects are stored as a list and keyed by the "id" value on load.
+    """
+
+    suffix = ".jsonl"
+
+    def _dump_record(self, fh: BinaryIO, record: DAny) -> None:
+        """Write the single record to the file, objects as a list."""
+        if "data" in record:
+            record = {**record, "data": list(record["data"].values())}
+        fh.write(dumps(record))
+        fh.write(b"\n")
+
+    def _load_records(self, fh: BinaryIO) -> Iterator[DAny]:
+        """Read records from the file, objects keyed by id."""
+        for line in fh:
+            if not line.strip():
+                continue
+            record: DAny = loads(line)
+            if "data" in record:
+                record["data"] = {d["id"]: d for d in record["data"]}
+            yield record
+
+
+class MmapBackend(CacheBackend):
+    """Packed shards for the memory-mapped read-only access.
+
+    The shard file is the header, sorted ids, offsets of the objects and the blob
+    of pickled objects. On load, the file is mapped to memory and represented as
+    MmapView, the objects are decoded on access by id. The mapped pages are shared
+    between the processes that read the same cache. The manifest is pickled.
+    """
+
+    suffix = ".mmap"
+
+    def _dump_record(self, fh: BinaryIO, record: DAny) -> None:
+        """Write the single record to the file, objects packed."""
+        if "data" not in record:
+            pickle.dump(record, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            return
+        data = record["data"]
+        ids = array("q", sorted(data))
+        offsets = array("Q", [0] * (len(ids) + 1))
+        fh.write(HEADER.pack(MAGIC, len(ids)))
+        fh.write(ids.tobytes())
+        position = fh.tell()
+        fh.write(offsets.tobytes())
+        for idx, id_ in enumerate(ids):
+            blob = pickle.dumps(data[id_], protocol=pickle.HIGHEST_PROTOCOL)
+            fh.write(blob)
+            offsets[idx + 1] = offsets[idx] + len(blob)
+        end = fh.tell()
+        fh.seek(position)
+        fh.write(offsets.tobytes())
+        fh.seek(end)
+
+    def _load_records(self, fh: BinaryIO) -> Iterator[DAny]:
+        """Read records from the file, packed objects as MmapView."""
+        if fh.read(len(MAGIC)) != MAGIC:
+            fh.seek(0)
+            yield from PickleBackend().load(fh)
+            return
+        buffer = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        yield {"data": MmapView(buffer)}
+
+
+class MmapView(MutableMapping):
+    """Mapping of the Netbox objects in the packed shard, keyed by id.
+
+    Objects are decoded from the memory-mapped file on access and memoized.
+    The file is not changed, added and deleted objects are kept in the view.
+    """
+
+    def __init__(self, buffer: mmap.mmap):
+        """Init MmapView.
+
+        :param buffer: Memory-mapped packed shard.
+        """
+        self._buffer = buffer
+        magic, count = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Invalid packed shard {magic=}.")
+        view = memoryview(buffer)
+        start = HEADER.size
+        self._ids = view[start:start + count * 8].cast("q")
+        start += count * 8
+        self._offsets = view[start:start + (count + 1) * 8].cast("Q")
+        self._start = start + (count + 1) * 8
+        self._objects: DiDAny = {}  # decoded or added objects
+        self._added: set = set()  # ids that are not in the file
+        self._deleted: set = set()  # ids in the file that are deleted
+
+    def __repr__(self) -> str:
+        """__repr__."""
+        return f"<{self.__class__.__name__}: {len(self)}>"
+
+    def __contains__(self, key: object) -> bool:
+        """Check id without decoding the object."""
+        if key in self._objects:
+            return True
+        return self._position(key) >= 0 and key not in self._deleted
+
+    def __copy__(self) -> MmapView:
+        """Copy the view, the memory-mapped file is shared."""
+        view = self.__class__.__new__(self.__class__)
+        view.__dict__.update(self.__dict__)
+        view._objects = dict(self._objects)  # pylint: disable=W0212
+        view._added = set(self._added)  # pylint: disable=W0212
+        view._deleted = set(self._deleted)  # pylint: disable=W0212
+        return view
+
+    def __deepcopy__(self, memo: dict) -> DiDAny:
+        """Deep copy to the dictionary, all objects are decoded."""
+        return deepcopy(dict(self.items()), memo)
+
+    def __delitem__(self, key: int) -> None:
+        """Delete the object."""
+        if key not in self:
+            raise KeyError(key)
+        self._objects.pop(key, None)
+        if key in self._added:
+            self._added.discard(key)
+        else:
+            self._deleted.add(key)
+
+    def __getitem__(self, key: int) -> DAny:
+        """Get the object, decode on the first access."""
+        if key in self._objects:
+            return self._objects[key]
+        idx = self._position(key)
+        if idx < 0 or key in self._deleted:
+            raise KeyError(key)
+        start = self._start + self._offsets[idx]
+        end = self._start + self._offsets[idx + 1]
+        nb_object: DAny = pickle.loads(self._buffer[start:end])
+        self._objects[key] = nb_object
+        return nb_object
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate ids, the file ids are sorted, the added ids follow."""
+        for id_ in self._ids:
+            if id_ not in self._deleted:
+                yield id_
+        yield from list(self._added)
+
+    def __len__(self) -> int:
+        """Count of the objects."""
+        return len(self._ids) - len(self._deleted) + len(self._added)
+
+    def __reduce__(self):
+        """Pickle as the dictionary, all objects are decoded."""
+        return dict, (dict(self.items()),)
+
+    def __setitem__(self, key: int, value: DAny) -> None:
+        """Set the object, the file is not changed."""
+        if self._position(key) < 0:
+            self._added.add(key)
+        self._deleted.discard(key)
+        self._objects[key] = value
+
+    def clear(self) -> None:
+        """Remove all objects without decoding."""
+        self._objects.clear()
+        self._added.clear()
+        self._deleted = set(self._ids)
+
+    def _position(self, key: Any) -> int:
+        """Position of the id in the file, -1 if absent."""
+        if not isinstance(key, int):
+            return -1
+        idx = bisect_left(self._ids, key)
+        if idx < len(self._ids) and self._ids[idx] == key:
+            return idx
+        return -1
+
+
+BACKENDS: Dict[str, Type[CacheBackend]] = {
+    PickleBackend.suffix: PickleBackend,
+    JsonlBackend.suffix: JsonlBackend,
+    MmapBackend.suffix: MmapBackend,
+}
+
+
+# ============================= helpers ==========================
+
+
+def dumps(data: Any) -> bytes:
+    """Serialize data to JSON bytes, not str keys are converted to str."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def init_backend(cache: str) -> CacheBackend:
+    """Init cache backend by the suffix of the cache file.
+
+    :param cache: Path to the cache file.
+
+    :return: JsonlBackend for *.jsonl, MmapBackend for *.mmap, PickleBackend for others.
+    """
+    for suffix, backend in BACKENDS.items():
+        if str(cache).endswith(suffix):
+            return backend()
+    return PickleBackend()
+
+
+def iterate_models(tree: NbTree) -> Iterator[Tuple[str, str, DiDAny]]:
+    """Iterate not empty models of the tree.
+
+    :param tree: NbTree object.
+
+    :return: Generator of app name, model name and objects.
+    """
+    for app in tree.apps():
+        app_o = getattr(tree, app)
+        for model in app_o.models():
+            if data := getattr(app_o, model):
+                yield app, model, data
+
+
+def loads(data: bytes) -> Any:
+    """Deserialize JSON bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
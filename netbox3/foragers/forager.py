@@ -5,18 +5,18 @@
 from __future__ import annotations
 
 import logging
-import time
-from queue import Queue
-from threading import Thread
+from functools import partial
+from typing import Dict
 from urllib.parse import urlparse, parse_qs
 
-from vhelpers import vlist, vstr
+from vhelpers import vstr
 
 from netbox3 import helpers as h
-from netbox3.branch.nb_branch import NbBranch
 from netbox3.nb_api import NbApi
+from netbox3.foragers.indexer import Indexer, filter_objects
 from netbox3.nb_tree import NbTree, missed_urls
-from netbox3.types_ import LDAny, DiDAny, LStr, LT2StrDAny, DList, LDList, TLists
+from netbox3.types_ import LDAny, DiDAny, LStr, LT2StrDAny, DList, LDList, TLists, LLDAny
+from netbox3.types_ import LCallable
 
 
 class Forager:
@@ -36,9 +36,9 @@ class Forager:
         self.connector = getattr(getattr(self.api, app), model)
         # data
         self.root: NbTree = forager_a.root
-        self.root_d: DiDAny = getattr(getattr(self.root, app), model)
         self.tree: NbTree = forager_a.tree
         self.tree_d: DiDAny = getattr(getattr(self.tree, app), model)
+        self._indexers: Dict[str, Indexer] = {}  # "root", "tree"
 
     def __repr__(self) -> str:
         """__repr__."""
@@ -48,6 +48,11 @@ class Forager:
 
     # ============================= property =============================
 
+    @property
+    def root_d(self) -> DiDAny:
+        """Objects of the model in the NbForager.root, lazy model is loaded on access."""
+        return getattr(getattr(self.root, self.app), self.model)
+
     @property
     def interval(self) -> int:
         """Wait this time between requests (seconds)."""
@@ -94,10 +99,9 @@ class Forager:
         results: LDAny = []
         if self.threads > 1:
             path_params: LT2StrDAny = self._get_path_params(urls)
-            self._clear_connector_results(path_params)
-            self._query_threads(path_params)
-            results_: LDAny = self._pop_connector_results(path_params)
-            results.extend(results_)
+            pages: LLDAny = self._query_threads(path_params)
+            for page in pages:
+                results.extend(page)
 
         # loop
         else:
@@ -132,7 +136,7 @@ class Forager:
 
         :return: Filtered Netbox objects.
         """
-        return _find(objects=list(self.root_d.values()), **kwargs)
+        return self._indexer("root").find(**kwargs)
 
     def find_rse(self, role: str = "", site: str = "", env: str = "", **kwargs) -> LDAny:
         """Find Netbox objects in NbForager.tree by Role-Sile-Env finding parameters.
@@ -153,7 +157,7 @@ class Forager:
         }
         params = {k: v for k, v in params.items() if v}
         kwargs.update(params)
-        return _find(objects=list(self.tree_d.values()), **kwargs)
+        return self._indexer("tree").find(**kwargs)
 
     def find_tree(self, **kwargs) -> LDAny:
         """Find Netbox objects in NbForager.tree by extended finding parameters.
@@ -165,7 +169,7 @@ class Forager:
 
         :return: Filtered Netbox objects.
         """
-        return _find(objects=list(self.tree_d.values()), **kwargs)
+        return self._indexer("tree").find(**kwargs)
 
     # ============================= helpers ==============================
 
@@ -181,8 +185,11 @@ class Forager:
         """
         nb_objects: LDAny = self.connector.get(**kwargs)
         nb_objects = self._validate_ids(nb_objects)
+        root_d = self.root_d
         for nb_object in nb_objects:
-            self.root_d[nb_object["id"]] = nb_object
+            root_d[nb_object["id"]] = nb_object
+        self.root.set_loaded(f"{self.app}.{self.model}")
+        self.root.touch()
         return nb_objects
 
     @staticmethod
@@ -245,55 +252,18 @@ class Forager:
         return path_params
 
     # noinspection PyProtectedMember
-    def _clear_connector_results(self, path_params: LT2StrDAny) -> None:
-        """Clear results in connectors by path app/model."""
-        for path, _ in path_params:
-            connector = self._get_connector(path)
-            connector._results.clear()  # pylint: disable=W0212
-
-    def _query_threads(self, path_params: LT2StrDAny) -> None:
+    def _query_threads(self, path_params: LT2StrDAny) -> LLDAny:
         """Retrieve data from Netbox in threaded mode.
 
         :param path_params: A list of tuples containing the path app/model and parameters.
 
-        :return: None. Save results to self._results.
+        :return: Pages of Netbox objects, collected for this call only.
         """
-        queue: Queue = Queue()
+        tasks: LCallable = []
         for path, params_d in path_params:
-            queue.put((path, params_d))
-
-        for idx in range(self.threads):
-            if self.interval:
-                time.sleep(self.interval)
-            thread = Thread(name=f"Thread-{idx}", target=self._run_queue, args=(queue,))
-            thread.start()
-        queue.join()
-
-    # noinspection PyProtectedMember
-    def _run_queue(self, queue: Queue) -> None:
-        """Process tasks from the queue.
-
-        This method dequeues and executes tasks until the queue is empty.
-        Each task is expected to be a callable method with its corresponding params_d parameters.
-        :param queue: A queue containing path app/model and parameters pairs to be requested.
-
-        :return: None. Update connector._results list.
-        """
-        while not queue.empty():
-            path, params_d = queue.get()
             connector = self._get_connector(path)
-            connector._query_data_thread(path=path, params_d=params_d)  # pylint: disable=W0212
-            queue.task_done()
-
-    # noinspection PyProtectedMember
-    def _pop_connector_results(self, path_params: LT2StrDAny) -> LDAny:
-        """Get results from connectors by path app/model and delete cached results."""
-        results: LDAny = []
-        for path, _ in path_params:
-            connector = self._get_connector(path)
-            results.extend(connector._results)  # pylint: disable=W0212
-            connector._results.clear()  # pylint: disable=W0212
-        return results
+            tasks.append(partial(connector._request_data, path, params_d))  # pylint: disable=W0212
+        return self.connector._run_tasks(tasks)  # pylint: disable=W0212
 
     def _get_connector(self, path: str):
         """Get connector by app/model path.
@@ -315,6 +285,22 @@ class Forager:
             path = f"{app}/{model}"
             model_d: DiDAny = self._get_root_data(path)
             model_d[int(digit)] = data
+        self.root.touch()
+
+    def _indexer(self, name: str) -> Indexer:
+        """Get the indexer of the model objects, rebuild if the data is changed.
+
+        :param name: "root" or "tree".
+
+        :return: Indexer of the NbForager.root.{app}.{model} or NbForager.tree.{app}.{model}.
+        """
+        tree: NbTree = getattr(self, name)
+        objects_d: DiDAny = getattr(getattr(tree, self.app), self.model)
+        indexer = self._indexers.get(name)
+        if indexer is None or not indexer.is_valid(objects_d, tree.generation):
+            indexer = Indexer(objects_d, tree.generation)
+            self._indexers[name] = indexer
+        return indexer
 
     def _get_root_data(self, path: str) -> DiDAny:
         """Get data in self root by app/model path.
@@ -329,7 +315,7 @@ class Forager:
 
 
 def _find(objects: LDAny, **kwargs) -> LDAny:
-    """Find Netbox objects in tree by extended finding parameters.
+    """Find Netbox objects in tree by extended finding parameters, linear scan.
 
     :param objects: Netbox objects where searching is required using kwargs.
     :param kwargs: Extended filtering parameters.
@@ -341,21 +327,7 @@ def _find(objects: LDAny, **kwargs) -> LDAny:
     if not isinstance(values, TLists):
         values = [values]
 
-    objects_: LDAny = []
-    for data in objects:
-        keys = key.split("__")
-        if len(keys) <= 1:
-            keys = [key]
-        if keys[0] == "tags":
-            if len(keys) != 2:
-                raise ValueError(f"{keys=} {len(keys)=} expected 2.")
-            values_ = [d[keys[1]] for d in data["tags"]]
-            if vlist.is_in(values_, values):
-                objects_.append(data)
-        else:
-            value_ = NbBranch(data).any(*keys)
-            if value_ in values:
-                objects_.append(data)
+    objects_: LDAny = filter_objects(objects, key, values)
 
     if key_values:
         objects_ = _find(objects=objects_, **dict(key_values))
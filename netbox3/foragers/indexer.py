@@ -0,0 +1,169 @@
+"""Indexer, secondary indexes of the Netbox objects for the extended finding."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from vhelpers import vlist
+
+from netbox3.branch.nb_branch import NbBranch
+from netbox3.types_ import DAny, LDAny, LInt, LStr, SInt, TLists
+
+DLInt = Dict[Any, LInt]
+
+
+class Indexer:
+    """Secondary indexes of the model objects, keyed by the finding parameter.
+
+    The index of the parameter (for example "site__slug") is built on the first use,
+    it maps the values to the positions of the objects. The query planner intersects
+    the positions starting from the most selective parameter. Parameters with
+    not hashable values are checked by scanning the selected objects.
+    The Indexer is valid for the snapshot of the objects, see is_valid().
+    """
+
+    def __init__(self, objects_d: Mapping[int, DAny], generation: int = 0):
+        """Init Indexer.
+
+        :param objects_d: Netbox objects of the model, keyed by id.
+        :param generation: Generation of the NbTree data.
+        """
+        self.objects: LDAny = list(objects_d.values())
+        self._snapshot: Tuple[int, int, int] = (id(objects_d), len(objects_d), generation)
+        self._indexes: Dict[str, Optional[DLInt]] = {}
+
+    def __repr__(self) -> str:
+        """__repr__."""
+        name = self.__class__.__name__
+        return f"<{name}: objects={len(self.objects)} indexes={list(self._indexes)}>"
+
+    # =========================== method =============================
+
+    def find(self, **kwargs) -> LDAny:
+        """Find Netbox objects by extended finding parameters.
+
+        :param kwargs: Extended filtering parameters.
+            Different parameters work like an ``AND`` operator.
+            Different values of the same parameter work like an ``OR`` operator.
+
+        :return: Filtered Netbox objects in the original order.
+        """
+        if not kwargs:
+            return list(self.objects)
+
+        selected: Optional[SInt] = None
+        scans: list = []
+        candidates: list = []
+        for key, values in kwargs.items():
+            values = list(values) if isinstance(values, TLists) else [values]
+            positions = self._positions(key, values)
+            if positions is None:
+                scans.append((key, values))
+            else:
+                candidates.append(positions)
+
+        # the most selective first
+        for positions in sorted(candidates, key=len):
+            selected = positions if selected is None else selected.intersection(positions)
+            if not selected:
+                return []
+
+        indexes = range(len(self.objects)) if selected is None else sorted(selected)
+        objects: LDAny = [self.objects[i] for i in indexes]
+        for key, values in scans:
+            objects = filter_objects(objects, key, values)
+        return objects
+
+    def is_valid(self, objects_d: Mapping[int, DAny], generation: int = 0) -> bool:
+        """Check if the Indexer is built for the same objects.
+
+        :param objects_d: Netbox objects of the model, keyed by id.
+        :param generation: Generation of the NbTree data.
+
+        :return: True if the objects and the generation are not changed.
+        """
+        return self._snapshot == (id(objects_d), len(objects_d), generation)
+
+    # =========================== helpers ============================
+
+    def _index(self, key: str) -> Optional[DLInt]:
+        """Get the index of the parameter, build on the first use.
+
+        :return: Index, None if the values are not hashable.
+        """
+        if key not in self._indexes:
+            self._indexes[key] = self._build(key)
+        return self._indexes[key]
+
+    def _build(self, key: str) -> Optional[DLInt]:
+        """Build the index of the parameter.
+
+        :return: Index, None if the values are not hashable.
+        """
+        keys = split_key(key)
+        index: DLInt = {}
+        try:
+            if keys[0] == "tags":
+                if len(keys) != 2:
+                    return None
+                for idx, data in enumerate(self.objects):
+                    for value in {d[keys[1]] for d in data["tags"]}:
+                        index.setdefault(value, []).append(idx)
+            else:
+                get_value = NbBranch.compile(*keys).any
+                for idx, data in enumerate(self.objects):
+                    index.setdefault(get_value(data), []).append(idx)
+        except (KeyError, TypeError):
+            return None
+        return index
+
+    def _positions(self, key: str, values: list) -> Optional[SInt]:
+        """Positions of the objects that match any of the values.
+
+        :return: Positions, None if the parameter is not indexed.
+        """
+        index = self._index(key)
+        if index is None:
+            return None
+        positions: SInt = set()
+        try:
+            for value in values:
+                positions.update(index.get(value) or [])
+        except TypeError:
+            return None
+        return positions
+
+
+# ============================= helpers ==========================
+
+
+def filter_objects(objects: LDAny, key: str, values: list) -> LDAny:
+    """Filter Netbox objects by the finding parameter.
+
+    :param objects: Netbox objects.
+    :param key: Finding parameter, keys separated by double underscores.
+    :param values: Values of the parameter, any of them.
+
+    :return: Netbox objects that match the parameter.
+
+    :raise ValueError: If the tags parameter has invalid keys.
+    """
+    keys = split_key(key)
+    if keys[0] == "tags":
+        if len(keys) != 2:
+            raise ValueError(f"{keys=} {len(keys)=} expected 2.")
+        return [d for d in objects if vlist.is_in([t[keys[1]] for t in d["tags"]], values)]
+    get_value = NbBranch.compile(*keys).any
+    return [d for d in objects if get_value(d) in values]
+
+
+def split_key(key: str) -> LStr:
+    """Split the finding parameter by double underscores.
+
+    :example:
+        split_key("site__slug") -> ["site", "slug"]
+    """
+    keys = key.split("__")
+    if len(keys) <= 1:
+        keys = [key]
+    return keys
@@ -1,21 +1,244 @@
 """IPv4"""
-from ciscoconfparse import IPv4Obj  # type: ignore
+from __future__ import annotations
 
+from bisect import insort
+from functools import total_ordering
+from ipaddress import AddressValueError, IPv6Address, NetmaskValueError
+from typing import Any, Dict, Iterable, Tuple, Type
 
-class IPv4(IPv4Obj):
-    """IPv4, support prefixlen for ip-address."""
+from netbox3.types_ import DAny, LDAny, LInt
+
+MASK32 = 0xFFFFFFFF
+
+
+@total_ordering
+class IPv4:
+    """IPv4 address with prefixlen, compact value type of the integer address and prefixlen.
+
+    Supports containment of the networks, ordering and hashing,
+    the ip-address with prefixlen (A.B.C.D/LEN) represents its network.
+    """
+
+    __slots__ = ("as_decimal", "prefixlen")
+    version = 4
+    max_prefixlen = 32
+
+    def __init__(self, address: str, strict: bool = False):
+        """Init IPv4.
+
+        :param address: IP address with prefixlen or netmask, A.B.C.D/LEN or A.B.C.D/M.M.M.M.
+            Address without prefixlen is the host address /32.
+        :param strict: True - raise ValueError if the host bits are set, address is not network.
+
+        :raise AddressValueError: If the address is invalid.
+        :raise NetmaskValueError: If the prefixlen is invalid.
+        """
+        ip_, _, prefixlen = str(address).strip().partition("/")
+        self.as_decimal: int = self._parse_ip(ip_)
+        self.prefixlen: int = self._parse_prefixlen(prefixlen)
+        if strict and self.as_decimal != self.as_decimal_network:
+            raise ValueError(f"{address=} has host bits set.")
+
+    def __repr__(self) -> str:
+        """__repr__."""
+        return f"<{self.__class__.__name__} {self.ipv4}>"
+
+    def __str__(self) -> str:
+        """__str__."""
+        return self.ipv4
+
+    def __hash__(self) -> int:
+        """__hash__."""
+        return hash(sort_key(self))
+
+    def __eq__(self, other: Any) -> bool:
+        """Equal address and prefixlen."""
+        if not isinstance(other, IPv4):
+            return NotImplemented
+        return sort_key(self) == sort_key(other)
+
+    def __lt__(self, other: Any) -> bool:
+        """Order by network, the same network by prefixlen, then by address."""
+        if not isinstance(other, IPv4):
+            return NotImplemented
+        return sort_key(self) < sort_key(other)
+
+    def __contains__(self, other: IPv4) -> bool:
+        """Network of the other object is the subnet of this network (or the same)."""
+        if self.version != other.version or self.prefixlen > other.prefixlen:
+            return False
+        return other.as_decimal & self.netmask == self.as_decimal_network
+
+    # ============================= property =============================
+
+    @property
+    def as_decimal_network(self) -> int:
+        """Network address as integer."""
+        return self.as_decimal & self.netmask
+
+    @property
+    def netmask(self) -> int:
+        """Netmask as integer."""
+        mask = (1 << self.max_prefixlen) - 1
+        return (mask << (self.max_prefixlen - self.prefixlen)) & mask
 
     @property
     def ip(self) -> str:
         """IPv4 address without prefixlen, A.B.C.D."""
-        return self.exploded
+        return self._to_str(self.as_decimal)
 
     @property
     def ipv4(self) -> str:
         """IPv4 address with prefixlen, A.B.C.D/LEN."""
-        return self.as_cidr_addr
+        return f"{self._to_str(self.as_decimal)}/{self.prefixlen}"
 
     @property
     def net(self) -> str:
         """IPv4 network with prefixlen, A.B.C.D/LEN."""
-        return self.as_cidr_net
+        return f"{self._to_str(self.as_decimal_network)}/{self.prefixlen}"
+
+    # ============================= helpers ==============================
+
+    def _parse_ip(self, ip_: str) -> int:
+        """Convert A.B.C.D to integer.
+
+        :raise AddressValueError: If the address is invalid.
+        """
+        octets = ip_.split(".")
+        if len(octets) != 4:
+            raise AddressValueError(f"Expected 4 octets in {ip_!r}.")
+        value = 0
+        for octet in octets:
+            if not (octet.isascii() and octet.isdigit()) or len(octet) > 3 or int(octet) > 255:
+                raise AddressValueError(f"Invalid octet {octet!r} in {ip_!r}.")
+            value = value << 8 | int(octet)
+        return value
+
+    def _parse_prefixlen(self, prefixlen: str) -> int:
+        """Convert prefixlen or netmask to integer prefixlen.
+
+        :raise NetmaskValueError: If the prefixlen is invalid.
+        """
+        if not prefixlen:
+            return self.max_prefixlen
+        if prefixlen.isascii() and prefixlen.isdigit():
+            prefixlen_ = int(prefixlen)
+            if prefixlen_ <= self.max_prefixlen:
+                return prefixlen_
+        elif self.version == 4 and "." in prefixlen:
+            try:
+                mask = self._parse_ip(prefixlen)
+            except AddressValueError:
+                mask = -1
+            prefixlen_ = bin(mask).count("1")
+            if mask >= 0 and mask == (MASK32 << (32 - prefixlen_)) & MASK32:
+                return prefixlen_
+        raise NetmaskValueError(f"{prefixlen!r} is not a valid netmask.")
+
+    @staticmethod
+    def _to_str(value: int) -> str:
+        """Convert integer to A.B.C.D."""
+        return f"{value >> 24}.{value >> 16 & 255}.{value >> 8 & 255}.{value & 255}"
+
+
+class IPv6(IPv4):
+    """IPv6 address with prefixlen, compact value type of the integer address and prefixlen."""
+
+    __slots__ = ()
+    version = 6
+    max_prefixlen = 128
+
+    def _parse_ip(self, ip_: str) -> int:
+        """Convert IPv6 address to integer.
+
+        :raise AddressValueError: If the address is invalid.
+        """
+        return int(IPv6Address(ip_))
+
+    @staticmethod
+    def _to_str(value: int) -> str:
+        """Convert integer to the compressed IPv6 address."""
+        return str(IPv6Address(value))
+
+
+class PrefixTrie:
+    """Longest-prefix-match index of the Netbox objects by the IPv4 network.
+
+    Levels are the prefix lengths, each level maps the integer network to the objects.
+    Lookup of the supernets takes one dictionary access per level, not a scan of all
+    objects. Objects with the same network keep the order in which they were added.
+    All objects in the trie must have the same IP version.
+    """
+
+    def __init__(self, items: Iterable[DAny] = (), key: str = "ipv4"):
+        """Init PrefixTrie.
+
+        :param items: Netbox objects with the IPv4 object in the key.
+        :param key: Key of the IPv4 object in the Netbox object.
+        """
+        self.key = key
+        self._levels: Dict[int, Dict[int, LDAny]] = {}
+        self._prefixlens: LInt = []
+        for data in items:
+            self.add(data)
+
+    def __len__(self) -> int:
+        """Count of the objects."""
+        return sum(len(items) for level in self._levels.values() for items in level.values())
+
+    def add(self, data: DAny) -> None:
+        """Add Netbox object to the trie.
+
+        :param data: Netbox object with the IPv4 object in the key.
+        """
+        network, prefixlen = network_prefixlen(data[self.key])
+        if prefixlen not in self._levels:
+            self._levels[prefixlen] = {}
+            insort(self._prefixlens, prefixlen)
+        self._levels[prefixlen].setdefault(network, []).append(data)
+
+    def supernets(self, ipv4: IPv4) -> LDAny:
+        """Get the objects which prefixes contain the IPv4 network, same as IPv4.__contains__.
+
+        :param ipv4: IPv4 object, subnet or address with prefixlen.
+
+        :return: Netbox objects from the shortest prefixlen to the longest.
+        """
+        network, prefixlen = network_prefixlen(ipv4)
+        max_prefixlen = ipv4.max_prefixlen
+        max_mask = (1 << max_prefixlen) - 1
+        items: LDAny = []
+        for prefixlen_ in self._prefixlens:
+            if prefixlen_ > prefixlen:
+                break
+            mask = (max_mask << (max_prefixlen - prefixlen_)) & max_mask
+            items.extend(self._levels[prefixlen_].get(network & mask) or [])
+        return items
+
+
+# ============================= helpers ==============================
+
+
+def init_ip(address: str, strict: bool = False) -> IPv4:
+    """Init IPv4 or IPv6 object by the address.
+
+    :param address: IP address with prefixlen, A.B.C.D/LEN or IPv6.
+    :param strict: True - raise ValueError if the host bits are set, address is not network.
+
+    :return: IPv4 or IPv6 object.
+    """
+    class_: Type[IPv4] = IPv6 if ":" in str(address) else IPv4
+    return class_(address, strict=strict)
+
+
+def network_prefixlen(ipv4: IPv4) -> Tuple[int, int]:
+    """Get the integer network and the prefix length of the IPv4 object."""
+    return ipv4.as_decimal_network, ipv4.prefixlen
+
+
+def sort_key(ipv4: IPv4) -> Tuple[int, int, int, int]:
+    """Key to sort IPv4 objects in the same order as IPv4.__lt__.
+
+    By version, network, then by prefixlen, then by address.
+    """
+    return ipv4.version, ipv4.as_decimal_network, ipv4.prefixlen, ipv4.as_decimal
@@ -1,13 +1,14 @@
 """Joiner."""
 from operator import itemgetter
+from typing import Dict, Tuple
 
 from netports import Intf
-from vhelpers import vlist
 
 from netbox3.api.base_c import BaseC
-from netbox3.foragers.ipv4 import IPv4
+from netbox3.foragers import ipv4
+from netbox3.foragers.ipv4 import PrefixTrie, sort_key
 from netbox3.nb_tree import NbTree
-from netbox3.types_ import LDAny, DAny, LStr, DiDAny, LInt, DiLDAny
+from netbox3.types_ import LDAny, DAny, LStr, DiDAny, LInt, DiLDAny, SInt, DLDAny
 
 
 class Joiner:
@@ -83,137 +84,206 @@ class Joiner:
                 if model in device_:
                     device_[model][name] = port
 
+    def join_ipam(self) -> None:
+        """Create additional keys to represent ipam similar to the WEB UI.
+
+            Add ipv4, aggregate, super_prefix, sub_prefixes, ip_addresses
+            in ipam.aggregate, ipam.prefixes, ipam.ip_addresses.
+            Objects are split by family (IPv4, IPv6) and VRF, the hierarchy of each
+            partition is built independently. Aggregates are joined to the prefixes
+            and ip-addresses of the global routing table (without VRF).
+            The ipv4 key contains IPv4 or IPv6 object.
+
+        :return: None. Update NbTree object.
+        """
+        self._init_ipam_keys()
+        for partition in self._get_ipam_partitions().values():
+            self._join_ipam_partition(**partition)
+
     def join_ipam_ipv4(self) -> None:
         """Create additional keys to represent ipam similar to the WEB UI.
 
             Add ipv4, aggregate, super_prefix, sub_prefixes, ip_addresses
             in ipam.aggregate, ipam.prefixes, ipam.ip_addresses.
+            Same as join_ipam(), but only for IPv4 objects of the global routing table.
 
         :return: None. Update NbTree object.
         """
         self._init_ipam_keys()
-        self._join_ipam_aggregates()
-        self._join_ipam_prefixes()
-        self._join_ipam_ip_addresses()
-        self._join_update_sub_prefixes()
+        partitions = self._get_ipam_partitions()
+        if partition := partitions.get((4, 0)):
+            self._join_ipam_partition(**partition)
 
     def _init_ipam_keys(self) -> None:
         """Init extra keys that are required for aggregates, prefixes, ip_addresses."""
-        for model, key, strict in [
-            ("aggregates", "prefix", True),
-            ("prefixes", "prefix", True),
-            ("ip_addresses", "address", False),
+        for model, key in [
+            ("aggregates", "prefix"),
+            ("prefixes", "prefix"),
+            ("ip_addresses", "address"),
         ]:
             objects: DiDAny = getattr(self.tree.ipam, model)
             for data in objects.values():
                 snet = data[key]
-                data["ipv4"] = IPv4(snet, strict=strict)
+                data["ipv4"] = ipv4.init_ip(snet)  # host bits are allowed, joined by network
                 data["aggregate"] = {}
                 data["super_prefix"] = {}
                 data["sub_prefixes"] = []
                 data["ip_addresses"] = []
 
-    def _join_ipam_aggregates(self) -> None:
-        """Add prefixes to tree.ipam.aggregates.sub_prefixes."""
-        aggregates: LDAny = self._get_aggregates_ip4()
-        prefixes_d: DiLDAny = self._get_prefixes_ip4_d()
-        for aggregate in aggregates:
-            for depth, prefixes in prefixes_d.items():
-                for prefix in prefixes:
-                    _aggregate = aggregate["prefix"]
-                    _prefix = prefix["prefix"]
-                    if prefix["ipv4"] in aggregate["ipv4"]:
-                        prefix["aggregate"] = aggregate
-                        if depth == 0:
-                            aggregate["sub_prefixes"].append(prefix)
-
-    def _join_ipam_ip_addresses(self) -> None:
-        """Add prefixes to tree.ipam.ip-addresses.super_prefix."""
-        ip_addresses: LDAny = self._get_ip_addresses_ip4()
-        prefixes_d: DiLDAny = self._get_prefixes_ip4_d()
+    def _get_ipam_partitions(self) -> Dict[Tuple[int, int], DLDAny]:
+        """Split aggregates, prefixes and ip-addresses by family and VRF.
+
+        :return: Partitions keyed by (family, VRF id), VRF id 0 is the global routing table.
+            Each partition contains aggregates, prefixes, ip_addresses sorted by IP.
+            Aggregates are only in the global routing table.
+        """
+        partitions: Dict[Tuple[int, int], DLDAny] = {}
+        for model in ["aggregates", "prefixes", "ip_addresses"]:
+            objects: DiDAny = getattr(self.tree.ipam, model)
+            for data in objects.values():
+                vrf_id = int((data.get("vrf") or {}).get("id") or 0)
+                key = (int(data["family"]["value"]), vrf_id)
+                if key not in partitions:
+                    partitions[key] = {"aggregates": [], "prefixes": [], "ip_addresses": []}
+                partitions[key][model].append(data)
+
+        for partition in partitions.values():
+            for model, objects_ in partition.items():
+                partition[model] = _sorted(objects_)
+        return partitions
+
+    def _join_ipam_partition(self, aggregates: LDAny, prefixes: LDAny,
+                             ip_addresses: LDAny) -> None:
+        """Join objects of the same family and VRF.
+
+        :param aggregates: Aggregates sorted by IP.
+        :param prefixes: Prefixes sorted by IP.
+        :param ip_addresses: IP addresses sorted by IP.
+        """
+        prefixes_d: DiLDAny = _split_depth(prefixes)
+        self._join_ipam_aggregates(aggregates, prefixes_d)
+        self._join_ipam_prefixes(prefixes_d)
+        self._join_ipam_ip_addresses(ip_addresses, prefixes_d)
+        self._join_update_sub_prefixes(aggregates, prefixes)
+
+    @staticmethod
+    def _join_ipam_aggregates(aggregates: LDAny, prefixes_d: DiLDAny) -> None:
+        """Add prefixes to tree.ipam.aggregates.sub_prefixes.
+
+        The last aggregate in sorted order that contains the prefix is the aggregate
+        of the prefix, prefixes of depth 0 are the sub_prefixes of all aggregates
+        that contain them.
+
+        :param aggregates: Aggregates sorted by IP.
+        :param prefixes_d: Prefixes split by depth.
+        """
+        trie = PrefixTrie(aggregates)
+        for depth, prefixes in prefixes_d.items():
+            for prefix in prefixes:
+                aggregates_: LDAny = trie.supernets(prefix["ipv4"])
+                if not aggregates_:
+                    continue
+                prefix["aggregate"] = aggregates_[-1]
+                if depth == 0:
+                    for aggregate in aggregates_:
+                        aggregate["sub_prefixes"].append(prefix)
+
+    @staticmethod
+    def _join_ipam_ip_addresses(ip_addresses: LDAny, prefixes_d: DiLDAny) -> None:
+        """Add prefixes to tree.ipam.ip-addresses.super_prefix.
+
+        The super_prefix is the first prefix in sorted order that contains
+        the ip-address, from the deepest prefixes.
+
+        :param ip_addresses: IP addresses sorted by IP.
+        :param prefixes_d: Prefixes split by depth.
+        """
         depths: LInt = list(prefixes_d)
         depths.reverse()
+        tries = [PrefixTrie(prefixes_d[depth]) for depth in depths]
 
-        added_addresses: LDAny = []
-        for depth in depths:
-            ip_addresses_ = ip_addresses.copy()
-            prefixes: LDAny = prefixes_d.get(depth, [])
-            for ip_address in ip_addresses_:
-                for prefix in prefixes:
-                    if ip_address["ipv4"] not in prefix["ipv4"]:
-                        continue
-                    if ip_address in added_addresses:
-                        continue
-                    ip_address["aggregate"] = prefix["aggregate"]
-                    ip_address["super_prefix"] = prefix
-                    prefix["ip_addresses"].append(ip_address)
-                    added_addresses.append(ip_address)
-            ip_addresses = [d for d in ip_addresses if d not in added_addresses]
-
-    def _join_ipam_prefixes(self) -> None:
-        """Add prefixes to tree.ipam.prefixes.sub_prefixes, super_prefix"""
-        super_prefixes = []
-        prefixes_d: DiLDAny = self._get_prefixes_ip4_d()
-        for depth, sub_prefixes in enumerate(prefixes_d.values()):
-            if not depth:
-                super_prefixes = sub_prefixes
-                continue
-            for super_prefix in super_prefixes:
-                if super_prefix["ipv4"].prefixlen == 32:
+        for ip_address in ip_addresses:
+            for trie in tries:
+                prefixes: LDAny = trie.supernets(ip_address["ipv4"])
+                if not prefixes:
                     continue
+                prefix = prefixes[0]
+                ip_address["aggregate"] = prefix["aggregate"]
+                ip_address["super_prefix"] = prefix
+                prefix["ip_addresses"].append(ip_address)
+                break
+
+    @staticmethod
+    def _join_ipam_prefixes(prefixes_d: DiLDAny) -> None:
+        """Add prefixes to tree.ipam.prefixes.sub_prefixes, super_prefix.
+
+        The super_prefixes of the prefix are the prefixes of the previous depth
+        that contain it, the last one in sorted order is the super_prefix.
+
+        :param prefixes_d: Prefixes split by depth.
+        """
+        super_prefixes = PrefixTrie()
+        for depth, sub_prefixes in enumerate(prefixes_d.values()):
+            if depth:
                 for sub_prefix in sub_prefixes:
-                    if sub_prefix["ipv4"] in (super_prefix["ipv4"]):
+                    supers: LDAny = super_prefixes.supernets(sub_prefix["ipv4"])
+                    for super_prefix in supers:
                         super_prefix["sub_prefixes"].append(sub_prefix)
-                        sub_prefix["super_prefix"] = super_prefix
-            super_prefixes = sub_prefixes
+                    if supers:
+                        sub_prefix["super_prefix"] = supers[-1]
+            prefixes = [d for d in sub_prefixes if d["ipv4"].prefixlen != d["ipv4"].max_prefixlen]
+            super_prefixes = PrefixTrie(prefixes)
 
-    def _join_update_sub_prefixes(self) -> None:
+    @staticmethod
+    def _join_update_sub_prefixes(aggregates: LDAny, prefixes: LDAny) -> None:
         """Update sub_prefixes in ipam.aggregates and ipam.prefixes.
 
-        Remove duplicates, remove objects with improper depth, sort by IPv4.
+        Remove duplicates, remove objects with improper depth, sort by IP.
+
+        :param aggregates: Aggregates of the partition.
+        :param prefixes: Prefixes of the partition.
         """
-        aggregates = self._get_aggregates_ip4()
         for aggregate in aggregates:
-            sub_prefixes = vlist.no_dupl(aggregate["sub_prefixes"])
+            sub_prefixes = _no_dupl(aggregate["sub_prefixes"])
             sub_prefixes = [d for d in sub_prefixes if not d["super_prefix"]]
-            aggregate["sub_prefixes"] = sorted(sub_prefixes, key=itemgetter("ipv4"))
+            aggregate["sub_prefixes"] = _sorted(sub_prefixes)
 
-        prefixes = self._get_prefixes_ip4()
         for prefix in prefixes:
-            sub_prefixes = vlist.no_dupl(prefix["sub_prefixes"])
-            prefix["sub_prefixes"] = sorted(sub_prefixes, key=itemgetter("ipv4"))
-            ip_addresses = vlist.no_dupl(prefix["ip_addresses"])
-            prefix["ip_addresses"] = sorted(ip_addresses, key=itemgetter("ipv4"))
-
-    # ============================= helpers ==============================
-
-    def _get_aggregates_ip4(self) -> LDAny:
-        """Return ipam.aggregates family=4 sorted by IPv4."""
-        aggregates: LDAny = list(self.tree.ipam.aggregates.values())
-        aggregates = [d for d in aggregates if d["family"]["value"] == 4]
-        return sorted(aggregates, key=itemgetter("ipv4"))
-
-    def _get_ip_addresses_ip4(self) -> LDAny:
-        """Return ipam.ip_addresses family=4 sorted by IPv4."""
-        ip_addresses: LDAny = list(self.tree.ipam.ip_addresses.values())
-        ip_addresses = [d for d in ip_addresses if d["family"]["value"] == 4 and d["vrf"] is None]
-        return sorted(ip_addresses, key=itemgetter("ipv4"))
-
-    def _get_prefixes_ip4(self) -> LDAny:
-        """Return ipam.prefixes family=4 sorted by IPv4."""
-        prefixes: LDAny = list(self.tree.ipam.prefixes.values())
-        prefixes = [d for d in prefixes if d["family"]["value"] == 4 and d["vrf"] is None]
-        return sorted(prefixes, key=itemgetter("ipv4"))
-
-    def _get_prefixes_ip4_d(self) -> DiLDAny:
-        """Split prefixes by depth.
-
-        :return: A dictionary of prefixes where the key represents the depth
-            and the value represents a list of prefixes at that depth.
-        """
-        prefixes: LDAny = self._get_prefixes_ip4()
-        prefixes_d: DiLDAny = {d["_depth"]: [] for d in prefixes}
-        for prefix in prefixes:
-            depth = int(prefix["_depth"])
-            prefixes_d[depth].append(prefix)
-        return prefixes_d
+            sub_prefixes = _no_dupl(prefix["sub_prefixes"])
+            prefix["sub_prefixes"] = _sorted(sub_prefixes)
+            ip_addresses = _no_dupl(prefix["ip_addresses"])
+            prefix["ip_addresses"] = _sorted(ip_addresses)
+
+
+# ============================= helpers ==============================
+
+
+def _no_dupl(items: LDAny) -> LDAny:
+    """Remove the same objects from the list, keep the order."""
+    ids: SInt = set()
+    items_: LDAny = []
+    for data in items:
+        if id(data) not in ids:
+            ids.add(id(data))
+            items_.append(data)
+    return items_
+
+
+def _sorted(items: LDAny) -> LDAny:
+    """Sort Netbox objects by IP, same order as IPv4.__lt__."""
+    return sorted(items, key=lambda d: sort_key(d["ipv4"]))
+
+
+def _split_depth(prefixes: LDAny) -> DiLDAny:
+    """Split prefixes by depth.
+
+    :param prefixes: Prefixes sorted by IP.
+
+    :return: A dictionary of prefixes where the key represents the depth
+        and the value represents a list of prefixes at that depth.
+    """
+    prefixes_d: DiLDAny = {d["_depth"]: [] for d in prefixes}
+    for prefix in prefixes:
+        depth = int(prefix["_depth"])
+        prefixes_d[depth].append(prefix)
+    return prefixes_d
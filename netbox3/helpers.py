@@ -7,7 +7,113 @@ from urllib.parse import urlencode, ParseResult
 from vhelpers import vlist, vparam
 
 from netbox3.types_ import LStr, LDAny, DDDLInt, LValue, LParam, LDList, DList, SeqStr, SStr
-from netbox3.types_ import LTInt2, DAny, TValues, TLists, T2Str, T3Str
+from netbox3.types_ import LTInt2, DAny, TValues, TLists, T2Str, T3Str, DStr
+
+# Netbox content types of the models, "app.model_attr": "app_label.model"
+CONTENT_TYPES: DStr = {
+    "circuits.circuit_terminations": "circuits.circuittermination",
+    "circuits.circuit_types": "circuits.circuittype",
+    "circuits.circuits": "circuits.circuit",
+    "circuits.provider_accounts": "circuits.provideraccount",
+    "circuits.provider_networks": "circuits.providernetwork",
+    "circuits.providers": "circuits.provider",
+    "core.data_files": "core.datafile",
+    "core.data_sources": "core.datasource",
+    "core.jobs": "core.job",
+    "dcim.cable_terminations": "dcim.cabletermination",
+    "dcim.cables": "dcim.cable",
+    "dcim.console_port_templates": "dcim.consoleporttemplate",
+    "dcim.console_ports": "dcim.consoleport",
+    "dcim.console_server_port_templates": "dcim.consoleserverporttemplate",
+    "dcim.console_server_ports": "dcim.consoleserverport",
+    "dcim.device_bay_templates": "dcim.devicebaytemplate",
+    "dcim.device_bays": "dcim.devicebay",
+    "dcim.device_roles": "dcim.devicerole",
+    "dcim.device_types": "dcim.devicetype",
+    "dcim.devices": "dcim.device",
+    "dcim.front_port_templates": "dcim.frontporttemplate",
+    "dcim.front_ports": "dcim.frontport",
+    "dcim.interface_templates": "dcim.interfacetemplate",
+    "dcim.interfaces": "dcim.interface",
+    "dcim.inventory_item_roles": "dcim.inventoryitemrole",
+    "dcim.inventory_item_templates": "dcim.inventoryitemtemplate",
+    "dcim.inventory_items": "dcim.inventoryitem",
+    "dcim.locations": "dcim.location",
+    "dcim.manufacturers": "dcim.manufacturer",
+    "dcim.module_bay_templates": "dcim.modulebaytemplate",
+    "dcim.module_bays": "dcim.modulebay",
+    "dcim.module_types": "dcim.moduletype",
+    "dcim.modules": "dcim.module",
+    "dcim.platforms": "dcim.platform",
+    "dcim.power_feeds": "dcim.powerfeed",
+    "dcim.power_outlet_templates": "dcim.poweroutlettemplate",
+    "dcim.power_outlets": "dcim.poweroutlet",
+    "dcim.power_panels": "dcim.powerpanel",
+    "dcim.power_port_templates": "dcim.powerporttemplate",
+    "dcim.power_ports": "dcim.powerport",
+    "dcim.rack_reservations": "dcim.rackreservation",
+    "dcim.rack_roles": "dcim.rackrole",
+    "dcim.racks": "dcim.rack",
+    "dcim.rear_port_templates": "dcim.rearporttemplate",
+    "dcim.rear_ports": "dcim.rearport",
+    "dcim.regions": "dcim.region",
+    "dcim.site_groups": "dcim.sitegroup",
+    "dcim.sites": "dcim.site",
+    "dcim.virtual_chassis": "dcim.virtualchassis",
+    "dcim.virtual_device_contexts": "dcim.virtualdevicecontext",
+    "extras.bookmarks": "extras.bookmark",
+    "extras.config_contexts": "extras.configcontext",
+    "extras.config_templates": "extras.configtemplate",
+    "extras.content_types": "contenttypes.contenttype",
+    "extras.custom_field_choice_sets": "extras.customfieldchoiceset",
+    "extras.custom_fields": "extras.customfield",
+    "extras.custom_links": "extras.customlink",
+    "extras.export_templates": "extras.exporttemplate",
+    "extras.image_attachments": "extras.imageattachment",
+    "extras.journal_entries": "extras.journalentry",
+    "extras.object_changes": "extras.objectchange",
+    "extras.reports": "extras.report",
+    "extras.saved_filters": "extras.savedfilter",
+    "extras.scripts": "extras.script",
+    "extras.tags": "extras.tag",
+    "extras.webhooks": "extras.webhook",
+    "ipam.aggregates": "ipam.aggregate",
+    "ipam.asn_ranges": "ipam.asnrange",
+    "ipam.asns": "ipam.asn",
+    "ipam.fhrp_group_assignments": "ipam.fhrpgroupassignment",
+    "ipam.fhrp_groups": "ipam.fhrpgroup",
+    "ipam.ip_addresses": "ipam.ipaddress",
+    "ipam.ip_ranges": "ipam.iprange",
+    "ipam.l2vpn_terminations": "ipam.l2vpntermination",
+    "ipam.l2vpns": "ipam.l2vpn",
+    "ipam.prefixes": "ipam.prefix",
+    "ipam.rirs": "ipam.rir",
+    "ipam.roles": "ipam.role",
+    "ipam.route_targets": "ipam.routetarget",
+    "ipam.service_templates": "ipam.servicetemplate",
+    "ipam.services": "ipam.service",
+    "ipam.vlan_groups": "ipam.vlangroup",
+    "ipam.vlans": "ipam.vlan",
+    "ipam.vrfs": "ipam.vrf",
+    "tenancy.contact_assignments": "tenancy.contactassignment",
+    "tenancy.contact_groups": "tenancy.contactgroup",
+    "tenancy.contact_roles": "tenancy.contactrole",
+    "tenancy.contacts": "tenancy.contact",
+    "tenancy.tenant_groups": "tenancy.tenantgroup",
+    "tenancy.tenants": "tenancy.tenant",
+    "users.groups": "auth.group",
+    "users.permissions": "users.objectpermission",
+    "users.tokens": "users.token",
+    "users.users": "auth.user",
+    "virtualization.cluster_groups": "virtualization.clustergroup",
+    "virtualization.cluster_types": "virtualization.clustertype",
+    "virtualization.clusters": "virtualization.cluster",
+    "virtualization.interfaces": "virtualization.vminterface",
+    "virtualization.virtual_machines": "virtualization.virtualmachine",
+    "wireless.wireless_lan_groups": "wireless.wirelesslangroup",
+    "wireless.wireless_lans": "wireless.wirelesslan",
+    "wireless.wireless_links": "wireless.wirelesslink",
+}
 
 
 # =========================== app model id ===========================
@@ -49,6 +155,44 @@ def attr_names(obj: Any) -> LStr:
     return methods
 
 
+def content_type(app: str, model: str) -> str:
+    """Get the Netbox content type of the model, "app_label.model".
+
+    :param app: The application name.
+    :param model: The model attribute name.
+
+    :return: The content type, as changed_object_type in extras/object-changes/.
+
+    :raise KeyError: If the model is not in CONTENT_TYPES.
+
+    :example:
+        content_type("virtualization", "interfaces") -> "virtualization.vminterface"
+    """
+    return CONTENT_TYPES[f"{app}.{model}"]
+
+
+def attr_to_content_type(model: str) -> str:
+    """Convert model attribute name to content type model name (singular, without "_").
+
+    :param model: The model attribute name to be converted.
+
+    :return: The content type model name.
+
+    :example:
+        attr_to_content_type("ip_addresses") -> "ipaddress"
+    """
+    name = model.replace("_", "")
+    if name.endswith("chassis"):
+        return name
+    if name.endswith("ies"):
+        return name[:-3] + "y"
+    if name.endswith(("sses", "xes")):
+        return name[:-2]
+    if name.endswith("s"):
+        return name[:-1]
+    return name
+
+
 def join_urls(urls: LStr) -> LStr:
     """Join URLs by models with list of IDs in query.
 
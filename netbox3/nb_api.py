@@ -4,19 +4,24 @@
 
 from __future__ import annotations
 
+from netbox3.api.base_c import init_executor
 from netbox3.api.circuits import CircuitsAC
 from netbox3.api.core import CoreAC
 from netbox3.api.dcim import DcimAC
 from netbox3.api.extras import ExtrasAC
+from netbox3.api.http_cache import init_response_cache
+from netbox3.api.id_cache import IdCache
 from netbox3.api.ipam import IpamAC
+from netbox3.api.limiter import init_limiter, init_pacer
 from netbox3.api.plugins_ca import PluginsAC
+from netbox3.api.session import init_session
 from netbox3.api.status import StatusC
 from netbox3.api.tenancy import TenancyAC
 from netbox3.api.users import UsersAC
 from netbox3.api.virtualization import VirtualizationAC
 from netbox3.api.wireless import WirelessAC
 from netbox3.branch.nb_branch import NbBranch
-from netbox3.types_ import ODLStr, ODDAny, DAny
+from netbox3.types_ import ODLStr, ODDAny, DAny, OLInt
 
 
 class NbApi:
@@ -39,6 +44,9 @@ class NbApi:
     Only ``NbApi.ipam.ip_addresses.get()`` is described in this documentation.
     Other models are implemented in a similar manner.
     Exact parameters you can find in `Schema`_.
+
+    The connection pool and the worker threads are shared by all connectors.
+    NbApi can be used as a context manager to release them on exit.
     """
 
     def __init__(
@@ -50,16 +58,30 @@ class NbApi:
         verify: bool = True,
         limit: int = 1000,
         url_length: int = 2047,
+        batch_size: int = 100,
         # Multithreading
         threads: int = 1,
         interval: float = 0.0,
+        preflight: bool = True,
+        rate_limit: float = 0.0,
+        burst: int = 1,
+        max_in_flight: int = 0,
         # Errors processing
         timeout: int = 60,
         max_retries: int = 0,
         sleep: int = 10,
+        max_sleep: int = 60,
+        retry_statuses: OLInt = None,
+        deadline: int = 0,
         strict: bool = False,
+        # Response cache
+        http_cache: bool = False,
+        http_cache_ttl: int = 0,
+        http_cache_size: int = 100_000_000,
+        http_cache_dir: str = "",
         # Settings
         extended_get: bool = False,
+        id_cache_ttl: int = 0,
         default_get: ODDAny = None,
         loners: ODLStr = None,
         **kwargs,
@@ -87,13 +109,34 @@ class NbApi:
             if the URL length exceeds maximum length due to a long list of
             GET parameters. Default is `2047`.
 
+        :param int batch_size: Split the bulk create/update/delete to multiple requests
+            if the count of objects exceeds this value. Default is `100`.
+
         :param int threads: Threads count. <=1 is loop mode, >=2 is threading mode.
             Default id `1`.
 
         :param float interval: Wait this time between the threading requests (seconds).
+            Paces the start of the threads, the first `threads` requests of each threaded
+            query, the next requests are sent as the threads become free.
             Default is `0`. Useful to optimize session spikes and achieve
             script stability in Docker with limited resources.
 
+        :param bool preflight: Threading mode pagination.
+            `True` - Request the count of objects (brief=1&limit=1) before requesting the pages,
+            `False` - Request the first page, get the count of objects from it and
+            request only the remaining pages in parallel. Saves one request per query.
+            Default is `True`.
+
+        :param float rate_limit: Maximum count of requests per second to the Netbox,
+            shared by all threads and connectors. Default is `0` no limit.
+
+        :param int burst: Count of requests that can be sent at once above the `rate_limit`.
+            Default is `1`.
+
+        :param int max_in_flight: Maximum count of requests being processed by the Netbox
+            at the same time, shared by all threads and connectors. Default is `0` no limit.
+            Protects the Netbox workers from overload when many threads are used.
+
         :param int timeout: Session timeout (seconds). Default is `60`.
 
         :param int max_retries: Retries the request multiple times if the Netbox API
@@ -102,16 +145,48 @@ class NbApi:
             not stable.
 
         :param int sleep: Interval (seconds) before the next retry after
-            session timeout reached. Default is `10`.
+            session timeout reached or retryable status code received. The interval grows
+            exponentially with random jitter on each next retry. Default is `10`.
+
+        :param int max_sleep: Maximum interval (seconds) between retries. Default is `60`.
+
+        :param list retry_statuses: Status codes of the Netbox response that need to retry,
+            the `Retry-After` header of 429 and 503 is honoured.
+            Default is `[429, 502, 503, 504]`.
+
+        :param int deadline: Overall time limit (seconds) of the request with all retries.
+            Default is `0` no limit.
 
         :param bool strict: When querying objects by tag, if there are no tags present,
             the Netbox API response returns a status_code=400. True - ConnectionError is
             raised when status_code=400. False - a warning message is logged and an
             empty list is returned with status_code=200. Default is `False`.
 
+        :param bool http_cache: Cache the GET responses in the connector layer.
+            `True` - Fresh cached responses are returned without request, stale responses
+            are revalidated by the Netbox using ETag/Last-Modified headers,
+            `False` - Do not cache. Default is `False`. Useful for the reference models
+            that rarely change, such as dcim/device-types/ or extras/content-types/.
+
+        :param int http_cache_ttl: Time (seconds) during which the cached response is
+            returned without revalidation. Default is `0` always revalidate.
+
+        :param int http_cache_size: Maximum total size (bytes) of the cached responses
+            in memory and on disk, the least recently used responses are evicted.
+            Default is `100_000_000` (100MB).
+
+        :param str http_cache_dir: Path to the directory to store the cached responses
+            on disk (JSON files separated by the token hash), to be reused by the next runs.
+            The directory must be writable only by the user, the files are trusted
+            as the Netbox responses. Default is `""` memory only.
+
         :param bool extended_get: True - Extend filtering parameters in GET request,
             ``{parameter}`` can be used instead of ``{parameter}_id``. Default is `True`.
 
+        :param int id_cache_ttl: Time (seconds) during which the ids resolved by
+            the extended filtering parameters are reused by the next requests.
+            Default is `0` do not cache.
+
         :param dict default_get: Set default filtering parameters, to be used in each
             GET request.
 
@@ -138,17 +213,48 @@ class NbApi:
             "verify": verify,
             "limit": limit,
             "url_length": url_length,
+            "batch_size": batch_size,
             "threads": threads,
             "interval": interval,
+            "preflight": preflight,
+            "rate_limit": rate_limit,
+            "burst": burst,
+            "max_in_flight": max_in_flight,
             "timeout": timeout,
             "max_retries": max_retries,
             "sleep": sleep,
+            "max_sleep": max_sleep,
+            "retry_statuses": retry_statuses,
+            "deadline": deadline,
             "strict": strict,
+            "http_cache": http_cache,
+            "http_cache_ttl": http_cache_ttl,
+            "http_cache_size": http_cache_size,
+            "http_cache_dir": http_cache_dir,
             "extended_get": extended_get,
+            "id_cache_ttl": id_cache_ttl,
             "default_get": default_get,
             "loners": loners,
             **kwargs,
         }
+        # connection pool and worker pool shared by all connectors
+        self._session = kwargs.get("session") or init_session(threads)
+        self._executor = kwargs.get("executor") or init_executor(threads)
+        self._pacer = kwargs.get("pacer") or init_pacer(interval)
+        self._limiter = kwargs.get("limiter") or init_limiter(**kwargs)
+        self._response_cache = kwargs.get("response_cache")
+        if self._response_cache is None:
+            self._response_cache = init_response_cache(**kwargs)
+        kwargs["session"] = self._session
+        kwargs["executor"] = self._executor
+        kwargs["pacer"] = self._pacer
+        kwargs["limiter"] = self._limiter
+        kwargs["response_cache"] = self._response_cache
+        self._id_cache = kwargs.get("id_cache")
+        if self._id_cache is None:
+            self._id_cache = IdCache(ttl=id_cache_ttl)
+        kwargs["id_cache"] = self._id_cache
+
         # application connectors
         self.circuits = CircuitsAC(**kwargs)
         self.core = CoreAC(**kwargs)
@@ -167,6 +273,14 @@ class NbApi:
         name = self.__class__.__name__
         return f"<{name}: {self.host}>"
 
+    def __enter__(self) -> NbApi:
+        """Enter the runtime context."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Exit the runtime context, release the worker and connection pools."""
+        self.close()
+
     @property
     def host(self) -> str:
         """Netbox host name."""
@@ -177,6 +291,26 @@ class NbApi:
         """Netbox base URL."""
         return self.circuits.circuit_terminations.url_base
 
+    def clear_id_cache(self, path: str = "") -> None:
+        """Clear the ids resolved by the extended filtering parameters.
+
+        :param path: app/model path of the objects, for example "dcim/sites/".
+            Default is `""` clear all ids.
+
+        :return: None. Update self object.
+        """
+        self._id_cache.invalidate(path)
+
+    def close(self) -> None:
+        """Release resources shared by all connectors (and the copies of NbForager).
+
+        Wait for the worker threads to finish and close the HTTP connections.
+
+        :return: None.
+        """
+        self._executor.shutdown(wait=True)
+        self._session.close()
+
     def version(self) -> str:
         """Get Netbox version.
 
@@ -1,38 +1,67 @@
-"""NbCache, Read/write objects from/to the cache pickle file."""
+"""NbCache, Read/write objects from/to the cache file."""
 
 from __future__ import annotations
 
+import bz2
+import gzip
 import logging
+import lzma
 import os
-import pickle
 import re
+import time
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from typing import Tuple
+from typing import BinaryIO, Iterator, Optional, Tuple
 
+from netbox3 import helpers as h
+from netbox3.cache_backend import FORMAT, CacheBackend, MmapBackend, init_backend, iterate_models
 from netbox3.nb_tree import ONbTree, NbTree
-from netbox3.types_ import DAny, ODAny
+from netbox3.types_ import DAny, DInt, DiDAny, LDAny, ODAny, OSeqStr, SStr, TInt
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+COMPRESSIONS = ["gzip", "bz2", "lzma"]
 
 
 class NbCache:
-    """NbCache, Read/write objects from/to the cache pickle file."""
+    """NbCache, Read/write objects from/to the cache file.
+
+    The cache file is a manifest with the status data (including write_time and
+    Netbox version) and counts of the cached objects. Objects of each model are
+    stored in a separate shard file in the {cache}.d directory, so the models
+    can be loaded independently. The format of the files depends on the suffix:
+    *.pickle - pickle stream, *.jsonl - JSON lines (orjson if installed).
+    """
 
     def __init__(
         self,
         tree: ONbTree = None,
         status: ODAny = None,
         cache: str = "",
+        compression: str = "",
+        compresslevel: int = 0,
         **kwargs,
     ):
         """Init NbCache.
 
         :param tree: NbTree object to be cached.
         :param status: Netbox status data with metadata.
-        :param cache: Path to the pickle file.
+        :param cache: Path to the cache file, *.pickle, *.jsonl or *.mmap.
+        :param compression: Compression of the written files: "gzip", "bz2", "lzma".
+            Default is `""` no compression. Compressed files are detected on read.
+        :param compresslevel: Compression level, lower is faster, higher is smaller.
+            gzip/bz2 1..9, lzma 0..9. Default is `0` default level of the compression.
         """
         _ = kwargs  # noqa
         self.tree: NbTree = tree or NbTree()
         self.status: DAny = dict(status or {})
         self.cache = str(cache)
+        self.backend: CacheBackend = init_backend(self.cache)
+        self.compression: str = _init_compression(compression, self.backend)
+        self.compresslevel: int = int(compresslevel)
 
     def __repr__(self) -> str:
         """__repr__."""
@@ -42,36 +71,66 @@ class NbCache:
     # =========================== method =============================
 
     def is_cache(self) -> bool:
-        """Check if a pickle file is present on disk.
+        """Check if the cache file is present on disk.
 
-        :return: True if the pickle file is present, False otherwise.
+        :return: True if the cache file is present, False otherwise.
         """
         path = Path(self.cache)
         return path.is_file()
 
-    def read_cache(self) -> Tuple[NbTree, DAny]:
-        """Read cached data from a pickle file.
+    def read_cache(self, models: OSeqStr = None) -> Tuple[NbTree, DAny]:
+        """Read cached data from the cache file.
+
+        The cached objects are set to NbTree without pydantic validation.
+
+        :param models: Names of the models to load, "app.model", "app/model/" or "app".
+            Other models are loaded lazily on the first access to NbTree.{app}.{model}.
+            The lazy model raises an error on load if its shard file has been replaced
+            by the next write, so the lazy models are consistent with the manifest.
+            Default is `None` load all models.
 
         :return: NbTree object and status data.
         """
         if not self.cache:
-            raise ValueError("Path to the pickle file is not specified.")
-        cached = self._read_cache()
-        tree_d = cached.get("tree") or {}
-        tree = NbTree(**tree_d)
-        status = dict(cached.get("status") or {})
+            raise ValueError("Path to the cache file is not specified.")
+        start = time.monotonic()
+        with self._lock(exclusive=False):
+            manifest = self._read_cache()
+            size = _file_size(self.cache)
+            status = dict(manifest.get("status") or {})
+            tree = NbTree()
 
-        msg = f"Cache loaded from path={self.cache}."
+            if "tree" in manifest:  # legacy single file
+                for app, models_d in dict(manifest["tree"]).items():
+                    for model, data in models_d.items():
+                        if app_o := _get_app(tree, app, model):
+                            setattr(app_o, model, data)
+            else:
+                names = init_models(models)
+                for name in dict(manifest.get("models") or {}):
+                    app, model = name.split(".")
+                    if not (app_o := _get_app(tree, app, model)):
+                        continue
+                    tree.set_loaded(name)
+                    path = str(self._shard_path(app, model))
+                    if names is None or name in names or app in names:
+                        setattr(app_o, model, load_shard(path=path, backend=self.backend))
+                        size += _file_size(path)
+                    else:
+                        app_o.set_lazy(model, ShardLoader(path=path, backend=self.backend))
+
+        seconds = time.monotonic() - start
+        msg = f"Cache loaded from path={self.cache} {models=}, {_throughput(size, seconds)}."
         logging.debug(msg)
         return tree, status
 
     def write_cache(self) -> None:
-        """Write cache to a pickle file.
+        """Write cache to the cache file.
 
-        :return: None. Update a pickle file.
+        :return: None. Update the cache file.
         """
         if not self.cache:
-            raise ValueError("Path to the pickle file is not specified.")
+            raise ValueError("Path to the cache file is not specified.")
         try:
             self._create_dir()
             self._create_file()
@@ -101,41 +160,291 @@ class NbCache:
             root.mkdir(parents=True, exist_ok=True)
 
     def _create_file(self) -> None:
-        """Create pickl file for cache with write permissions 666.
+        """Create the shard files and the manifest file with write permissions 666.
+
+        Concurrent writers are serialized by the exclusive lock of the {cache}.lock file.
+        Each file is written to a temporary file, flushed to disk and renamed, so the
+        readers never see partially written files, and the processes that have mapped
+        the previous files to memory are not affected. The manifest is written last,
+        the shards of the models that are no longer cached are removed.
 
-        :return: None. Update pickle file.
+        :return: None. Update the cache files.
         """
         os.umask(0)
-        descriptor = os.open(
-            path=self.cache,
-            flags=(os.O_WRONLY | os.O_CREAT | os.O_TRUNC),
-            mode=0o666,
-        )
-        with open(descriptor, "wb") as fh:
-            data = {
-                "tree": self.tree.model_dump(),
-                "status": self.status,
-            }
-            pickle.dump(data, fh)
-
-    def _read_cache(self) -> dict:
-        """Read cached data from a pickle file.
-
-        :return: The dictionary data from a pickle file.
+        start = time.monotonic()
+        size = 0
+        with self._lock(exclusive=True):
+            counts: DInt = {}
+            for app, model, data in iterate_models(self.tree):
+                path = self._shard_path(app, model)
+                path.parent.mkdir(mode=0o777, parents=True, exist_ok=True)
+                record = {"app": app, "model": model, "data": data}
+                size += self._write_records(str(path), records=[record])
+                counts[f"{app}.{model}"] = len(data)
+
+            manifest = {"format": FORMAT, "status": self.status, "models": counts}
+            size += self._write_records(self.cache, records=[manifest])
+            self._remove_shards(keep=set(counts))
+            _fsync_dir(str(Path(self.cache).parent))
+            _fsync_dir(f"{self.cache}.d")
+
+        seconds = time.monotonic() - start
+        msg = f"Cache written {sum(counts.values())} objects, {_throughput(size, seconds)}."
+        logging.debug(msg)
+
+    def _read_cache(self) -> DAny:
+        """Read the manifest from the cache file.
+
+        :return: The manifest data, or the full data of the legacy cache file.
         """
         path = Path(self.cache)
         try:
-            with path.open(mode="rb") as fh:
-                data: DAny = dict(pickle.load(fh))
-                return data
+            with path.open(mode="rb") as raw:
+                with _decompressor(raw) as fh:
+                    return dict(next(self.backend.load(fh), {}))
         except FileNotFoundError as ex:
             if hasattr(ex, "args") and isinstance(ex.args, tuple):
                 msgs = [s for s in ex.args if isinstance(s, str)]
                 for attr in ["filename", "filename2"]:
                     if hasattr(ex, attr) and getattr(ex, attr):
                         msgs.append(f"{ex.filename}")
-                msg = "To create *.pickle file need to execute netbox3 without --cache parameter."
+                msg = "To create the cache file need to execute netbox3 without --cache parameter."
                 msgs.append(msg)
                 msg = ". ".join(msgs)
                 raise FileNotFoundError(msg) from ex
             raise FileNotFoundError(*ex.args) from ex
+
+    @contextmanager
+    def _lock(self, exclusive: bool) -> Iterator[None]:
+        """Advisory lock of the {cache}.lock file, POSIX only.
+
+        :param exclusive: True - writer lock, False - reader lock, skipped if
+            the lock file is absent.
+        """
+        path = f"{self.cache}.lock"
+        if fcntl is None or not (exclusive or os.path.isfile(path)):
+            yield
+            return
+        flags = os.O_RDWR | os.O_CREAT if exclusive else os.O_RDONLY
+        descriptor = os.open(path, flags, 0o666)
+        try:
+            fcntl.flock(descriptor, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+        finally:
+            fcntl.flock(descriptor, fcntl.LOCK_UN)
+            os.close(descriptor)
+
+    def _remove_shards(self, keep: SStr) -> None:
+        """Remove the shard files of the models that are not in the manifest.
+
+        :param keep: Names of the cached models "app.model".
+
+        :return: None. Remove files.
+        """
+        root = Path(f"{self.cache}.d")
+        suffix = self.backend.suffix
+        for path in root.glob(f"*{suffix}"):
+            if path.name[:-len(suffix)] not in keep:
+                path.unlink()
+
+    def _shard_path(self, app: str, model: str) -> Path:
+        """Path to the shard file of the model."""
+        return Path(f"{self.cache}.d", f"{app}.{model}{self.backend.suffix}")
+
+    def _write_records(self, path: str, records: LDAny) -> int:
+        """Write records to the temporary file, fsync and replace the file by rename.
+
+        :param path: Path to the file.
+        :param records: Records to write.
+
+        :return: Size of the written file.
+        """
+        temp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with _open_write(temp) as raw:
+                with _compressor(raw, self.compression, self.compresslevel) as fh:
+                    self.backend.dump(fh, records)
+                raw.flush()
+                os.fsync(raw.fileno())
+            size = _file_size(temp)
+            os.replace(temp, path)
+        finally:
+            if os.path.isfile(temp):
+                os.remove(temp)
+        return size
+
+
+class ShardLoader:
+    """Loader of the lazy model from the shard file.
+
+    The shard file is not kept open, the loader keeps the identity of the file
+    (device, inode, size, modification time) taken on init, while the reader lock
+    of the cache is held. The writer replaces the shards by rename, so the file
+    opened on load is checked against this identity, the objects of the next write
+    are never mixed with the manifest of the read.
+    """
+
+    def __init__(self, path: str, backend: CacheBackend, snapshot: Optional[TInt] = None):
+        """Init ShardLoader.
+
+        :param path: Path to the shard file.
+        :param backend: Cache backend of the file format.
+        :param snapshot: Identity of the shard file. Default is `None` the current file.
+        """
+        self.path = path
+        self.backend = backend
+        self.snapshot: TInt = tuple(snapshot or _file_id(os.stat(path)))
+
+    def __repr__(self) -> str:
+        """__repr__."""
+        name = self.__class__.__name__
+        return f"<{name}: {self.path}>"
+
+    def __call__(self) -> DiDAny:
+        """Load objects of the model from the shard file of the read snapshot.
+
+        :return: Objects of the model.
+
+        :raise FileNotFoundError: If the shard file has been removed by the next write.
+        :raise ValueError: If the shard file has been replaced by the next write.
+        """
+        try:
+            raw = Path(self.path).open(mode="rb")
+        except FileNotFoundError as ex:
+            msg = f"{self!r} removed by the next cache write, read_cache() again."
+            raise FileNotFoundError(msg) from ex
+        with raw:
+            if _file_id(os.fstat(raw.fileno())) != self.snapshot:
+                raise ValueError(f"{self!r} replaced by the next cache write, read_cache() again.")
+            return _load_data(raw, self.backend)
+
+    def __reduce__(self):
+        """Pickle the path and the identity of the shard file of the read."""
+        return ShardLoader, (self.path, self.backend, self.snapshot)
+
+
+# ============================= helpers ==========================
+
+
+def init_models(models: OSeqStr) -> Optional[SStr]:
+    """Init names of the models to load.
+
+    :param models: Names of the models "app.model", "app/model/" or "app".
+
+    :return: Names "app.model" or "app", None if all models need to be loaded.
+
+    :example:
+        init_models(["ipam/ip-addresses/", "dcim"]) -> {"ipam.ip_addresses", "dcim"}
+    """
+    if models is None:
+        return None
+    if isinstance(models, str):
+        models = [models]
+    names: SStr = set()
+    for name in models:
+        if name.strip("/").find("/") >= 0:
+            name = ".".join(h.path_to_attrs(name))
+        names.add(name)
+    return names
+
+
+def load_shard(path: str, backend: CacheBackend) -> DiDAny:
+    """Load objects of the model from the shard file.
+
+    :param path: Path to the shard file.
+    :param backend: Cache backend of the file format.
+
+    :return: Objects of the model.
+    """
+    with Path(path).open(mode="rb") as raw:
+        return _load_data(raw, backend)
+
+
+def _compressor(raw: BinaryIO, compression: str, compresslevel: int):
+    """Wrap the file opened for writing by the compressor."""
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=compresslevel or 6, mtime=0)
+    if compression == "bz2":
+        return bz2.BZ2File(raw, mode="wb", compresslevel=compresslevel or 9)
+    if compression == "lzma":
+        return lzma.LZMAFile(raw, mode="wb", preset=compresslevel or None)
+    return nullcontext(raw)
+
+
+def _decompressor(raw: BinaryIO):
+    """Wrap the file opened for reading by the decompressor, detected by magic number."""
+    magic = raw.read(6)
+    raw.seek(0)
+    if magic.startswith(b"\x1f\x8b"):
+        return gzip.GzipFile(fileobj=raw, mode="rb")
+    if magic.startswith(b"BZh"):
+        return bz2.BZ2File(raw, mode="rb")
+    if magic.startswith(b"\xfd7zXZ\x00"):
+        return lzma.LZMAFile(raw, mode="rb")
+    return nullcontext(raw)
+
+
+def _file_size(path: str) -> int:
+    """Size of the file, 0 if absent."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _fsync_dir(path: str) -> None:
+    """Flush the directory entries (renamed files) to disk, POSIX only."""
+    if not hasattr(os, "O_DIRECTORY") or not os.path.isdir(path):
+        return
+    descriptor = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def _file_id(stat: os.stat_result) -> TInt:
+    """Identity of the file, changed when the file is replaced."""
+    return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def _get_app(tree: NbTree, app: str, model: str):
+    """Get the app object of the tree if the model is present, None otherwise."""
+    if app not in tree.apps():
+        return None
+    app_o = getattr(tree, app)
+    if model not in app_o.models():
+        return None
+    return app_o
+
+
+def _load_data(raw: BinaryIO, backend: CacheBackend) -> DiDAny:
+    """Load objects of the model from the shard file opened for reading."""
+    with _decompressor(raw) as fh:
+        record = dict(next(backend.load(fh), {}))
+    data: DiDAny = record.get("data") or {}
+    return data
+
+
+def _open_write(path: str) -> BinaryIO:
+    """Open the file for writing with permissions 666."""
+    descriptor = os.open(path=path, flags=(os.O_WRONLY | os.O_CREAT | os.O_TRUNC), mode=0o666)
+    return open(descriptor, "wb")
+
+
+def _init_compression(compression: str, backend: CacheBackend) -> str:
+    """Init compression of the written files."""
+    compression = str(compression or "").lower()
+    if not compression:
+        return ""
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Invalid {compression=}, expected {COMPRESSIONS}.")
+    if isinstance(backend, MmapBackend):
+        raise ValueError(f"{compression=} is not supported by {backend}.")
+    return compression
+
+
+def _throughput(size: int, seconds: float) -> str:
+    """Message with the size and throughput."""
+    rate = size / 1e6 / seconds if seconds else 0.0
+    return f"{size=} bytes in {seconds:.3f}s, {rate:.1f}MB/s"
@@ -6,13 +6,14 @@ from __future__ import annotations
 
 import copy
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 from vhelpers import vstr
 
+from netbox3 import helpers as h
 from netbox3 import nb_tree
-from netbox3.branch.nb_value import NbValue
+from netbox3.branch.nb_branch import NbBranch
 from netbox3.foragers.circuits import CircuitsAF
 from netbox3.foragers.core import CoreAF
 from netbox3.foragers.dcim import DcimAF
@@ -25,9 +26,13 @@ from netbox3.foragers.virtualization import VirtualizationAF
 from netbox3.foragers.wireless import WirelessAF
 from netbox3.messages import Messages
 from netbox3.nb_api import NbApi
+from netbox3.cache_backend import BACKENDS
 from netbox3.nb_cache import NbCache
 from netbox3.nb_tree import NbTree
-from netbox3.types_ import LStr, DAny, DiDAny, ODLStr, ODDAny
+from netbox3.types_ import LStr, DAny, DiDAny, ODLStr, ODDAny, OLInt, DT2Str, OSeqStr, SStr
+
+# safety overlap of sync(), for the clock skew and the changes committed with delay
+SYNC_OVERLAP = timedelta(minutes=1)
 
 
 class NbForager:
@@ -47,26 +52,54 @@ class NbForager:
         verify: bool = True,
         limit: int = 1000,
         url_length: int = 2047,
+        batch_size: int = 100,
         threads: int = 1,
         interval: float = 0.0,
+        preflight: bool = True,
+        rate_limit: float = 0.0,
+        burst: int = 1,
+        max_in_flight: int = 0,
         # Errors processing
         timeout: int = 60,
         max_retries: int = 0,
         sleep: int = 10,
+        max_sleep: int = 60,
+        retry_statuses: OLInt = None,
+        deadline: int = 0,
         strict: bool = False,
+        # Response cache
+        http_cache: bool = False,
+        http_cache_ttl: int = 0,
+        http_cache_size: int = 100_000_000,
+        http_cache_dir: str = "",
         # Settings
         extended_get: bool = False,
+        id_cache_ttl: int = 0,
         default_get: ODDAny = None,
         loners: ODLStr = None,
         cache: str = "",
+        compression: str = "",
+        compresslevel: int = 0,
         **kwargs,
     ):
         """Init NbForager.
 
-        :param cache: Path to cache. If the value ends with .pickle,
+        :param cache: Path to cache. If the value ends with .pickle, .jsonl or .mmap,
             it is the path to a file; otherwise, it is the path to a directory.
+            The format of the file depends on the suffix: .pickle - pickle stream,
+            .jsonl - JSON lines (orjson if installed), .mmap - read-only packed files
+            mapped to memory and shared between processes, NbForager.root.{app}.{model}
+            is a mapping view and the objects are decoded on access by id.
             The default value is NbCache.{hostname}.pickle.
 
+        :param compression: Compression of the cache files: "gzip", "bz2", "lzma".
+            gzip is the fastest, lzma makes the smallest files.
+            Default is `""` no compression. Not supported by .mmap.
+            Compressed files are detected on read.
+
+        :param compresslevel: Compression level, lower is faster, higher is smaller.
+            gzip/bz2 1..9, lzma 0..9. Default is `0` default level of the compression.
+
         NbApi parameters:
 
         :param str host: Netbox host name.
@@ -90,13 +123,34 @@ class NbForager:
             if the URL length exceeds maximum length due to a long list of
             GET parameters. Default is `2047`.
 
+        :param int batch_size: Split the bulk create/update/delete to multiple requests
+            if the count of objects exceeds this value. Default is `100`.
+
         :param int threads: Threads count. <=1 is loop mode, >=2 is threading mode.
             Default id `1`.
 
         :param float interval: Wait this time between the threading requests (seconds).
+            Paces the start of the threads, the first `threads` requests of each threaded
+            query, the next requests are sent as the threads become free.
             Default is `0`. Useful to optimize session spikes and achieve
             script stability in Docker with limited resources.
 
+        :param bool preflight: Threading mode pagination.
+            `True` - Request the count of objects (brief=1&limit=1) before requesting the pages,
+            `False` - Request the first page, get the count of objects from it and
+            request only the remaining pages in parallel. Saves one request per query.
+            Default is `True`.
+
+        :param float rate_limit: Maximum count of requests per second to the Netbox,
+            shared by all threads and connectors. Default is `0` no limit.
+
+        :param int burst: Count of requests that can be sent at once above the `rate_limit`.
+            Default is `1`.
+
+        :param int max_in_flight: Maximum count of requests being processed by the Netbox
+            at the same time, shared by all threads and connectors. Default is `0` no limit.
+            Protects the Netbox workers from overload when many threads are used.
+
         :param int timeout: Session timeout (seconds). Default is `60`.
 
         :param int max_retries: Retries the request multiple times if the Netbox API
@@ -105,16 +159,48 @@ class NbForager:
             not stable.
 
         :param int sleep: Interval (seconds) before the next retry after
-            session timeout reached. Default is `10`.
+            session timeout reached or retryable status code received. The interval grows
+            exponentially with random jitter on each next retry. Default is `10`.
+
+        :param int max_sleep: Maximum interval (seconds) between retries. Default is `60`.
+
+        :param list retry_statuses: Status codes of the Netbox response that need to retry,
+            the `Retry-After` header of 429 and 503 is honoured.
+            Default is `[429, 502, 503, 504]`.
+
+        :param int deadline: Overall time limit (seconds) of the request with all retries.
+            Default is `0` no limit.
 
         :param bool strict: When querying objects by tag, if there are no tags present,
             the Netbox API response returns a status_code=400. True - ConnectionError is
             raised when status_code=400. False - a warning message is logged and an
             empty list is returned with status_code=200. Default is `False`.
 
+        :param bool http_cache: Cache the GET responses in the connector layer.
+            `True` - Fresh cached responses are returned without request, stale responses
+            are revalidated by the Netbox using ETag/Last-Modified headers,
+            `False` - Do not cache. Default is `False`. Useful for the reference models
+            that rarely change, such as dcim/device-types/ or extras/content-types/.
+
+        :param int http_cache_ttl: Time (seconds) during which the cached response is
+            returned without revalidation. Default is `0` always revalidate.
+
+        :param int http_cache_size: Maximum total size (bytes) of the cached responses
+            in memory and on disk, the least recently used responses are evicted.
+            Default is `100_000_000` (100MB).
+
+        :param str http_cache_dir: Path to the directory to store the cached responses
+            on disk (JSON files separated by the token hash), to be reused by the next runs.
+            The directory must be writable only by the user, the files are trusted
+            as the Netbox responses. Default is `""` memory only.
+
         :param bool extended_get: True - Extend filtering parameters in GET request,
             ``{parameter}`` can be used instead of ``{parameter}_id``. Default is `True`.
 
+        :param int id_cache_ttl: Time (seconds) during which the ids resolved by
+            the extended filtering parameters are reused by the next requests.
+            Default is `0` do not cache.
+
         :param dict default_get: Set default filtering parameters, to be used in each
             GET request.
 
@@ -148,13 +234,26 @@ class NbForager:
             "verify": verify,
             "limit": limit,
             "url_length": url_length,
+            "batch_size": batch_size,
             "threads": threads,
             "interval": interval,
+            "preflight": preflight,
+            "rate_limit": rate_limit,
+            "burst": burst,
+            "max_in_flight": max_in_flight,
             "timeout": timeout,
             "max_retries": max_retries,
             "sleep": sleep,
+            "max_sleep": max_sleep,
+            "retry_statuses": retry_statuses,
+            "deadline": deadline,
             "strict": strict,
+            "http_cache": http_cache,
+            "http_cache_ttl": http_cache_ttl,
+            "http_cache_size": http_cache_size,
+            "http_cache_dir": http_cache_dir,
             "extended_get": extended_get,
+            "id_cache_ttl": id_cache_ttl,
             "default_get": default_get,
             "loners": loners,
             **kwargs,
@@ -166,6 +265,8 @@ class NbForager:
 
         self.api = NbApi(**kwargs)
         self.cache: str = make_cache_path(cache, **kwargs)
+        self.compression: str = str(compression)
+        self.compresslevel: int = int(compresslevel)
         self.msgs = Messages(name=self.api.host)
 
         # application foragers
@@ -187,13 +288,29 @@ class NbForager:
         name = self.__class__.__name__
         return f"<{name}: {params}>"
 
+    def __enter__(self) -> NbForager:
+        """Enter the runtime context."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Exit the runtime context, release the NbApi worker and connection pools."""
+        self.close()
+
     def __copy__(self) -> NbForager:
         """Copy NbForager.root and tree objects.
 
+        The copy shares the connection, worker pools and caches of NbApi.
+
         :return: Copy of NbForager object.
         """
         connector = self.api.circuits.circuits
         params_d = {s: getattr(connector, s) for s in getattr(connector, "_init_params")}
+        params_d["session"] = getattr(self.api, "_session")
+        params_d["executor"] = getattr(self.api, "_executor")
+        params_d["pacer"] = getattr(self.api, "_pacer")
+        params_d["limiter"] = getattr(self.api, "_limiter")
+        params_d["response_cache"] = getattr(self.api, "_response_cache")
+        params_d["id_cache"] = getattr(self.api, "_id_cache")
         nbf = NbForager(**params_d)
         nb_tree.insert_tree(src=self.root, dst=nbf.root)
         return nbf
@@ -216,11 +333,20 @@ class NbForager:
         :return: None. Update self object.
         """
         for app in self.root.apps():
+            getattr(self.root, app).clear_lazy()
             for model in getattr(self.root, app).models():
                 data: dict = getattr(getattr(self.root, app), model)
                 data.clear()
+        self.root.touch()
         self.tree = NbTree()
 
+    def close(self) -> None:
+        """Release the NbApi worker and connection pools.
+
+        :return: None.
+        """
+        self.api.close()
+
     def copy(self) -> NbForager:
         """Copy data in the NbForager.root and NbForager.tree.
 
@@ -264,7 +390,8 @@ class NbForager:
             inventory_items, module_bays, power_outlets, power_ports, rear_ports
             in dcim.devices;
             ipv4, aggregate, super_prefix, sub_prefixes, ip_addresses
-            in ipam.aggregate, ipam.prefixes, ipam.ip_addresses.
+            in ipam.aggregate, ipam.prefixes, ipam.ip_addresses,
+            IPv4 and IPv6 hierarchy is built within each VRF.
             False - Only join objects that are present in the API response.
 
         :return: NbTree object with the joined Netbox objects.
@@ -277,35 +404,91 @@ class NbForager:
         if extra:
             joiner = Joiner(tree=self.tree)
             joiner.join_dcim_devices()
-            joiner.join_ipam_ipv4()
+            joiner.join_ipam()
+            self.tree.touch()
         return self.tree
 
-    def read_cache(self) -> None:
+    def read_cache(self, models: OSeqStr = None) -> None:
         """Read cached data from a pickle file.
 
         Save data to the NbForager.root and NbForager.status.
 
+        :param models: Names of the models to load, "app.model", "app/model/" or "app",
+            for example ["ipam.prefixes", "dcim"]. Other models are loaded lazily
+            on the first access to NbForager.root.{app}.{model}.
+            Default is `None` load all models.
+
         :return: None. Update self object.
         """
         cache = NbCache(cache=self.cache)
-        tree, status = cache.read_cache()
+        tree, status = cache.read_cache(models=models)
         nb_tree.insert_tree(src=tree, dst=self.root)
+        meta: DAny = status.get("meta") or {}
+        self.root.set_loaded(*list(meta.get("models") or []))
         self.status = status
 
-    def write_cache(self) -> None:
-        """Write NbForager.root nad NbForager.status to a pickle file.
+    def sync(self) -> None:
+        """Synchronize NbForager.root with Netbox incrementally and rewrite the cache.
+
+        Read the cache if NbForager.root is empty. Request only the objects updated since
+        the cache was written (last_updated__gte), remove the objects deleted since that time
+        (extras/object-changes/) and write the cache. The models requested from Netbox or
+        read from the cache are synchronized, including the models without objects.
+        The time of the next sync is taken from the Netbox server (Date header),
+        the changes are requested with the safety overlap SYNC_OVERLAP.
+        NbForager.tree needs to be assembled again using the join_tree() method.
 
-        :return: None. Update a pickle file.
+        :return: None. Update self object and the cache file.
+
+        :raise ValueError: If the cache write time is absent in the NbForager.status.
         """
-        status: DAny = self.status.copy()
-        status["meta"] = {
-            "host": self.api.host,
-            "url": self.api.url,
-            "write_time": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-        }
+        if not self.root.count():
+            self.read_cache()
+        meta: DAny = self.status.get("meta") or {}
+        write_time = str(meta.get("write_time") or "")
+        if not write_time:
+            raise ValueError("write_time expected in NbForager.status, write_cache() first.")
+        since = (_parse_time(write_time) - SYNC_OVERLAP).isoformat()
+        sync_time = self._server_time()
+
+        # content type to app/model
+        models: DT2Str = {}
+        for name in self._loaded_models():
+            app, model = name.split(".")
+            models[h.content_type(app, model)] = (app, model)
+
+        # updated objects
+        count_updated = 0
+        for app, model in models.values():
+            connector = getattr(getattr(self.api, app), model)
+            data_d: DiDAny = getattr(getattr(self.root, app), model)
+            for data in connector.get(last_updated__gte=since):
+                data_d[int(data["id"])] = data
+                count_updated += 1
+
+        # deleted objects
+        count_deleted = 0
+        changes = self.api.extras.object_changes.get(action="delete", time_after=since)
+        for change in changes:
+            if app_model := models.get(str(change.get("changed_object_type") or "")):
+                app, model = app_model
+                data_d = getattr(getattr(self.root, app), model)
+                if data_d.pop(int(change.get("changed_object_id") or 0), None):
+                    count_deleted += 1
+
+        self.root.touch()
+        logging.debug(f"Synchronized {count_updated=} {count_deleted=} {since=}.")
+        self._write_cache(write_time=sync_time)
 
-        cache = NbCache(tree=self.root, status=status, cache=self.cache)
-        cache.write_cache()
+    def write_cache(self) -> None:
+        """Write NbForager.root and NbForager.status to the cache file.
+
+        The write time is the local UTC time, the next sync() requests the changes
+        since this time (with the safety overlap SYNC_OVERLAP).
+
+        :return: None. Update the cache file.
+        """
+        self._write_cache(write_time=datetime.now(timezone.utc))
 
     def version(self) -> str:
         """Get Netbox version from the NbForager.status.
@@ -319,14 +502,65 @@ class NbForager:
 
     # =========================== data methods ===========================
 
+    def _write_cache(self, write_time: datetime) -> None:
+        """Write NbForager.root and NbForager.status to the cache file.
+
+        :param write_time: Timezone-aware time of the data, the next sync() requests
+            the changes since this time.
+
+        :return: None. Update the cache file.
+        """
+        status: DAny = self.status.copy()
+        status["meta"] = {
+            "host": self.api.host,
+            "url": self.api.url,
+            "write_time": write_time.astimezone(timezone.utc).isoformat(timespec="seconds"),
+            "models": self._loaded_models(),
+        }
+        self.status = status
+
+        cache = NbCache(
+            tree=self.root,
+            status=status,
+            cache=self.cache,
+            compression=self.compression,
+            compresslevel=self.compresslevel,
+        )
+        cache.write_cache()
+
+    def _loaded_models(self) -> LStr:
+        """Names of the models requested from Netbox or read from the cache.
+
+        Lazy models are not loaded.
+
+        :return: Model names "app.model".
+        """
+        names: SStr = set(self.root.loaded_models())
+        for app in self.root.apps():
+            app_o = getattr(self.root, app)
+            lazy: LStr = app_o.lazy_models()
+            for model in app_o.models():
+                if model in lazy or getattr(app_o, model):
+                    names.add(f"{app}.{model}")
+        return sorted(names)
+
+    def _server_time(self) -> datetime:
+        """Get the current time of the Netbox server from the Date header.
+
+        :return: Timezone-aware UTC time, the local time if the Date header is unavailable.
+        """
+        time_ = self.api.status._server_time()  # pylint: disable=W0212
+        return time_ or datetime.now(timezone.utc)
+
     def _devices_primary_ip4(self) -> LStr:
         """Return the primary IPv4 addresses of Netbox devices with these settings.
 
         :return: primary_ip4 addresses of devices.
         """
+        primary_ip4 = NbBranch.compile("primary_ip4", "address").str
         ip4s: LStr = []
         for device in self.root.dcim.devices.values():  # pylint: disable=E1101
-            if ip4 := NbValue(device).primary_ip4():
+            if ip4 := primary_ip4(device):
                 ip4s.append(ip4)
         return ip4s
 
@@ -361,7 +595,7 @@ def make_cache_path(cache: str = "", **kwargs) -> str:
 
     :return: Path to cache pickle file.
     """
-    if cache.endswith(".pickle"):
+    if cache.endswith(tuple(BACKENDS)):
         return cache
     name = str(kwargs.get("name") or "")
     host = str(kwargs.get("host") or "")
@@ -372,3 +606,15 @@ def make_cache_path(cache: str = "", **kwargs) -> str:
     name = ".".join(file_items)
     path = Path(cache, name)
     return str(path)
+
+
+def _parse_time(value: str) -> datetime:
+    """Parse the cache write time, the time without timezone is UTC.
+
+    :example:
+        _parse_time("2000-12-31 23:59:59") -> datetime(2000, 12, 31, 23, 59, 59, tzinfo=utc)
+    """
+    time_ = datetime.fromisoformat(value)
+    if time_.tzinfo is None:
+        time_ = time_.replace(tzinfo=timezone.utc)
+    return time_
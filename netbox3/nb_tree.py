@@ -1,21 +1,96 @@
 """Tree of Netbox model objects."""
+from __future__ import annotations
+
 import logging
-from copy import deepcopy
-from typing import Optional
+import threading
+from copy import copy
+from typing import Any, Callable, Dict, Optional, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from netbox3 import helpers as h
-from netbox3.types_ import DiDAny, LStr, DAny
+from netbox3.types_ import DiDAny, LStr, DAny, SStr
+
+
+class LazyLoader:
+    """Loader of the lazy model data, the load of the model is guarded by the lock.
+
+    The copy of the loader shares the load function and has a new lock.
+    """
+
+    __slots__ = ("load", "lock")
+
+    def __init__(self, load: Callable[[], DiDAny]):
+        """Init LazyLoader.
+
+        :param load: Function without arguments that returns the model objects.
+        """
+        self.load = load.load if isinstance(load, LazyLoader) else load
+        self.lock = threading.Lock()
+
+    def __call__(self) -> DiDAny:
+        """Load the model objects."""
+        return self.load()
+
+    def __copy__(self) -> LazyLoader:
+        """Copy with a new lock."""
+        return LazyLoader(self.load)
+
+    def __deepcopy__(self, memo: dict) -> LazyLoader:
+        """Deepcopy with a new lock, the load function is shared."""
+        return LazyLoader(self.load)
+
+    def __reduce__(self):
+        """Pickle the load function without the lock."""
+        return LazyLoader, (self.load,)
 
 
 class BaseTree(BaseModel):
-    """Base for BbTree models."""
+    """Base for BbTree models.
+
+    Model data can be loaded lazily, the loader is called on the first access
+    of the model attribute, the loaded objects are added to the model dictionary.
+    Concurrent accesses wait for the single load of the model. The loader is removed
+    after the successful load, if the load raises an error, the next access loads again.
+    """
+
+    _lazy: Dict[str, LazyLoader] = PrivateAttr(default_factory=dict)
+
+    def __getattribute__(self, name: str) -> Any:
+        """Load the lazy model data on the first access."""
+        if name[0] != "_":
+            try:
+                lazy = object.__getattribute__(self, "__pydantic_private__")["_lazy"]
+            except (AttributeError, KeyError, TypeError):
+                lazy = None
+            if lazy and (loader := lazy.get(name)):
+                with loader.lock:
+                    if lazy.get(name) is loader:
+                        data: DiDAny = object.__getattribute__(self, name)
+                        loaded: DiDAny = loader.load()
+                        if data:
+                            for id_, nb_object in loaded.items():
+                                data.setdefault(id_, nb_object)
+                        else:
+                            setattr(self, name, loaded)
+                        del lazy[name]
+        return object.__getattribute__(self, name)
+
+    def clear_lazy(self) -> None:
+        """Remove loaders of the lazy models without loading."""
+        self._lazy.clear()
 
     def count(self) -> int:
         """Count the number of Netbox objects for all models."""
         return sum(len(getattr(self, s)) for s in self.models())
 
+    def lazy_models(self) -> LStr:
+        """Get names of the models that are not loaded yet.
+
+        :return: Model names.
+        """
+        return list(self._lazy)
+
     def models(self) -> LStr:
         """Get all application model names.
 
@@ -26,6 +101,18 @@ class BaseTree(BaseModel):
         """
         return list(self.__annotations__)
 
+    def set_lazy(self, model: str, load: Callable[[], DiDAny]) -> None:
+        """Set the loader of the model data, called on the first access of the model.
+
+        :param model: Model name.
+        :param load: Function without arguments that returns the model objects.
+
+        :return: None. Update self object.
+        """
+        if model not in self.models():
+            raise ValueError(f"Invalid {model=}.")
+        self._lazy[model] = LazyLoader(load)
+
 
 # noinspection DuplicatedCode
 class CircuitsM(BaseTree):
@@ -191,6 +278,14 @@ class NbTree(BaseModel):
     virtualization: VirtualizationM = Field(default=VirtualizationM())
     wireless: WirelessM = Field(default=WirelessM())
 
+    _generation: int = PrivateAttr(default=0)
+    _loaded: SStr = PrivateAttr(default_factory=set)
+
+    @property
+    def generation(self) -> int:
+        """Counter of the data changes, used to invalidate the indexes of the foragers."""
+        return self._generation
+
     def apps(self) -> LStr:
         """Get all application names.
 
@@ -199,54 +294,176 @@ class NbTree(BaseModel):
         :example:
             NbTree().apps() -> ["circuit_terminations", "circuit_types", ...]
         """
-        return list(self.__annotations__)
+        return list(self.model_fields)
 
     def count(self) -> int:
         """Count the number of Netbox objects for all models."""
         return sum(getattr(self, s).count() for s in self.apps())
 
+    def loaded_models(self) -> LStr:
+        """Get names of the models requested from Netbox or read from the cache.
+
+        The models without objects are included, to request the objects created later.
+
+        :return: Model names "app.model".
+        """
+        return sorted(self._loaded)
+
+    def set_loaded(self, *names: str) -> None:
+        """Mark the models as requested from Netbox or read from the cache.
+
+        :param names: Model names "app.model".
+
+        :return: None. Update self object.
+        """
+        self._loaded.update(names)
+
+    def touch(self) -> None:
+        """Mark the data as changed, the indexes of the foragers are rebuilt on the next use."""
+        self._generation += 1
+
 
 ONbTree = Optional[NbTree]
 
 
+class UrlIndex:
+    """Index of the Netbox objects in NbTree by URL.
+
+    Each URL string is parsed once, the model dictionary and the object ID are cached,
+    the next lookups of the same URL are hash lookups. Models are accessed on the first
+    use, so the lazy models are loaded only if they are referenced.
+    build() pre-indexes the URLs of the objects without parsing.
+    The index is valid while the model dictionaries of the tree are not replaced.
+    """
+
+    def __init__(self, tree: NbTree):
+        """Init UrlIndex.
+
+        :param tree: NbTree object, contains model data (Netbox objects).
+        """
+        self.tree = tree
+        self._urls: Dict[str, Tuple[DiDAny, int]] = {}
+        self._models: Dict[Tuple[str, str], DiDAny] = {}
+
+    def build(self) -> None:
+        """Index the URLs of all Netbox objects in the tree without parsing.
+
+        The URL prefix of the model is taken from the first object (parsed once).
+        The URL of the object is indexed if it is equal to the URL prefix and the object ID,
+        other URLs are parsed on lookup. Lazy models are loaded.
+
+        :return: None. Update self object.
+        """
+        for app in self.tree.apps():
+            for model in getattr(self.tree, app).models():
+                model_d: DiDAny = self.model(app, model)
+                prefix, end = "", ""  # "https://netbox/api/dcim/devices/", "/"
+                for id_, data in model_d.items():
+                    url = data.get("url")
+                    if not isinstance(url, str):
+                        continue
+                    if not prefix:
+                        prefix, end = _url_template(url, app, model, id_)
+                    if prefix and url == f"{prefix}{id_}{end}":
+                        self._urls[url] = model_d, id_
+
+    def get(self, url: str) -> DAny:
+        """Get Netbox object by URL.
+
+        :param url: URL of the Netbox object.
+
+        :return: Netbox object or an empty dictionary if the object is absent.
+
+        :raise AttributeError: If the application or model in the URL is invalid.
+        :raise ValueError: If the ID in the URL is not a digit.
+        """
+        try:
+            model_d, id_ = self._urls[url]
+        except KeyError:
+            app, model, digit = h.split_url(str(url).strip("/"))
+            model_d = self.model(app, h.model_to_attr(model))
+            id_ = int(digit) if model_d else 0
+            self._urls[url] = model_d, id_
+        return model_d.get(id_) or {}
+
+    def model(self, app: str, model: str) -> DiDAny:
+        """Get the model dictionary.
+
+        :param app: Application name.
+        :param model: Model attribute name.
+
+        :return: Netbox objects of the model.
+
+        :raise AttributeError: If the application or model is invalid.
+        """
+        key = (app, model)
+        model_d = self._models.get(key)
+        if model_d is None:
+            model_d = getattr(getattr(self.tree, app), model)
+            self._models[key] = model_d
+        return model_d
+
+
 def insert_tree(src: NbTree, dst: NbTree) -> None:
     """Insert the data from the source NbTree object into the destination NbTree object.
 
+    The loaders of the lazy models are copied without loading.
     :param src: The source tree from which data will be copied.
     :param dst: The destination tree where data will be inserted.
 
     :return: None. The data is updated in the destination tree.
     """
+    dst.touch()
+    dst.set_loaded(*src.loaded_models())
     for app in src.apps():
-        for model in getattr(src, app).models():
-            src_d: dict = getattr(getattr(src, app), model)
-            dst_d: dict = getattr(getattr(dst, app), model)
+        src_a: BaseTree = getattr(src, app)
+        dst_a: BaseTree = getattr(dst, app)
+        lazy = src_a._lazy  # pylint: disable=W0212
+        for model in src_a.models():
+            if load := lazy.get(model):
+                dst_a.set_lazy(model, load)
+            if model in lazy:
+                continue
+            src_d: dict = getattr(src_a, model)
+            dst_d: dict = getattr(dst_a, model)
+            if not dst_d and not isinstance(src_d, dict):
+                setattr(dst_a, model, copy(src_d))  # mapping view, copy without decoding
+                continue
             dst_d.update(src_d)
 
 
-def join_tree(tree: NbTree) -> NbTree:
+def join_tree(tree: NbTree, in_place: bool = False) -> NbTree:
     """Assemble Netbox objects in tree within itself.
 
     The Netbox objects are represented as a multidimensional dictionary.
     :param tree: NbTree object to join the data in.
+    :param in_place: True - Join the objects in the tree itself, the tree is changed.
+        False - Join the objects in the new tree, the source tree is not changed.
+        Only the objects and the nested dictionaries that are changed by the join
+        are copied, other data is shared with the source tree.
 
     :return: NbTree object with the joined data.
     """
-    tree = deepcopy(tree)
+    if in_place:
+        tree.touch()
+    else:
+        tree = _copy_tree(tree)
+    index = UrlIndex(tree)
+    index.build()
     for app in tree.apps():  # pylint: disable=R1702
         for model in getattr(tree, app).models():
             objects_d = getattr(getattr(tree, app), model)
             for _, parent in objects_d.items():
                 for key, child in parent.items():
                     if isinstance(child, dict):
-                        if child_full := _get_child(child=child, tree=tree):
+                        if child_full := _get_child(child=child, tree=tree, index=index):
                             parent[key].clear()
                             parent[key].update(child_full)
                     elif isinstance(child, list):
                         for child_ in child:
                             if not isinstance(child_, dict):
                                 continue
-                            if child_full := _get_child(child=child_, tree=tree):
+                            if child_full := _get_child(child=child_, tree=tree, index=index):
                                 child_.clear()
                                 child_.update(child_full)
     return tree
@@ -260,21 +477,25 @@ def missed_urls(urls: LStr, tree: NbTree) -> LStr:
 
     :return: A list of URLs that are missed in the tree.
     """
+    index = UrlIndex(tree)
+    missed: Dict[str, bool] = {}  # checked URLs, the same URLs are not parsed again
     urls_: LStr = []
     for url in urls:
         url = url.rstrip("/")
-        app, model, digit = url.split("/")[-3:]
-        model = h.model_to_attr(model)
-        id_ = int(digit)
-
-        try:
-            data = getattr(getattr(tree, app), model).get(id_)
-        except AttributeError as ex:
-            msg = f"{type(ex).__name__}: {ex}"
-            logging.error(msg)
-            continue
-
-        if not data:
+        if url not in missed:
+            app, model, digit = url.split("/")[-3:]
+            model = h.model_to_attr(model)
+            id_ = int(digit)
+
+            try:
+                model_d = index.model(app, model)
+            except AttributeError as ex:
+                msg = f"{type(ex).__name__}: {ex}"
+                logging.error(msg)
+                continue
+            missed[url] = not model_d.get(id_)
+
+        if missed[url]:
             urls_.append(url)
     return urls_
 
@@ -282,25 +503,84 @@ def missed_urls(urls: LStr, tree: NbTree) -> LStr:
 # ============================= helpers ==============================
 
 
-def _get_child(child: DAny, tree: NbTree) -> DAny:
+def _copy_child(child: DAny) -> DAny:
+    """Copy the nested dictionary that can be changed by join_tree().
+
+    The related object (generic relation) is copied too, other values are shared.
+    """
+    child_ = dict(child)
+    if isinstance(child_.get("object"), dict):
+        child_["object"] = _copy_child(child_["object"])
+    return child_
+
+
+def _copy_object(data: DAny) -> DAny:
+    """Copy the Netbox object for join_tree().
+
+    The object, its nested dictionaries and lists of dictionaries are copied,
+    deeper values are shared with the source object.
+    """
+    data_ = dict(data)
+    for key, value in data_.items():
+        if isinstance(value, dict):
+            data_[key] = _copy_child(value)
+        elif isinstance(value, list):
+            data_[key] = [_copy_child(d) if isinstance(d, dict) else d for d in value]
+    return data_
+
+
+def _copy_tree(tree: NbTree) -> NbTree:
+    """Copy NbTree for join_tree(), structural sharing instead of deepcopy.
+
+    Lazy models of the source tree are loaded.
+    """
+    tree_ = NbTree()
+    for app in tree.apps():
+        for model in getattr(tree, app).models():
+            objects_d: DiDAny = getattr(getattr(tree, app), model)
+            dst_d: DiDAny = getattr(getattr(tree_, app), model)
+            for id_, data in objects_d.items():
+                dst_d[id_] = _copy_object(data)
+    return tree_
+
+
+def _url_template(url: str, app: str, model: str, id_: int) -> Tuple[str, str]:
+    """Split the URL of the object to the URL prefix of the model and the URL end.
+
+    :example:
+        _url_template("https://netbox/api/dcim/devices/1/", "dcim", "devices", 1) ->
+            ("https://netbox/api/dcim/devices/", "/")
+
+    :return: URL prefix and URL end, empty strings if the URL does not match the object.
+    """
+    end = "/" if url.endswith("/") else ""
+    suffix = f"/{id_}{end}"
+    if not url.endswith(suffix):
+        return "", ""
+    app_, model_, digit = h.split_url(url.strip("/"))
+    if (app_, h.model_to_attr(model_), digit) != (app, model, str(id_)):
+        return "", ""
+    return url[:len(url) - len(suffix) + 1], end
+
+
+def _get_child(child: DAny, tree: NbTree, index: Optional[UrlIndex] = None) -> DAny:
     """Search child Netbox object in the model data to insert (replace) it in the parent.
 
     :param child: Netbox object that require dependency update.
     :param tree: NbTree object, contains model data (Netbox objects).
+    :param index: URL index of the tree, reused between the calls.
 
     :return: Child dictionary from the model that needs to be inserted into the parent dictionary.
     """
+    if index is None:
+        index = UrlIndex(tree)
     if child.get("url"):
-        url = str(child["url"]).strip("/")
-        app, model, digit = h.split_url(url)
-        model = h.model_to_attr(model)
-        if model_d := getattr(getattr(tree, app), model):
-            if child_full := model_d.get(int(digit)):
-                return child_full
+        if child_full := index.get(child["url"]):
+            return child_full
 
     if child.get("object_id") and child.get("object"):
         if isinstance(child["object"], dict):
-            child_full = _get_child(child["object"], tree)
+            child_full = _get_child(child["object"], tree, index)
             child["object"].clear()
             child["object"].update(child_full)
             return {}
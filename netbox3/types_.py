@@ -1,7 +1,7 @@
 """Typing."""
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple, Union, Sequence, TypeVar
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union, Sequence, TypeVar
 
 # 1 level
 DAny = Dict[str, Any]
@@ -10,12 +10,14 @@ DObj = Dict[str, object]
 DStr = Dict[str, str]
 Int = int
 LBool = List[bool]
+LCallable = List[Callable]
 LInt = List[int]
 LPath = List[Path]
 LStr = List[str]
 LTInt2 = List[Tuple[int, int]]
 ODatetime = Optional[datetime]
 ODict = Optional[dict]
+OLInt = Optional[LInt]
 Param = Tuple[str, Any]
 SInt = Set[int]
 SStr = Set[str]
@@ -26,6 +28,7 @@ T = TypeVar("T")
 T2Str = Tuple[str, str]
 T3Str = Tuple[str, str, str]
 TLists = (list, set, tuple)
+TInt = Tuple[int, ...]
 TStr = Tuple[str, ...]
 TValues = (str, int, float)
 Value = Union[str, int, float]
@@ -36,6 +39,7 @@ DDStr = Dict[str, DStr]
 DLInt = Dict[str, LInt]
 DLStr = Dict[str, LStr]
 DList = Dict[str, list]
+DLDAny = Dict[str, List[DAny]]
 DSStr = Dict[str, SStr]
 DiDAny = Dict[int, DAny]
 DiStr = Dict[int, str]
@@ -45,6 +49,7 @@ LParam = List[Param]
 LT = List[T]
 LT2StrDAny = List[Tuple[str, DAny]]
 LTup2 = List[T2Str]
+DT2Str = Dict[str, T2Str]
 LValue = List[Value]
 ODAny = Optional[DAny]
 OSeqStr = Optional[SeqStr]
@@ -56,6 +61,7 @@ TParam = Tuple[Param, ...]
 UStr = Union[str, SeqStr]
 
 # 3 level
+DDiDAny = Dict[str, Dict[str, DiDAny]]
 DDDLStr = Dict[str, Dict[str, DLStr]]
 DDLInt = Dict[str, DLInt]
 DiLDAny = Dict[int, LDAny]
@@ -63,6 +69,8 @@ LDList = List[DList]
 LLDAny = List[LDAny]
 LLParam = List[LParam]
 ODDAny = Optional[DDAny]
+OLDAny = Optional[LDAny]
+LODAny = List[ODAny]
 ODLStr = Optional[DLStr]
 OUStr = Optional[UStr]
 ULDAny = Union[LDAny, DAny]
@@ -1,17 +1,28 @@
 # pylint: disable=W0212,R0801,W0621
 
 """Unittests connector.py."""
+import asyncio
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import pytest
+import requests_mock
 from _pytest.monkeypatch import MonkeyPatch
 from requests import Response, Session
+from requests.exceptions import ConnectionError as RequestsConnectionError, ReadTimeout
+from requests_mock import Mocker
 
+from netbox3.api import base_c, connector
 from netbox3.nb_api import NbApi
 from netbox3.types_ import DAny
 from tests.api_.test__base_c import mock_session
 
+STATUS = "https://netbox/api/status/"
+DATE = {"Date": "Mon, 01 Jan 2001 00:00:00 GMT"}
+CREATED = "2001-01-01T00:00:00Z"  # after the first attempt
+EARLIER = "2000-01-01T00:00:00Z"  # before the first attempt
+
 
 @pytest.fixture
 def api():
@@ -91,3 +102,326 @@ def test__update_d(
         assert actual == data
     else:
         assert actual == {}
+
+
+@pytest.fixture
+def mock_requests_ip_addresses():
+    """Mock requests for ip-addresses counters and pages."""
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            "https://netbox/api/ipam/ip-addresses/?brief=1&limit=1",
+            json={"count": 3},
+        )
+        mock.get(
+            "https://netbox/api/ipam/ip-addresses/?limit=2&offset=0",
+            json={"count": 3, "results": [{"id": 2, "url": "/api/ipam/ip-addresses/2"},
+                              {"id": 1, "url": "/api/ipam/ip-addresses/1"}]},
+        )
+        mock.get(
+            "https://netbox/api/ipam/ip-addresses/?limit=2&offset=2",
+            json={"results": [{"id": 3, "url": "/api/ipam/ip-addresses/3"}]},
+        )
+        yield mock
+
+
+@pytest.mark.parametrize("threads", [1, 3])
+def test__aget(
+        mock_requests_ip_addresses: Mocker,  # pylint: disable=unused-argument
+        threads: int,
+):
+    """Connector.aget()."""
+    api = NbApi(host="netbox", limit=2, threads=threads)
+    actual = asyncio.run(api.ipam.ip_addresses.aget())
+    assert [d["id"] for d in actual] == [1, 2, 3]
+
+
+@pytest.mark.parametrize("threads, preflight, expected", [
+    (3, True, 3),
+    (3, False, 2),
+])
+def test__get__preflight(
+        mock_requests_ip_addresses: Mocker,
+        threads: int,
+        preflight: bool,
+        expected: int,
+):
+    """Connector.get() preflight."""
+    api = NbApi(host="netbox", limit=2, threads=threads, preflight=preflight)
+    actual = api.ipam.ip_addresses.get()
+    assert [d["id"] for d in actual] == [1, 2, 3]
+    assert mock_requests_ip_addresses.call_count == expected
+
+    mock_requests_ip_addresses.reset_mock()
+    actual = asyncio.run(api.ipam.ip_addresses.aget())
+    assert [d["id"] for d in actual] == [1, 2, 3]
+    assert mock_requests_ip_addresses.call_count == expected
+
+
+def test__iter_pages(mock_requests_ip_addresses: Mocker):
+    """Connector.iter_pages()."""
+    api = NbApi(host="netbox", limit=2)
+    pages = api.ipam.ip_addresses.iter_pages()
+    assert mock_requests_ip_addresses.call_count == 0
+
+    actual = next(pages)
+    assert [d["id"] for d in actual] == [2, 1]
+    assert mock_requests_ip_addresses.call_count == 1
+
+    actual = next(pages)
+    assert [d["id"] for d in actual] == [3]
+    with pytest.raises(StopIteration):
+        next(pages)
+
+
+@pytest.mark.parametrize("sort, expected", [
+    (False, [2, 1, 3]),
+    (True, [1, 2, 3]),
+])
+def test__iter_objects(
+        mock_requests_ip_addresses: Mocker,  # pylint: disable=unused-argument
+        sort: bool,
+        expected: list,
+):
+    """Connector.iter_objects()."""
+    api = NbApi(host="netbox", limit=2)
+    actual = list(api.ipam.ip_addresses.iter_objects(sort=sort, or_q=["a", "b"]))
+    assert [d["id"] for d in actual] == expected
+
+
+def test__get__concurrent():
+    """Connector.get() concurrent calls on the same connector."""
+    api = NbApi(host="netbox", threads=2)
+    with requests_mock.Mocker() as mock:
+        for id_ in range(1, 21):
+            mock.get(
+                f"https://netbox/api/ipam/ip-addresses/?brief=1&limit=1&id={id_}",
+                json={"count": 1},
+                complete_qs=True,
+            )
+            mock.get(
+                f"https://netbox/api/ipam/ip-addresses/?id={id_}",
+                json={"results": [{"id": id_, "url": f"/api/ipam/ip-addresses/{id_}"}]},
+                complete_qs=True,
+            )
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            futures = {i: executor.submit(api.ipam.ip_addresses.get, id=i) for i in range(1, 21)}
+            actual = {i: [d["id"] for d in f.result()] for i, f in futures.items()}
+
+    assert actual == {i: [i] for i in range(1, 21)}
+
+
+@pytest.mark.parametrize("batch_size, threads, status_code, expected", [
+    (2, 1, 201, [(1, 201, ""), (2, 201, ""), (3, 201, "")]),
+    (2, 3, 201, [(1, 201, ""), (2, 201, ""), (3, 201, "")]),
+    (100, 1, 201, [(1, 201, ""), (2, 201, ""), (3, 201, "")]),
+    (2, 1, 400, [(0, 400, '{"address": ["error"]}'), (0, 400, '{"address": ["error"]}'),
+                 (0, 400, '{"address": ["error"]}')]),
+])
+def test__create_bulk(batch_size: int, threads: int, status_code: int, expected: list):
+    """Connector.create_bulk()."""
+    api = NbApi(host="netbox", batch_size=batch_size, threads=threads)
+    items = [{"address": f"10.0.0.{i}/24"} for i in range(1, 4)]
+
+    def callback(request, context):
+        context.status_code = status_code
+        if status_code == 201:
+            return [{"id": int(d["address"].split(".")[3][0]), **d} for d in request.json()]
+        return [{"address": ["error"]} for _ in request.json()]
+
+    with requests_mock.Mocker() as mock:
+        mock.post("https://netbox/api/ipam/ip-addresses/", json=callback)
+        outcomes = api.ipam.ip_addresses.create_bulk(items)
+        assert mock.call_count == -(-len(items) // batch_size)
+
+    actual = [(o.id, o.status_code, o.error) for o in outcomes]
+    assert actual == expected
+    assert [o.index for o in outcomes] == [0, 1, 2]
+    assert [o.ok for o in outcomes] == [status_code == 201] * 3
+
+
+def test__update_bulk():
+    """Connector.update_bulk()."""
+    api = NbApi(host="netbox", batch_size=2)
+    items = [{"id": i, "status": "active"} for i in range(1, 4)]
+    with requests_mock.Mocker() as mock:
+        mock.patch("https://netbox/api/ipam/ip-addresses/", [
+            {"status_code": 200, "json": items[:2]},
+            {"status_code": 400, "json": {"detail": "error"}},
+        ])
+        outcomes = api.ipam.ip_addresses.update_bulk(items)
+
+    actual = [(o.id, o.status_code, o.error) for o in outcomes]
+    assert actual == [(1, 200, ""), (2, 200, ""), (3, 400, '{"detail": "error"}')]
+
+    with pytest.raises(ValueError):
+        api.ipam.ip_addresses.update_bulk([{"status": "active"}])
+
+
+def test__delete_bulk():
+    """Connector.delete_bulk()."""
+    api = NbApi(host="netbox")
+    with requests_mock.Mocker() as mock:
+        mock.delete("https://netbox/api/ipam/ip-addresses/", status_code=204)
+        outcomes = api.ipam.ip_addresses.delete_bulk([1, 2])
+        assert mock.last_request.json() == [{"id": 1}, {"id": 2}]
+
+    actual = [(o.id, o.ok) for o in outcomes]
+    assert actual == [(1, True), (2, True)]
+
+
+def test__create_bulk__retry(monkeypatch: MonkeyPatch):
+    """Connector.create_bulk() timed out, retry only the objects that were not created."""
+    monkeypatch.setattr(base_c.time, "sleep", lambda _: None)
+    api = NbApi(host="netbox", max_retries=2)
+    items = [{"address": "10.0.0.1/24"}, {"address": "10.0.0.2/24", "vrf": 1}]
+    with requests_mock.Mocker() as mock:
+        mock.post("https://netbox/api/ipam/ip-addresses/", [
+            {"exc": ReadTimeout},
+            {"status_code": 201, "json": [{"id": 2, "address": "10.0.0.2/24", "vrf": {"id": 1}}]},
+        ])
+        mock.get("https://netbox/api/ipam/ip-addresses/", json={"results": [
+            {"id": 1, "address": "10.0.0.1/24", "vrf": None, "created": CREATED},
+            {"id": 3, "address": "10.0.0.2/24", "vrf": None, "created": CREATED},  # other vrf
+        ]})
+        mock.get(STATUS, headers=DATE)
+        outcomes = api.ipam.ip_addresses.create_bulk(items)
+        posted = [r.json() for r in mock.request_history if r.method == "POST"]
+
+    assert posted == [items, items[1:]]
+    actual = [(o.index, o.id, o.status_code, o.attempts, o.ok) for o in outcomes]
+    assert actual == [(0, 1, 200, 1, True), (1, 2, 201, 2, True)]
+
+
+@pytest.mark.parametrize("responses, expected", [
+    ([{"exc": ReadTimeout}, {"status_code": 201, "json": {"id": 2}}], (201, 2)),
+    ([{"status_code": 503}, {"status_code": 201, "json": {"id": 2}}], (201, 2)),
+    ([{"exc": ReadTimeout}] * 3, (504, 2)),
+])
+def test__create__retry(monkeypatch: MonkeyPatch, responses: list, expected: tuple):
+    """Connector.create() retry, the object created by the timed out request is not found."""
+    monkeypatch.setattr(base_c.time, "sleep", lambda _: None)
+    api = NbApi(host="netbox", max_retries=1)
+    with requests_mock.Mocker() as mock:
+        mock.post("https://netbox/api/ipam/ip-addresses/", responses)
+        mock.get("https://netbox/api/ipam/ip-addresses/", json={"results": []})
+        response = api.ipam.ip_addresses.create(address="10.0.0.1/24")
+        posts = len([r for r in mock.request_history if r.method == "POST"])
+    assert (response.status_code, posts) == expected
+
+
+def test__create__idempotent(monkeypatch: MonkeyPatch):
+    """Connector.create() timed out, the object created by the previous attempt is found."""
+    monkeypatch.setattr(base_c.time, "sleep", lambda _: None)
+    api = NbApi(host="netbox", max_retries=1)
+    data = {"id": 1, "address": "10.0.0.1/24", "vrf": None, "created": CREATED}
+    with requests_mock.Mocker() as mock:
+        mock.post("https://netbox/api/ipam/ip-addresses/", exc=ReadTimeout)
+        mock.get("https://netbox/api/ipam/ip-addresses/?address=10.0.0.1/24",
+                 json={"results": [data]})
+        mock.get(STATUS, headers=DATE)
+        actual = api.ipam.ip_addresses.create_d(address="10.0.0.1/24")
+        posts = len([r for r in mock.request_history if r.method == "POST"])
+    assert actual == data
+    assert posts == 1
+
+
+def test__create__unknown(monkeypatch: MonkeyPatch):
+    """Connector.create() timed out, the model without natural key is not retried."""
+    monkeypatch.setattr(base_c.time, "sleep", lambda _: None)
+    api = NbApi(host="netbox", max_retries=2)
+    with requests_mock.Mocker() as mock:
+        mock.post("https://netbox/api/ipam/vrfs/", exc=ReadTimeout)
+        response = api.ipam.vrfs.create(name="VRF1")
+        methods = [r.method for r in mock.request_history]
+    assert methods == ["POST"]
+    assert response.status_code == 504
+    assert "Result unknown" in response.text
+
+    with requests_mock.Mocker() as mock:
+        mock.post("https://netbox/api/ipam/vrfs/", exc=ReadTimeout)
+        outcomes = api.ipam.vrfs.create_bulk([{"name": "VRF1"}, {"name": "VRF2"}])
+        methods = [r.method for r in mock.request_history]
+    assert methods == ["POST"]
+    actual = [(o.index, o.status_code, o.ok) for o in outcomes]
+    assert actual == [(0, 504, False), (1, 504, False)]
+    assert all(o.error.startswith("Result unknown") for o in outcomes)
+
+
+def test__create_bulk__scope(monkeypatch: MonkeyPatch):
+    """Connector.create_bulk() timed out, the interface of other device is not created."""
+    monkeypatch.setattr(base_c.time, "sleep", lambda _: None)
+    api = NbApi(host="netbox", max_retries=1)
+    items = [{"name": "Gi0/1", "device": 1, "type": "1000base-t"}]
+    with requests_mock.Mocker() as mock:
+        mock.post("https://netbox/api/dcim/interfaces/", [
+            {"exc": ReadTimeout},
+            {"status_code": 201, "json": [{"id": 2, "name": "Gi0/1", "device": {"id": 1}}]},
+        ])
+        mock.get("https://netbox/api/dcim/interfaces/", json={"results": [
+            {"id": 1, "name": "Gi0/1", "device": {"id": 9}, "created": CREATED},  # other device
+        ]})
+        mock.get(STATUS, headers=DATE)
+        outcomes = api.dcim.interfaces.create_bulk(items)
+        posts = len([r for r in mock.request_history if r.method == "POST"])
+    assert posts == 2
+    assert [(o.id, o.status_code) for o in outcomes] == [(2, 201)]
+
+
+@pytest.mark.parametrize("found, headers, expected", [
+    ([], DATE, [(None, 201)]),
+    ([{"id": 1, "created": EARLIER}], DATE, [(None, 201)]),
+    ([{"id": 1, "created": EARLIER}, {"id": 3, "created": CREATED}], DATE, [(3, 200)]),
+    ([{"id": 1, "created": CREATED}, {"id": 3, "created": CREATED}], DATE, [(0, 504)]),
+    ([{"id": 1, "created": "2001-01-01"}], DATE, [(0, 504)]),
+    ([{"id": 1, "created": CREATED}], {}, [(0, 504)]),
+])
+def test__create_bulk__duplicates(monkeypatch: MonkeyPatch, found, headers, expected):
+    """Connector.create_bulk() timed out, the duplicate address created earlier is not ours."""
+    monkeypatch.setattr(base_c.time, "sleep", lambda _: None)
+    api = NbApi(host="netbox", max_retries=1)
+    items = [{"address": "10.0.0.1/24"}]
+    found = [{"address": "10.0.0.1/24", "vrf": None, **d} for d in found]
+    responses = []
+    for data in [[{"id": 2, "address": "10.0.0.1/24"}], {"id": 2, "address": "10.0.0.1/24"}]:
+        with requests_mock.Mocker() as mock:
+            mock.post("https://netbox/api/ipam/ip-addresses/", [
+                {"exc": ReadTimeout},
+                {"status_code": 201, "json": data},
+            ])
+            mock.get("https://netbox/api/ipam/ip-addresses/", json={"results": found})
+            mock.get(STATUS, headers=headers)
+            if isinstance(data, list):
+                outcomes = api.ipam.ip_addresses.create_bulk(items)
+            else:
+                responses.append(api.ipam.ip_addresses.create(**items[0]))
+
+    actual = [(o.id if o.status_code != 201 else None, o.status_code) for o in outcomes]
+    assert actual == expected
+    assert responses[0].status_code == expected[0][1]
+    if expected[0][1] == 504:
+        assert outcomes[0].error.startswith("Result unknown")
+        assert outcomes[0].data == items[0]
+
+
+def test__create_bulk__unreachable(monkeypatch: MonkeyPatch):
+    """Connector.create_bulk() timed out, Netbox is unreachable for the check, unknown."""
+    monkeypatch.setattr(base_c.time, "sleep", lambda _: None)
+    api = NbApi(host="netbox", max_retries=1)
+    with requests_mock.Mocker() as mock:
+        mock.post("https://netbox/api/ipam/ip-addresses/", exc=ReadTimeout)
+        mock.get("https://netbox/api/ipam/ip-addresses/", exc=RequestsConnectionError)
+        outcomes = api.ipam.ip_addresses.create_bulk([{"address": "10.0.0.1/24"}])
+        posts = len([r for r in mock.request_history if r.method == "POST"])
+    assert posts == 1
+    assert [(o.status_code, o.ok) for o in outcomes] == [(504, False)]
+    assert outcomes[0].error.startswith("Result unknown")
+
+
+def test__natural_keys():
+    """connector.NATURAL_KEYS, component names are scoped by the parent."""
+    for path, keys in connector.NATURAL_KEYS.items():
+        assert path.endswith("/") and keys, path
+        if path.split("/")[1].endswith("ports") or path == "dcim/interfaces/":
+            assert keys == ["name", "device"], path
+    for path in ["ipam/vrfs/", "dcim/cables/", "extras/journal-entries/"]:
+        assert path not in connector.NATURAL_KEYS
@@ -0,0 +1,235 @@
+# pylint: disable=W0212,R0801,W0621
+
+"""Unittests http_cache.py."""
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+import requests_mock
+from requests import Response
+from requests.exceptions import ReadTimeout
+
+from netbox3.api import base_c
+from netbox3.api.http_cache import ResponseCache, init_response_cache, normalize_url
+from netbox3.nb_api import NbApi
+from netbox3.types_ import DAny
+
+URL = "https://netbox/api/ipam/roles/"
+
+
+def _response(status_code: int = 200, content: bytes = b"[]", headers: Any = None) -> Response:
+    """Init Response."""
+    response = Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers.update(headers or {})
+    return response
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("", ""),
+    ("https://netbox/api/ipam/vrfs/", "https://netbox/api/ipam/vrfs/"),
+    ("HTTPS://Netbox/api/ipam/vrfs/?offset=0&limit=1000",
+     "https://netbox/api/ipam/vrfs/?limit=1000&offset=0"),
+    ("https://netbox/api/ipam/vrfs/?name=B&name=A&q=",
+     "https://netbox/api/ipam/vrfs/?name=A&name=B&q="),
+])
+def test__normalize_url(url: str, expected: str):
+    """normalize_url()."""
+    actual = normalize_url(url)
+    assert actual == expected
+
+
+@pytest.mark.parametrize("kwargs, expected", [
+    ({}, None),
+    ({"http_cache": False, "http_cache_ttl": 10}, None),
+    ({"http_cache": True}, (0.0, 100_000_000, "")),
+    ({"http_cache": True, "http_cache_ttl": 10, "http_cache_size": 2, "http_cache_dir": "a"},
+     (10.0, 2, "a")),
+])
+def test__init_response_cache(kwargs: DAny, expected: Any):
+    """init_response_cache()."""
+    cache = init_response_cache(**kwargs)
+    if expected is None:
+        assert cache is None
+    else:
+        actual = (cache.ttl, cache.maxsize, cache.directory)
+        assert actual == expected
+
+
+@pytest.mark.parametrize("ttl, status_code, headers, expected", [
+    (0, 200, {}, False),
+    (0, 200, {"ETag": "a"}, True),
+    (0, 200, {"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}, True),
+    (0, 404, {"ETag": "a"}, False),
+    (10, 200, {}, True),
+])
+def test__put(ttl: int, status_code: int, headers: DAny, expected: bool):
+    """ResponseCache.put()."""
+    cache = ResponseCache(ttl=ttl)
+    cache.put(URL, _response(status_code=status_code, headers=headers))
+    actual = cache.get(URL) is not None
+    assert actual == expected
+
+
+def test__lru():
+    """ResponseCache LRU eviction by the total size of the bodies."""
+    cache = ResponseCache(maxsize=20)
+    for id_ in range(1, 4):
+        if id_ == 3:
+            assert cache.get(f"{URL}?id=1")  # recently used
+        cache.put(f"{URL}?id={id_}", _response(content=b"0" * 10, headers={"ETag": str(id_)}))
+
+    assert (len(cache), cache.size) == (2, 20)
+    assert cache.get(f"{URL}?id=1")
+    assert cache.get(f"{URL}?id=2") is None
+    assert cache.get(f"{URL}?id=3")
+
+    cache.put(f"{URL}?id=1", _response(content=b"0" * 21, headers={"ETag": "1"}))  # too large
+    assert (len(cache), cache.size) == (1, 10)
+    assert cache.get(f"{URL}?id=1") is None
+    cache.invalidate(URL)
+    assert (len(cache), cache.size) == (0, 0)
+
+
+def test__directory__prune(tmp_path: Path):
+    """ResponseCache on disk, the oldest files above maxsize are removed."""
+    cache = ResponseCache(maxsize=1000, directory=str(tmp_path))
+    for id_ in range(1, 4):
+        cache.put(f"{URL}?id={id_}", _response(content=b"0" * 250, headers={"ETag": "a"}))
+        path = cache._path(f"{URL}?id={id_}")
+        os.utime(path, (id_, id_))
+    sizes = [p.stat().st_size for p in tmp_path.iterdir()]
+    assert sum(sizes) <= 1000
+    assert len(sizes) == 2
+
+    cache = ResponseCache(maxsize=1000, directory=str(tmp_path))
+    assert cache.get(f"{URL}?id=1") is None
+    assert cache.get(f"{URL}?id=2")
+    assert cache.get(f"{URL}?id=3")
+
+
+def test__directory(tmp_path: Path):
+    """ResponseCache on disk."""
+    cache = ResponseCache(directory=str(tmp_path))
+    cache.put(URL, _response(content=b"[1]", headers={"ETag": "a"}))
+
+    cache = ResponseCache(directory=str(tmp_path))
+    page = cache.get(URL)
+    assert page.content == b"[1]"
+    assert page.headers() == {"If-None-Match": "a"}
+    assert len(cache) == 1
+
+    paths = list(tmp_path.iterdir())
+    assert [p.suffix for p in paths] == [".json"]
+    assert json.loads(paths[0].read_text())["url"] == URL
+
+    # invalid file
+    paths[0].write_bytes(b"\x80\x04")
+    assert ResponseCache(directory=str(tmp_path)).get(URL) is None
+
+
+def test__directory__token(tmp_path: Path):
+    """ResponseCache on disk, the entries are separated by the token."""
+    cache = ResponseCache(directory=str(tmp_path), token="a" * 40)
+    cache.put(URL, _response(content=b"[1]", headers={"ETag": "a"}))
+
+    assert ResponseCache(directory=str(tmp_path), token="a" * 40).get(URL)
+    assert ResponseCache(directory=str(tmp_path), token="b" * 40).get(URL) is None
+    assert ResponseCache(directory=str(tmp_path)).get(URL) is None
+    assert "a" * 40 not in list(tmp_path.iterdir())[0].read_text()
+
+
+def test__invalidate(tmp_path: Path):
+    """ResponseCache.invalidate()."""
+    cache = ResponseCache(ttl=60, directory=str(tmp_path))
+    urls = [URL, f"{URL}1/", f"{URL}?name=a", "https://netbox/api/ipam/vrfs/"]
+    for url in urls:
+        cache.put(url, _response())
+    cache.invalidate(URL)
+    assert [cache.get(s) is not None for s in urls] == [False, False, False, True]
+    assert len(list(tmp_path.iterdir())) == 1
+
+    # entries on disk, written by the previous run
+    cache = ResponseCache(ttl=60, directory=str(tmp_path))
+    cache.put(URL, _response())
+    cache = ResponseCache(ttl=60, directory=str(tmp_path))
+    cache.invalidate(URL)
+    assert cache.get(URL) is None
+    cache.put(URL, _response())
+    assert cache.get(URL) is not None
+
+
+@pytest.mark.parametrize("ttl, expected", [
+    (0, 2),
+    (60, 1),
+])
+def test__retry_requests(ttl: int, expected: int):
+    """BaseC._retry_requests() with ResponseCache."""
+    api = NbApi(host="netbox", http_cache=True, http_cache_ttl=ttl)
+    with requests_mock.Mocker() as mock:
+        mock.get(URL, [
+            {"status_code": 200, "content": b"[1]", "headers": {"ETag": "a"}},
+            {"status_code": 304},
+        ])
+        response = api.ipam.roles._retry_requests(url=URL)
+        assert response.content == b"[1]"
+        assert "If-None-Match" not in mock.last_request.headers
+
+        # other connector shares the cache
+        response = api.ipam.vrfs._retry_requests(url=URL)
+        assert response.status_code == 200
+        assert response.content == b"[1]"
+        assert mock.call_count == expected
+        if expected == 2:
+            assert mock.last_request.headers["If-None-Match"] == "a"
+
+
+def test__retry_requests__modified():
+    """BaseC._retry_requests() with ResponseCache, page changed."""
+    api = NbApi(host="netbox", http_cache=True)
+    with requests_mock.Mocker() as mock:
+        mock.get(URL, [
+            {"status_code": 200, "content": b"[1]", "headers": {"ETag": "a"}},
+            {"status_code": 200, "content": b"[2]", "headers": {"ETag": "b"}},
+        ])
+        api.ipam.roles._retry_requests(url=URL)
+        response = api.ipam.roles._retry_requests(url=URL)
+        assert response.content == b"[2]"
+        assert api._response_cache.get(URL).etag == "b"
+
+
+def test__write__invalidate():
+    """Connector.create() invalidates the cached responses of the model."""
+    api = NbApi(host="netbox", http_cache=True, http_cache_ttl=60)
+    with requests_mock.Mocker() as mock:
+        mock.get(URL, [
+            {"status_code": 200, "json": {"count": 0, "results": []}},
+            {"status_code": 200, "json": {"count": 1, "results": [{"id": 1}]}},
+        ])
+        mock.post(URL, status_code=201, json={"id": 1})
+        assert api.ipam.roles._retry_requests(url=URL).json()["count"] == 0
+        assert api.ipam.roles._retry_requests(url=URL).json()["count"] == 0
+        api.ipam.roles.create(name="ROLE1")
+        assert api.ipam.roles._retry_requests(url=URL).json()["count"] == 1
+        assert [r.method for r in mock.request_history] == ["GET", "POST", "GET"]
+
+
+def test__retry_write__invalidate(monkeypatch):
+    """Connector.create() timed out, the lookup of the created object is not cached."""
+    monkeypatch.setattr(base_c.time, "sleep", lambda _: None)
+    api = NbApi(host="netbox", http_cache=True, http_cache_ttl=60, max_retries=1)
+    data = {"id": 1, "name": "ROLE1", "created": "2001-01-01T00:00:00Z"}
+    url = f"{URL}?name=ROLE1"
+    with requests_mock.Mocker() as mock:
+        mock.get(url, [
+            {"status_code": 200, "json": {"count": 0, "results": []}},
+            {"status_code": 200, "json": {"count": 1, "results": [data]}},
+        ])
+        mock.get("https://netbox/api/status/", headers={"Date": "Mon, 01 Jan 2001 00:00:00 GMT"})
+        mock.post(URL, exc=ReadTimeout)
+        assert api.ipam.roles.get(name="ROLE1") == []
+        assert api.ipam.roles.create_d(name="ROLE1") == data
+        assert [r.method for r in mock.request_history] == ["GET", "POST", "GET", "GET"]
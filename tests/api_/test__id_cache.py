@@ -0,0 +1,89 @@
+# pylint: disable=W0212,R0801,W0621
+
+"""Unittests id_cache.py."""
+import time
+
+import pytest
+import requests_mock
+from _pytest.monkeypatch import MonkeyPatch
+
+from netbox3.api import id_cache
+from netbox3.api.id_cache import IdCache
+from netbox3.nb_api import NbApi
+
+
+@pytest.mark.parametrize("ttl, expected", [
+    (0, None),
+    (10, [1, 2]),
+])
+def test__get(ttl: int, expected):
+    """IdCache.get()."""
+    cache = IdCache(ttl=ttl)
+    cache.set("dcim/sites/", "name", "SITE1", [1, 2])
+    actual = cache.get("dcim/sites/", "name", "SITE1")
+    assert actual == expected
+    assert cache.get("dcim/sites/", "slug", "SITE1") is None
+
+
+def test__get__expired(monkeypatch: MonkeyPatch):
+    """IdCache.get() expired entry."""
+    cache = IdCache(ttl=10)
+    cache.set("dcim/sites/", "name", "SITE1", [1])
+    now = time.monotonic()
+    monkeypatch.setattr(id_cache.time, "monotonic", lambda: now + 11)
+    assert cache.get("dcim/sites/", "name", "SITE1") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("", 0),
+    ("dcim/sites/", 1),
+    ("ipam/vrfs/", 2),
+])
+def test__invalidate(path: str, expected: int):
+    """IdCache.invalidate()."""
+    cache = IdCache(ttl=10)
+    cache.set("dcim/sites/", "name", "SITE1", [1])
+    cache.set("dcim/sites/", "name", "SITE2", [2])
+    cache.set("ipam/vrfs/", "name", "VRF1", [1])
+    cache.invalidate(path)
+    assert len(cache) == expected
+
+
+@pytest.mark.parametrize("id_cache_ttl, sites, expected", [
+    (0, [["SITE1"], ["SITE1"]], 2),
+    (10, [["SITE1"], ["SITE1"]], 1),
+    (10, [["SITE1"], ["SITE1", "SITE2"]], 2),
+])
+def test__resolve_ids(id_cache_ttl: int, sites: list, expected: int):
+    """BaseC._resolve_ids() requests only required names and reuses cached ids."""
+    api = NbApi(host="netbox", extended_get=True, id_cache_ttl=id_cache_ttl)
+    with requests_mock.Mocker() as mock:
+        for id_ in [1, 2]:
+            mock.get(
+                f"https://netbox/api/dcim/sites/?name=SITE{id_}&limit=1000&offset=0",
+                json={"results": [{"id": id_, "name": f"SITE{id_}"}]},
+                complete_qs=True,
+            )
+        for site in sites:
+            actual = api.dcim.devices._change_params_name_to_id(params_d={"site": site})
+            assert actual == {"site_id": [int(s[-1]) for s in site]}
+        assert mock.call_count == expected
+
+
+def test__resolve_ids__invalidate():
+    """Connector.create() invalidates cached ids of the model."""
+    api = NbApi(host="netbox", extended_get=True, id_cache_ttl=10)
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            "https://netbox/api/dcim/sites/?name=SITE1&limit=1000&offset=0",
+            json={"results": [{"id": 1, "name": "SITE1"}]},
+        )
+        mock.post("https://netbox/api/dcim/sites/", status_code=201)
+        api.dcim.devices._change_params_name_to_id(params_d={"site": ["SITE1"]})
+        api.dcim.sites.create(name="SITE2")
+        api.dcim.devices._change_params_name_to_id(params_d={"site": ["SITE1"]})
+        assert mock.call_count == 3
+
+        api.clear_id_cache()
+        assert len(api._id_cache) == 0
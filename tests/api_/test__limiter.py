@@ -0,0 +1,84 @@
+"""Unittests limiter.py."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from netbox3.api.limiter import Limiter, TokenBucket, init_limiter, init_pacer
+
+
+@pytest.mark.parametrize("interval, expected", [
+    (0, 0.0),
+    (-1, 0.0),
+    (0.5, 2.0),
+    (2, 0.5),
+])
+def test__init_pacer(interval, expected):
+    """init_pacer()."""
+    bucket = init_pacer(interval)
+    assert bucket.rate == expected
+    assert bucket.burst == 1
+
+
+def test__acquire__no_limit():
+    """TokenBucket.acquire() rate=0."""
+    bucket = TokenBucket()
+    actual = [bucket.acquire() for _ in range(100)]
+    assert actual == [0.0] * 100
+
+
+@pytest.mark.parametrize("burst, count, expected", [
+    (1, 1, 0.0),
+    (1, 3, 0.2),
+    (3, 3, 0.0),
+    (3, 5, 0.2),
+])
+def test__acquire(burst, count, expected):
+    """TokenBucket.acquire()."""
+    bucket = TokenBucket(rate=10, burst=burst)
+    start = time.monotonic()
+    for _ in range(count):
+        bucket.acquire()
+    actual = time.monotonic() - start
+    assert expected <= actual + 0.01
+    assert actual < expected + 0.1
+
+
+@pytest.mark.parametrize("kwargs, expected", [
+    ({}, (0.0, 1, 0)),
+    ({"rate_limit": 5, "burst": 10, "max_in_flight": 2}, (5.0, 10, 2)),
+])
+def test__init_limiter(kwargs, expected):
+    """init_limiter()."""
+    limiter = init_limiter(**kwargs)
+    actual = (limiter.bucket.rate, limiter.bucket.burst, limiter.max_in_flight)
+    assert actual == expected
+
+
+@pytest.mark.parametrize("max_in_flight, expected", [
+    (0, 5),
+    (1, 1),
+    (2, 2),
+])
+def test__limiter__max_in_flight(max_in_flight, expected):
+    """Limiter max_in_flight."""
+    limiter = Limiter(max_in_flight=max_in_flight)
+    lock = threading.Lock()
+    counters = {"in_flight": 0, "max": 0}
+
+    def request():
+        with limiter:
+            with lock:
+                counters["in_flight"] += 1
+                counters["max"] = max(counters["max"], counters["in_flight"])
+            time.sleep(0.05)
+            with lock:
+                counters["in_flight"] -= 1
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        for _ in range(5):
+            executor.submit(request)
+
+    actual = counters["max"]
+    assert actual == expected
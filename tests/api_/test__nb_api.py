@@ -2,6 +2,8 @@
 
 """Unittests nb_pai.py."""
 import inspect
+from functools import partial
+from unittest.mock import patch
 
 import pytest
 import requests_mock
@@ -60,12 +62,26 @@ def test__init__(api: NbApi):
         "verify",
         "limit",
         "url_length",
+        "batch_size",
         "threads",
         "interval",
+        "preflight",
+        "rate_limit",
+        "burst",
+        "max_in_flight",
         "timeout",
         "max_retries",
         "sleep",
+        "max_sleep",
+        "retry_statuses",
+        "deadline",
         "strict",
+        "http_cache",
+        "http_cache_ttl",
+        "http_cache_size",
+        "http_cache_dir",
+        "extended_get",
+        "id_cache_ttl",
         "default_get",
         "loners",
         "kwargs",
@@ -73,6 +89,59 @@ def test__init__(api: NbApi):
     assert actual == expected
 
 
+@pytest.mark.parametrize("threads, expected", [
+    (1, 10),
+    (10, 10),
+    (50, 50),
+])
+def test__session(threads, expected):
+    """NbApi._session shared by all connectors."""
+    api = NbApi(host="netbox", threads=threads)
+    session = api._session
+    assert api.ipam.ip_addresses._session is session
+    assert api.dcim.devices._session is session
+    assert api.status._session is session
+
+    actual = session.get_adapter("https://netbox")._pool_maxsize
+    assert actual == expected
+
+
+def test__executor():
+    """NbApi._executor shared by all connectors, released by close()."""
+    with NbApi(host="netbox", threads=3, interval=0.5) as api:
+        executor = api._executor
+        assert api.ipam.ip_addresses._executor is executor
+        assert api.dcim.devices._executor is executor
+        assert api.ipam.ip_addresses._pacer is api._pacer
+        assert api._pacer.rate == 2
+        assert executor._max_workers == 3
+
+    with pytest.raises(RuntimeError):
+        executor.submit(int)
+
+    # passed executor and pacer
+    with NbApi(host="netbox") as api:
+        api_ = NbApi(host="netbox", executor=api._executor, pacer=api._pacer)
+        assert api_._executor is api._executor
+        assert api_.ipam.ip_addresses._executor is api._executor
+        assert api_.ipam.ip_addresses._pacer is api._pacer
+
+
+@pytest.mark.parametrize("threads, tasks, expected", [
+    (1, 5, 1),
+    (3, 5, 3),
+    (3, 2, 2),
+])
+def test__run_tasks__pacer(threads: int, tasks: int, expected: int):
+    """BaseC._run_tasks() paces only the start of the threads."""
+    with NbApi(host="netbox", threads=threads, interval=10) as api:
+        connector = api.ipam.ip_addresses
+        with patch.object(connector._pacer, "acquire") as acquire:
+            actual = connector._run_tasks([partial(int, i) for i in range(tasks)])
+    assert actual == list(range(tasks))
+    assert acquire.call_count == expected
+
+
 @pytest.mark.parametrize("params, expected", [
     ({"host": "netbox"}, "https://netbox/api/"),
     ({"host": "netbox", "scheme": "https"}, "https://netbox/api/"),
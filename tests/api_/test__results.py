@@ -0,0 +1,30 @@
+# pylint: disable=W0212,R0801,W0621
+
+"""Unittests results.py."""
+import pytest
+
+from netbox3.api.results import Results
+from netbox3.types_ import LDAny, LInt
+
+
+@pytest.mark.parametrize("pages, expected", [
+    ([], []),
+    ([[{"id": 1}]], [1]),
+    ([[{"id": 2}, {"id": 1}], [{"id": 3}]], [1, 2, 3]),
+    ([[{"id": 2}, {"id": 1}], [{"id": 1}, {"id": 3}, {"id": 2}]], [1, 2, 3]),
+])
+def test__extend(pages: LDAny, expected: LInt):
+    """Results.extend()."""
+    results = Results()
+    for page in pages:
+        results.extend(page)
+    actual = [d["id"] for d in results.objects()]
+    assert actual == expected
+    assert len(results) == len(expected)
+
+
+def test__extend__first():
+    """Results.extend() keep the first object with the same id."""
+    results = Results([{"id": 1, "name": "A"}, {"id": 1, "name": "B"}])
+    actual = results.objects()
+    assert actual == [{"id": 1, "name": "A"}]
@@ -0,0 +1,138 @@
+# pylint: disable=W0212,R0801,W0621
+
+"""Unittests retry.py."""
+import time
+from typing import Any
+
+import pytest
+import requests_mock
+from _pytest.monkeypatch import MonkeyPatch
+from requests import Response
+from requests.exceptions import ConnectTimeout, ConnectionError as RequestsConnectionError
+
+from netbox3.api import base_c
+from netbox3.api.retry import RetryPolicy, get_retry_after, init_retry_policy
+from netbox3.nb_api import NbApi
+from netbox3.types_ import DAny, LDAny
+
+
+def _response(status_code: int, headers: DAny) -> Response:
+    """Init Response."""
+    response = Response()
+    response.status_code = status_code
+    response.headers.update(headers)
+    return response
+
+
+@pytest.mark.parametrize("kwargs, expected", [
+    ({}, (0, 10.0, 60.0, [429, 502, 503, 504], 0.0)),
+    ({"max_retries": 2, "sleep": 1, "max_sleep": 5, "retry_statuses": [503, 500, 503],
+      "deadline": 30}, (2, 1.0, 5.0, [500, 503], 30.0)),
+    ({"sleep": 100, "retry_statuses": []}, (0, 100.0, 100.0, [], 0.0)),
+])
+def test__init_retry_policy(kwargs: DAny, expected: Any):
+    """init_retry_policy()."""
+    policy = init_retry_policy(**kwargs)
+    actual = (policy.max_retries, policy.sleep, policy.max_sleep, policy.retry_statuses,
+              policy.deadline)
+    assert actual == expected
+
+
+@pytest.mark.parametrize("attempt, expected", [
+    (1, 1),
+    (2, 2),
+    (3, 4),
+    (4, 5),
+    (10, 5),
+])
+def test__backoff(attempt: int, expected: float):
+    """RetryPolicy.backoff()."""
+    policy = RetryPolicy(sleep=1, max_sleep=5)
+    for _ in range(20):
+        actual = policy.backoff(attempt)
+        assert 0 <= actual <= expected
+
+
+@pytest.mark.parametrize("status_code, headers, expected", [
+    (429, {"Retry-After": "7"}, 7),
+    (503, {"Retry-After": "7"}, 7),
+    (503, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, 0),
+    (503, {"Retry-After": "invalid"}, None),
+    (504, {"Retry-After": "7"}, None),
+    (503, {}, None),
+])
+def test__delay(status_code: int, headers: DAny, expected: Any):
+    """RetryPolicy.delay()."""
+    policy = RetryPolicy(sleep=1, max_sleep=1)
+    response = _response(status_code, headers)
+    actual = policy.delay(1, response)
+    if expected is None:
+        assert 0 <= actual <= 1
+    else:
+        assert actual == expected
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({}, None),
+    ({"Retry-After": " 3 "}, 3),
+    ({"Retry-After": "-1"}, None),
+])
+def test__get_retry_after(headers: DAny, expected: Any):
+    """get_retry_after()."""
+    actual = get_retry_after(_response(503, headers))
+    assert actual == expected
+
+
+@pytest.mark.parametrize("kwargs, attempt, delay, expected", [
+    ({"max_retries": 0}, 1, 0, False),
+    ({"max_retries": 2}, 2, 0, True),
+    ({"max_retries": 2}, 3, 0, False),
+    ({"max_retries": 2, "deadline": 10}, 1, 5, True),
+    ({"max_retries": 2, "deadline": 10}, 1, 15, False),
+])
+def test__is_allowed(kwargs: DAny, attempt: int, delay: float, expected: bool):
+    """RetryPolicy.is_allowed()."""
+    policy = RetryPolicy(**kwargs)
+    actual = policy.is_allowed(attempt=attempt, start=time.monotonic(), delay=delay)
+    assert actual == expected
+
+
+@pytest.mark.parametrize("kwargs, responses, expected, calls", [
+    ({"max_retries": 2}, [{"status_code": 200}], 200, 1),
+    ({"max_retries": 2}, [{"status_code": 503}, {"status_code": 200}], 200, 2),
+    ({"max_retries": 2}, [{"status_code": 429, "headers": {"Retry-After": "3"}},
+                          {"status_code": 200}], 200, 2),
+    ({"max_retries": 2}, [{"exc": ConnectTimeout}, {"status_code": 200}], 200, 2),
+    ({"max_retries": 2}, [{"exc": ConnectTimeout}] * 3, 504, 3),
+    ({"max_retries": 2}, [{"exc": RequestsConnectionError}, {"status_code": 200}], 200, 2),
+    ({"max_retries": 2}, [{"exc": RequestsConnectionError}] * 3, ConnectionError, 3),
+    ({"max_retries": 2}, [{"status_code": 503}] * 3, ConnectionError, 3),
+    ({"max_retries": 2}, [{"status_code": 500}], ConnectionError, 1),
+    ({"max_retries": 2, "retry_statuses": [500]}, [{"status_code": 500}, {"status_code": 200}],
+     200, 2),
+    ({"max_retries": 0}, [{"status_code": 503}], ConnectionError, 1),
+])
+def test__retry_requests(
+        monkeypatch: MonkeyPatch,
+        kwargs: DAny,
+        responses: LDAny,
+        expected: Any,
+        calls: int,
+):
+    """BaseC._retry_requests() with RetryPolicy."""
+    sleeps = []
+    monkeypatch.setattr(base_c.time, "sleep", sleeps.append)
+    api = NbApi(host="netbox", sleep=1, **kwargs)
+    url = "https://netbox/api/ipam/vrfs/"
+    with requests_mock.Mocker() as mock:
+        mock.get(url, responses)
+        if isinstance(expected, int):
+            response = api.ipam.vrfs._retry_requests(url=url)
+            assert response.status_code == expected
+        else:
+            with pytest.raises(expected):
+                api.ipam.vrfs._retry_requests(url=url)
+        assert mock.call_count == calls
+    assert len(sleeps) == calls - 1
+    if responses[0].get("headers"):
+        assert sleeps == [3]
@@ -6,6 +6,7 @@ from typing import Any
 import pytest
 
 from netbox3.branch.nb_branch import NbBranch
+from netbox3.exceptions import NbBranchError
 from netbox3.types_ import LStr
 from tests import params__nb_branch as p
 
@@ -124,3 +125,35 @@ def test__tags(data: dict, strict: bool, expected: Any):
     else:
         with pytest.raises(expected):
             branch.tags()
+
+
+@pytest.mark.parametrize("method, params", [
+    ("any", p.ANY),
+    ("dict", p.DICT),
+    ("int", p.INT),
+    ("list", p.LIST),
+    ("str", p.STR),
+])
+def test__compile(method: str, params: list):
+    """NbBranch.compile() same values and errors as NbBranch."""
+    for keys, data, strict, _ in params:
+        branch = NbBranch(data=data, strict=strict)
+        nb_keys = NbBranch.compile(*keys, strict=strict)
+        try:
+            expected = getattr(branch, method)(*keys)
+        except NbBranchError as ex:
+            with pytest.raises(type(ex)):
+                getattr(nb_keys, method)(data)
+        else:
+            actual = getattr(nb_keys, method)(data)
+            assert actual == expected
+            assert type(actual) is type(expected)
+
+
+def test__compile__data():
+    """NbKeys invalid data."""
+    nb_keys = NbBranch.compile("site", "slug")
+    assert repr(nb_keys) == "<NbKeys: site/slug>"
+    assert nb_keys.str(None) == ""
+    with pytest.raises(TypeError):
+        nb_keys.str([])  # type: ignore
@@ -1,6 +1,8 @@
 # pylint: disable=W0212,R0801,W0621
 
 """Unittests cache.py."""
+import pickle
+from copy import copy, deepcopy
 from pathlib import Path
 from unittest.mock import Mock
 from unittest.mock import patch, mock_open
@@ -8,6 +10,8 @@ from unittest.mock import patch, mock_open
 import pytest
 from _pytest.monkeypatch import MonkeyPatch
 
+from netbox3.cache_backend import JsonlBackend, MmapBackend, MmapView, PickleBackend
+from netbox3 import nb_cache
 from netbox3.nb_cache import NbCache
 from netbox3.nb_tree import NbTree
 from tests import objects
@@ -36,9 +40,8 @@ def test__read_cache(tree_meta):
         "tree": tree.model_dump(),
         "status": {"meta": meta},
     }
-    patch("pathlib.Path.open", mock_open()).start()
-
-    with patch("pickle.load", return_value=return_value).start():
+    with patch("pathlib.Path.open", mock_open(read_data=b"")), \
+            patch("pickle.load", return_value=return_value):
         cache = NbCache(cache="test")
         tree, status = cache.read_cache()
         assert tree.ipam.vrfs[1]["id"] == 1  # pylint: disable=E1101
@@ -60,3 +63,205 @@ def test__write_cache(tree_meta, monkeypatch: MonkeyPatch):
 
     with pytest.raises(ValueError):
         NbCache().write_cache()
+
+
+@pytest.mark.parametrize("name, backend", [
+    ("netbox.pickle", PickleBackend),
+    ("netbox.jsonl", JsonlBackend),
+    ("netbox.mmap", MmapBackend),
+    ("netbox", PickleBackend),
+])
+def test__read_write_cache(tree_meta, tmp_path: Path, name, backend):
+    """Cache.write_cache() Cache.read_cache() formats."""
+    tree, meta = tree_meta
+    tree.dcim.sites.update({2: {"id": 2, "name": "SITE2", "tags": [{"id": 1}]}})
+    path = str(tmp_path / name)
+
+    cache = NbCache(tree=tree, status={"meta": meta}, cache=path)
+    assert isinstance(cache.backend, backend)
+    cache.write_cache()
+    shards = sorted(p.name for p in Path(f"{path}.d").iterdir())
+    assert shards == [f"dcim.sites{backend.suffix}", f"ipam.vrfs{backend.suffix}"]
+
+    tree_, status = NbCache(cache=path).read_cache()
+    assert tree_.ipam.vrfs == tree.ipam.vrfs  # pylint: disable=E1101
+    assert tree_.dcim.sites == tree.dcim.sites  # pylint: disable=E1101
+    assert tree_.dcim.devices == {}  # pylint: disable=E1101
+    assert tree_.count() == 2
+    assert status == {"meta": meta}
+
+    # stale shard
+    tree.dcim.sites.clear()
+    NbCache(tree=tree, status={"meta": meta}, cache=path).write_cache()
+    shards = sorted(p.name for p in Path(f"{path}.d").iterdir())
+    assert shards == [f"ipam.vrfs{backend.suffix}"]
+
+
+@pytest.mark.parametrize("models, loaded, lazy", [
+    (None, ["dcim.sites", "ipam.vrfs"], []),
+    ([], [], ["dcim.sites", "ipam.vrfs"]),
+    (["ipam.vrfs"], ["ipam.vrfs"], ["dcim.sites"]),
+    (["ipam/vrfs/"], ["ipam.vrfs"], ["dcim.sites"]),
+    ("dcim", ["dcim.sites"], ["ipam.vrfs"]),
+])
+def test__read_cache__models(tree_meta, tmp_path: Path, models, loaded, lazy):
+    """Cache.read_cache(models)."""
+    tree, meta = tree_meta
+    tree.dcim.sites.update({2: {"id": 2, "name": "SITE2"}})
+    path = str(tmp_path / "netbox.pickle")
+    NbCache(tree=tree, status={"meta": meta}, cache=path).write_cache()
+
+    tree_, _ = NbCache(cache=path).read_cache(models=models)
+    actual = [f"{a}.{m}" for a in tree_.apps() for m in getattr(tree_, a).lazy_models()]
+    assert actual == lazy
+    for name in loaded:
+        app, model = name.split(".")
+        assert getattr(getattr(tree_, app), model) == getattr(getattr(tree, app), model)
+
+    assert tree_.ipam.vrfs == tree.ipam.vrfs  # pylint: disable=E1101
+    assert tree_.dcim.sites == tree.dcim.sites  # pylint: disable=E1101
+    assert tree_.ipam.lazy_models() == []  # pylint: disable=E1101
+    assert tree_.dcim.lazy_models() == []  # pylint: disable=E1101
+
+
+@pytest.mark.parametrize("name", ["netbox.pickle", "netbox.jsonl", "netbox.mmap"])
+def test__read_cache__lazy_write(tree_meta, tmp_path: Path, name):
+    """Cache.read_cache() lazy models are not loaded from the next write."""
+    tree, meta = tree_meta
+    tree.dcim.sites.update({2: {"id": 2, "name": "SITE2"}})
+    tree.tenancy.tenants.update({3: {"id": 3, "name": "TENANT3"}})
+    path = str(tmp_path / name)
+    NbCache(tree=tree, status={"meta": meta}, cache=path).write_cache()
+    tree_, _ = NbCache(cache=path).read_cache(models=[])
+    assert tree_.tenancy.tenants[3]["name"] == "TENANT3"  # pylint: disable=E1101
+
+    # the next write removes the ipam.vrfs shard and replaces the dcim.sites shard
+    tree.ipam.vrfs.clear()
+    tree.dcim.sites[2] = {"id": 2, "name": "SITE22"}
+    NbCache(tree=tree, status={"meta": meta}, cache=path).write_cache()
+    assert not Path(f"{path}.d", f"ipam.vrfs{Path(name).suffix}").exists()
+
+    loader = tree_.ipam._lazy["vrfs"].load  # pylint: disable=E1101
+    assert isinstance(loader, nb_cache.ShardLoader)
+    with pytest.raises(FileNotFoundError):
+        loader()
+    loader = pickle.loads(pickle.dumps(tree_.dcim._lazy["sites"].load))  # pylint: disable=E1101
+    with pytest.raises(ValueError):
+        loader()
+    with pytest.raises(FileNotFoundError):
+        _ = tree_.ipam.vrfs  # pylint: disable=E1101
+    with pytest.raises(ValueError):
+        _ = tree_.dcim.sites  # pylint: disable=E1101
+    assert tree_.ipam.lazy_models() == ["vrfs"]  # pylint: disable=E1101
+    assert tree_.dcim.lazy_models() == ["sites"]  # pylint: disable=E1101
+
+    tree2_, _ = NbCache(cache=path).read_cache(models=[])
+    assert tree2_.ipam.vrfs == {}  # pylint: disable=E1101
+    assert tree2_.dcim.sites[2]["name"] == "SITE22"  # pylint: disable=E1101
+
+
+def test__read_cache__lazy_files(tree_meta, tmp_path: Path):
+    """Cache.read_cache() lazy models do not keep the shard files open."""
+    tree, meta = tree_meta
+    path = str(tmp_path / "netbox.pickle")
+    NbCache(tree=tree, status={"meta": meta}, cache=path).write_cache()
+
+    with patch("pathlib.Path.open", side_effect=Path.open, autospec=True) as mock:
+        tree_, _ = NbCache(cache=path).read_cache(models=[])
+        count = mock.call_count
+        assert tree_.ipam.lazy_models() == ["vrfs"]  # pylint: disable=E1101
+        assert mock.call_count == count
+        assert tree_.ipam.vrfs == tree.ipam.vrfs  # pylint: disable=E1101
+        assert mock.call_count == count + 1
+
+
+@pytest.mark.parametrize("name, compression, compresslevel, magic", [
+    ("netbox.pickle", "", 0, b"\x80"),
+    ("netbox.pickle", "gzip", 1, b"\x1f\x8b"),
+    ("netbox.jsonl", "bz2", 0, b"BZh"),
+    ("netbox.jsonl", "lzma", 1, b"\xfd7zXZ"),
+])
+def test__write_cache__compression(tree_meta, tmp_path: Path, name, compression,
+                                   compresslevel, magic):
+    """Cache.write_cache(compression)."""
+    tree, meta = tree_meta
+    path = str(tmp_path / name)
+    cache = NbCache(tree=tree, status={"meta": meta}, cache=path,
+                    compression=compression, compresslevel=compresslevel)
+    cache.write_cache()
+
+    assert Path(path).read_bytes().startswith(magic)
+    assert Path(path).with_name(f"{name}.lock").is_file()
+    assert not list(tmp_path.rglob("*.tmp"))
+    tree_, status = NbCache(cache=path).read_cache()
+    assert tree_.ipam.vrfs == tree.ipam.vrfs  # pylint: disable=E1101
+    assert status == {"meta": meta}
+
+
+@pytest.mark.parametrize("cache, compression", [
+    ("netbox.pickle", "zip"),
+    ("netbox.mmap", "gzip"),
+])
+def test__init__compression(cache, compression):
+    """Cache.__init__(compression) invalid."""
+    with pytest.raises(ValueError):
+        NbCache(cache=cache, compression=compression)
+
+
+def test__mmap_view(tmp_path: Path):
+    """MmapView."""
+    path = str(tmp_path / "netbox.mmap")
+    tree = NbTree()
+    tree.ipam.vrfs.update(objects.vrf_d([3, 1, 2]))  # pylint: disable=E1101
+    NbCache(tree=tree, cache=path).write_cache()
+    tree_, _ = NbCache(cache=path).read_cache()
+    view = tree_.ipam.vrfs  # pylint: disable=E1101
+    assert isinstance(view, MmapView)
+
+    assert list(view) == [1, 2, 3]
+    assert len(view) == 3
+    assert 1 in view
+    assert 4 not in view
+    assert view[1] == tree.ipam.vrfs[1]  # pylint: disable=E1101
+    assert view[1] is view[1]
+    with pytest.raises(KeyError):
+        _ = view[4]
+
+    view[4] = {"id": 4}
+    view[1]["name"] = "VRF11"
+    del view[2]
+    assert list(view) == [1, 3, 4]
+    assert view[1]["name"] == "VRF11"
+    with pytest.raises(KeyError):
+        del view[2]
+
+    copied = copy(view)
+    copied.clear()
+    assert len(copied) == 0
+    assert len(view) == 3
+    assert isinstance(deepcopy(view), dict)
+    assert pickle.loads(pickle.dumps(view)) == view
+
+
+@pytest.mark.parametrize("models, expected", [
+    (None, None),
+    ([], set()),
+    ("ipam", {"ipam"}),
+    (["ipam/ip-addresses/", "dcim.sites", "dcim"], {"ipam.ip_addresses", "dcim.sites", "dcim"}),
+])
+def test__init_models(models, expected):
+    """nb_cache.init_models()."""
+    actual = nb_cache.init_models(models)
+    assert actual == expected
+
+
+def test__read_cache__legacy(tree_meta, tmp_path: Path):
+    """Cache.read_cache() single dict pickle file."""
+    tree, meta = tree_meta
+    path = tmp_path / "netbox.pickle"
+    with path.open("wb") as fh:
+        pickle.dump({"tree": tree.model_dump(), "status": {"meta": meta}}, fh)
+
+    tree_, status = NbCache(cache=str(path)).read_cache()
+    assert tree_.ipam.vrfs == tree.ipam.vrfs  # pylint: disable=E1101
+    assert status == {"meta": meta}
@@ -1,7 +1,7 @@
 # pylint: disable=E1101,W0212,R0801,W0621
 
 """Unittests forager.py."""
-from typing import Any, Tuple
+from typing import Any
 
 import pytest
 import requests_mock
@@ -9,7 +9,6 @@ from requests_mock import Mocker
 
 from netbox3 import nb_tree
 from netbox3.nb_forager import NbForager
-from netbox3.types_ import LT2StrDAny
 from tests.objects import full_tree
 
 
@@ -64,15 +63,6 @@ FIND = [
 ]
 
 
-@pytest.fixture
-def prepare_connector_results(nbf: NbForager) -> Tuple[NbForager, LT2StrDAny]:
-    """Fixture to prepare common connector_results test data."""
-    nbf.api.circuits.circuit_terminations._results = [{"url": "circuit/circuit-terminations/1"}]
-    nbf.api.ipam.vrfs._results = [{"url": "ipam/vrfs/1"}]
-    path_params = [("circuits/circuit-terminations", {"id": [1, 2]}), ("ipam/vrfs", {"id": [1, 2]})]
-    return nbf, path_params
-
-
 def test__interval():
     """Forager._interval()."""
     nbf = NbForager(host="netbox", interval=0.5)
@@ -127,21 +117,18 @@ def test__get_connector(nbf: NbForager, path, expected: Any):
             nbf.ipam.vrfs._get_connector(path)
 
 
-def test__clear_connector_results(prepare_connector_results):
-    """Forager._clear_connector_results()."""
-    nbf, path_params = prepare_connector_results
-    nbf.ipam.vrfs._clear_connector_results(path_params=path_params)
-    assert nbf.api.circuits.circuit_terminations._results == []
-    assert nbf.api.ipam.vrfs._results == []
-
+def test__query_threads():
+    """Forager._query_threads()."""
+    nbf = NbForager(host="netbox", threads=2)
+    path_params = [("circuits/circuit-terminations/", {"id": [1]}), ("ipam/vrfs/", {"id": [1]})]
+    with requests_mock.Mocker() as mock:
+        mock.get("https://netbox/api/circuits/circuit-terminations/?id=1",
+                 json={"results": [{"url": "circuit/circuit-terminations/1"}]})
+        mock.get("https://netbox/api/ipam/vrfs/?id=1", json={"results": [{"url": "ipam/vrfs/1"}]})
+        actual = nbf.ipam.vrfs._query_threads(path_params=path_params)
 
-def test__pop_connector_results(prepare_connector_results):
-    """Forager._pop_connector_results()."""
-    nbf, path_params = prepare_connector_results
-    actual = nbf.ipam.vrfs._pop_connector_results(path_params=path_params)
-    assert actual == [{"url": "circuit/circuit-terminations/1"}, {"url": "ipam/vrfs/1"}]
-    assert nbf.api.circuits.circuit_terminations._results == []
-    assert nbf.api.ipam.vrfs._results == []
+    actual = sorted(d["url"] for page in actual for d in page)
+    assert actual == ["circuit/circuit-terminations/1", "ipam/vrfs/1"]
 
 
 @pytest.mark.parametrize("path, expected", [
@@ -291,3 +278,20 @@ def test__find_rse(nbf_t: NbForager, params, expected: Any):
     else:
         with pytest.raises(expected):
             nbf_t.ipam.prefixes.find_rse(**params)
+
+
+def test__find_root__indexer(nbf_r: NbForager):
+    """Forager.find_root() rebuild index after the data is changed."""
+    devices = nbf_r.dcim.devices
+    assert [d["id"] for d in devices.find_root(serial="SERIAL1")] == [1, 3]
+    indexer = devices._indexers["root"]
+    assert [d["id"] for d in devices.find_root(serial="SERIAL2")] == [2]
+    assert devices._indexers["root"] is indexer
+
+    nbf_r.root.dcim.devices[2]["serial"] = "SERIAL1"
+    nbf_r.root.touch()
+    assert [d["id"] for d in devices.find_root(serial="SERIAL1")] == [1, 2, 3]
+    assert devices._indexers["root"] is not indexer
+
+    nbf_r.root.dcim.devices.pop(3)
+    assert [d["id"] for d in devices.find_root(serial="SERIAL1")] == [1, 2]
@@ -6,7 +6,8 @@ import pytest
 
 from netbox3 import nb_tree
 from netbox3.api.base_c import BaseC
-from netbox3.foragers.ipv4 import IPv4
+from netbox3.foragers import joiner as joiner_
+from netbox3.foragers.ipv4 import IPv4, IPv6
 from netbox3.foragers.joiner import Joiner
 from netbox3.nb_tree import NbTree
 from tests import objects
@@ -91,6 +92,76 @@ def test__join_ipam_ipv4(joiner: Joiner):
     assert ip_address["ip_addresses"] == []
 
 
+def test__join_ipam(joiner: Joiner):
+    """Joiner.join_ipam() IPv6 and VRF."""
+    tree = joiner.tree
+    for id_, prefix, depth, vrf in [
+        (11, "2001:db8::/32", 0, None),
+        (12, "2001:db8::/64", 1, None),
+        (13, "2001:db8::/64", 0, {"id": 1}),
+    ]:
+        tree.ipam.prefixes[id_] = {"id": id_, "prefix": prefix, "family": {"value": 6},
+                                   "vrf": vrf, "_depth": depth}
+    tree.ipam.aggregates[11] = {"id": 11, "prefix": "2001::/16", "family": {"value": 6}}
+    for id_, address, vrf in [
+        (11, "2001:db8::1/64", None),
+        (12, "2001:db8::1/64", {"id": 1}),
+    ]:
+        tree.ipam.ip_addresses[id_] = {"id": id_, "address": address, "family": {"value": 6},
+                                       "vrf": vrf}
+
+    joiner.join_ipam()
+
+    # IPv4 VRF
+    prefix = tree.ipam.prefixes[3]
+    assert prefix["aggregate"] == {}
+    assert [d["id"] for d in prefix["ip_addresses"]] == [3]
+    assert tree.ipam.ip_addresses[3]["super_prefix"]["id"] == 3
+
+    # IPv6 global
+    prefix = tree.ipam.prefixes[11]
+    assert prefix["ipv4"] == IPv6("2001:db8::/32")
+    assert prefix["aggregate"]["id"] == 11
+    assert prefix["super_prefix"] == {}
+    assert [d["id"] for d in prefix["sub_prefixes"]] == [12]
+    assert [d["id"] for d in tree.ipam.aggregates[11]["sub_prefixes"]] == [11]
+    prefix = tree.ipam.prefixes[12]
+    assert prefix["super_prefix"]["id"] == 11
+    assert [d["id"] for d in prefix["ip_addresses"]] == [11]
+    assert tree.ipam.ip_addresses[11]["aggregate"]["id"] == 11
+
+    # IPv6 VRF
+    prefix = tree.ipam.prefixes[13]
+    assert prefix["aggregate"] == {}
+    assert prefix["super_prefix"] == {}
+    assert [d["id"] for d in prefix["ip_addresses"]] == [12]
+
+    # IPv4 global, same as join_ipam_ipv4()
+    prefix = tree.ipam.prefixes[1]
+    assert prefix["aggregate"]["prefix"] == "10.0.0.0/16"
+    assert [d["prefix"] for d in prefix["sub_prefixes"]] == ["10.0.0.0/31"]
+    assert [d["address"] for d in prefix["ip_addresses"]] == ["10.0.0.1/24"]
+
+
+def test__join_ipam__host_bits(joiner: Joiner):
+    """Joiner.join_ipam() prefix and aggregate with host bits set, joined by network."""
+    tree = joiner.tree
+    tree.ipam.aggregates[21] = {"id": 21, "prefix": "10.1.1.1/16", "family": {"value": 4}}
+    tree.ipam.prefixes[21] = {"id": 21, "prefix": "10.1.0.1/24", "family": {"value": 4},
+                              "vrf": None, "_depth": 0}
+    tree.ipam.ip_addresses[21] = {"id": 21, "address": "10.1.0.5/24", "family": {"value": 4},
+                                  "vrf": None}
+
+    joiner.join_ipam()
+
+    prefix = tree.ipam.prefixes[21]
+    assert prefix["ipv4"].net == "10.1.0.0/24"
+    assert prefix["aggregate"]["id"] == 21
+    assert [d["id"] for d in prefix["ip_addresses"]] == [21]
+    assert [d["id"] for d in tree.ipam.aggregates[21]["sub_prefixes"]] == [21]
+    assert tree.ipam.ip_addresses[21]["super_prefix"]["id"] == 21
+
+
 @pytest.mark.parametrize("model, network", [
     ("aggregates", "10.0.0.0/16"),
     ("prefixes", "10.0.0.0/24"),
@@ -116,7 +187,9 @@ def test__init_ipam_keys(joiner: Joiner, model, network):
 def test__join_ipam_aggregates(joiner: Joiner):
     """Joiner._join_ipam_aggregates()."""
     joiner._init_ipam_keys()
-    joiner._join_ipam_aggregates()
+    partition = joiner._get_ipam_partitions()[(4, 0)]
+    prefixes_d = joiner_._split_depth(partition["prefixes"])
+    joiner._join_ipam_aggregates(partition["aggregates"], prefixes_d)
 
     for idx, network, sub_prefixes in [
         (1, "10.0.0.0/16", ["10.0.0.0/24"]),
@@ -144,9 +217,11 @@ def test__join_ipam_aggregates(joiner: Joiner):
 def test__extra__join_ipam_ip_addresses(joiner: Joiner):
     """Joiner._join_ipam_ip_addresses()."""
     joiner._init_ipam_keys()
-    joiner._join_ipam_aggregates()
-    joiner._join_ipam_prefixes()
-    joiner._join_ipam_ip_addresses()
+    partition = joiner._get_ipam_partitions()[(4, 0)]
+    prefixes_d = joiner_._split_depth(partition["prefixes"])
+    joiner._join_ipam_aggregates(partition["aggregates"], prefixes_d)
+    joiner._join_ipam_prefixes(prefixes_d)
+    joiner._join_ipam_ip_addresses(partition["ip_addresses"], prefixes_d)
 
     for idx, network, aggregate, super_prefix, vrf in [
         (1, "10.0.0.1/24", "10.0.0.0/16", "10.0.0.0/24", False),
@@ -165,8 +240,10 @@ def test__extra__join_ipam_ip_addresses(joiner: Joiner):
 def test__join_ipam_prefixes(joiner: Joiner):
     """Joiner._join_ipam_prefixes()."""
     joiner._init_ipam_keys()
-    joiner._join_ipam_aggregates()
-    joiner._join_ipam_prefixes()
+    partition = joiner._get_ipam_partitions()[(4, 0)]
+    prefixes_d = joiner_._split_depth(partition["prefixes"])
+    joiner._join_ipam_aggregates(partition["aggregates"], prefixes_d)
+    joiner._join_ipam_prefixes(prefixes_d)
 
     for idx, network, aggregate, super_prefix, sub_prefixes, vrf in [
         (1, "10.0.0.0/24", "10.0.0.0/16", None, ["10.0.0.0/31"], False),
@@ -186,45 +263,36 @@ def test__join_ipam_prefixes(joiner: Joiner):
 
 # ============================= helpers ==============================
 
-def test__get_aggregates_ip4(joiner: Joiner):
-    """Joiner._get_aggregates_ip4()."""
-    joiner._init_ipam_keys()
-    unsorted = [d["prefix"] for d in joiner.tree.ipam.aggregates.values()]
-    assert unsorted == ["10.0.0.0/16", "1.0.0.0/16"]
-
-    aggregates = joiner._get_aggregates_ip4()
-    actual = [d["prefix"] for d in aggregates]
-    assert actual == ["1.0.0.0/16", "10.0.0.0/16"]
-
-
-def test__get_ip_addresses_ip4(joiner: Joiner):
-    """Joiner._get_ip_addresses_ip4()."""
-    joiner._init_ipam_keys()
-    unsorted = [d["address"] for d in joiner.tree.ipam.ip_addresses.values()]
-    assert unsorted == ["10.0.0.1/24", "1.0.0.1/24", "10.0.0.3/24"]
-
-    ip_addresses = joiner._get_ip_addresses_ip4()
-    actual = [d["address"] for d in ip_addresses]
-    assert actual == ["1.0.0.1/24", "10.0.0.1/24"]
-
-
-def test__get_prefixes_ip4(joiner: Joiner):
-    """Joiner._get_prefixes_ip4()."""
+def test__get_ipam_partitions(joiner: Joiner):
+    """Joiner._get_ipam_partitions()."""
     joiner._init_ipam_keys()
     unsorted = [d["prefix"] for d in joiner.tree.ipam.prefixes.values()]
     assert unsorted == ["10.0.0.0/24", "1.0.0.0/24", "10.0.0.0/24", "10.0.0.0/31", "10.0.0.0/32"]
 
-    prefixes = joiner._get_prefixes_ip4()
-    actual = [d["prefix"] for d in prefixes]
-    assert actual == ["1.0.0.0/24", "10.0.0.0/24", "10.0.0.0/31", "10.0.0.0/32"]
-
-
-def test__get_prefixes_ip4_d(joiner: Joiner):
-    """Joiner._get_prefixes_ip4_d()."""
+    partitions = joiner._get_ipam_partitions()
+    actual = {
+        key: {model: [d["ipv4"].ipv4 for d in objects] for model, objects in partition.items()}
+        for key, partition in partitions.items()
+    }
+    assert actual == {
+        (4, 0): {
+            "aggregates": ["1.0.0.0/16", "10.0.0.0/16"],
+            "prefixes": ["1.0.0.0/24", "10.0.0.0/24", "10.0.0.0/31", "10.0.0.0/32"],
+            "ip_addresses": ["1.0.0.1/24", "10.0.0.1/24"],
+        },
+        (4, 1): {
+            "aggregates": [],
+            "prefixes": ["10.0.0.0/24"],
+            "ip_addresses": ["10.0.0.3/24"],
+        },
+    }
+
+
+def test__split_depth(joiner: Joiner):
+    """joiner._split_depth()."""
     joiner._init_ipam_keys()
-    unsorted = [d["prefix"] for d in joiner.tree.ipam.prefixes.values()]
-    assert unsorted == ["10.0.0.0/24", "1.0.0.0/24", "10.0.0.0/24", "10.0.0.0/31", "10.0.0.0/32"]
+    prefixes = joiner._get_ipam_partitions()[(4, 0)]["prefixes"]
 
-    prefixes_d = joiner._get_prefixes_ip4_d()
+    prefixes_d = joiner_._split_depth(prefixes)
     actual = {k: [d["prefix"] for d in ld] for k, ld in prefixes_d.items()}
     assert actual == {0: ["1.0.0.0/24", "10.0.0.0/24"], 1: ["10.0.0.0/31"], 2: ["10.0.0.0/32"]}
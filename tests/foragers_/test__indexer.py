@@ -0,0 +1,71 @@
+# pylint: disable=W0212
+
+"""Unittests indexer.py."""
+from typing import Any
+
+import pytest
+
+from netbox3.foragers import forager
+from netbox3.foragers.indexer import Indexer
+from netbox3.foragers import indexer
+from tests.foragers_.test__forager import FIND
+from tests.objects import full_tree
+
+
+@pytest.fixture
+def devices_d():
+    """Devices of the full tree."""
+    return full_tree().dcim.devices  # pylint: disable=E1101
+
+
+@pytest.mark.parametrize("params, expected", FIND)
+def test__find(devices_d, params, expected: Any):
+    """Indexer.find() same as the linear scan."""
+    idx = Indexer(devices_d)
+    if isinstance(expected, list):
+        results = idx.find(**params)
+        actual = [d["id"] for d in results]
+        assert actual == expected
+        assert results == forager._find(list(devices_d.values()), **params)
+    else:
+        with pytest.raises(expected):
+            idx.find(**params)
+
+
+def test__find__order(devices_d):
+    """Indexer.find() keeps the original order of the objects."""
+    objects_d = {i: devices_d[i] for i in [3, 1, 2]}
+    idx = Indexer(objects_d)
+    actual = [d["id"] for d in idx.find(tags__name=["TAG1", "TAG3"])]
+    assert actual == [3, 1, 2]
+
+
+def test__find__not_hashable(devices_d):
+    """Indexer.find() scan of the not hashable values."""
+    idx = Indexer(devices_d)
+    device_type = devices_d[1]["device_type"]
+    actual = [d["id"] for d in idx.find(device_type=device_type, serial="SERIAL1")]
+    assert actual == [1]
+    assert idx._indexes["device_type"] is None
+    assert idx._indexes["serial"] == {"SERIAL1": [0, 2], "SERIAL2": [1]}
+
+
+def test__is_valid(devices_d):
+    """Indexer.is_valid()."""
+    idx = Indexer(devices_d, generation=1)
+    assert idx.is_valid(devices_d, generation=1)
+    assert not idx.is_valid(devices_d, generation=2)
+    assert not idx.is_valid(dict(devices_d), generation=1)
+    devices_d.pop(1)
+    assert not idx.is_valid(devices_d, generation=1)
+
+
+@pytest.mark.parametrize("key, expected", [
+    ("name", ["name"]),
+    ("site__slug", ["site", "slug"]),
+    ("tags__name__typo", ["tags", "name", "typo"]),
+])
+def test__split_key(key, expected):
+    """indexer.split_key()."""
+    actual = indexer.split_key(key)
+    assert actual == expected
@@ -3,16 +3,43 @@
 """Unittests ipv4.py."""
 import pytest
 
-from netbox3.foragers.ipv4 import IPv4
+from netbox3.foragers import ipv4
+from netbox3.foragers.ipv4 import IPv4, IPv6, PrefixTrie
 
 
-def test__init():
+@pytest.mark.parametrize("address, ip, ipv4_, net, prefixlen", [
+    ("10.0.0.1/24", "10.0.0.1", "10.0.0.1/24", "10.0.0.0/24", 24),
+    ("10.0.0.1", "10.0.0.1", "10.0.0.1/32", "10.0.0.1/32", 32),
+    ("10.0.0.1/255.255.255.0", "10.0.0.1", "10.0.0.1/24", "10.0.0.0/24", 24),
+    ("0.0.0.0/0", "0.0.0.0", "0.0.0.0/0", "0.0.0.0/0", 0),
+    ("2001:DB8::1/64", "2001:db8::1", "2001:db8::1/64", "2001:db8::/64", 64),
+])
+def test__init(address, ip, ipv4_, net, prefixlen):
     """IPv4.__init__()."""
-    ipv4 = IPv4("10.0.0.1/24")
-    assert ipv4.ip == "10.0.0.1"
-    assert ipv4.ipv4 == "10.0.0.1/24"
-    assert ipv4.net == "10.0.0.0/24"
-    assert ipv4.prefixlen == 24
+    obj = ipv4.init_ip(address)
+    assert obj.ip == ip
+    assert obj.ipv4 == ipv4_
+    assert obj.net == net
+    assert obj.prefixlen == prefixlen
+    assert str(obj) == ipv4_
+    assert isinstance(obj, IPv6) is (":" in address)
+
+
+@pytest.mark.parametrize("address, strict, error", [
+    ("10.0.0.1/24", True, ValueError),
+    ("10.0.0/24", False, ValueError),
+    ("10.0.0.256/24", False, ValueError),
+    ("10.0.0.a/24", False, ValueError),
+    ("10.0.0.0/33", False, ValueError),
+    ("10.0.0.0/255.0.255.0", False, ValueError),
+    ("2001:db8::1/64", True, ValueError),
+    ("2001:db8::/129", False, ValueError),
+    ("2001:db8::x/64", False, ValueError),
+])
+def test__init__invalid(address, strict, error):
+    """IPv4.__init__() invalid address."""
+    with pytest.raises(error):
+        ipv4.init_ip(address, strict=strict)
 
 
 @pytest.mark.parametrize("subnet, supernet, expected", [
@@ -24,9 +51,61 @@ def test__init():
     ("10.0.0.1/24", "10.0.0.0/25", False),
     ("10.0.0.0/32", "10.0.0.0/32", True),
     ("10.0.0.1/32", "10.0.0.0/32", False),
-
+    ("10.0.0.1/32", "0.0.0.0/0", True),
+    ("2001:db8::1/64", "2001:db8::/32", True),
+    ("2001:db8::/32", "2001:db8::1/64", False),
+    ("2001:db8::/32", "0.0.0.0/0", False),
+    ("10.0.0.0/24", "::/0", False),
 ])
 def test__contains__(subnet, supernet, expected):
     """IPv4.__contains__()."""
-    actual = IPv4(subnet) in IPv4(supernet)
+    actual = ipv4.init_ip(subnet) in ipv4.init_ip(supernet)
     assert actual == expected
+
+
+@pytest.mark.parametrize("subnet, expected", [
+    ("10.0.0.0/24", ["0.0.0.0/0", "10.0.0.0/8", "10.0.0.0/16", "10.0.0.0/16", "10.0.0.0/24"]),
+    ("10.0.0.1/24", ["0.0.0.0/0", "10.0.0.0/8", "10.0.0.0/16", "10.0.0.0/16", "10.0.0.0/24"]),
+    ("10.0.0.1/32", ["0.0.0.0/0", "10.0.0.0/8", "10.0.0.0/16", "10.0.0.0/16", "10.0.0.0/24"]),
+    ("10.0.0.0/15", ["0.0.0.0/0", "10.0.0.0/8"]),
+    ("10.1.0.0/24", ["0.0.0.0/0", "10.0.0.0/8"]),
+    ("11.0.0.0/24", ["0.0.0.0/0"]),
+])
+def test__supernets(subnet, expected):
+    """PrefixTrie.supernets() same as IPv4.__contains__()."""
+    prefixes = [
+        "10.0.0.0/16",
+        "10.0.0.0/24",
+        "10.0.0.0/8",
+        "0.0.0.0/0",
+        "10.0.0.0/16",
+        "10.0.1.0/24",
+    ]
+    items = [{"id": i, "ipv4": IPv4(s)} for i, s in enumerate(prefixes)]
+    trie = PrefixTrie(items)
+    assert len(trie) == len(prefixes)
+
+    actual = trie.supernets(IPv4(subnet))
+    assert [str(d["ipv4"].net) for d in actual] == expected
+    assert {d["id"] for d in actual} == {d["id"] for d in items if IPv4(subnet) in d["ipv4"]}
+    if len(actual) > 3:
+        assert [d["id"] for d in actual][2:4] == [0, 4]  # the same prefixes in added order
+
+
+def test__sort_key():
+    """ipv4.sort_key() same order as IPv4.__lt__()."""
+    addresses = ["10.0.0.2/24", "::1/128", "10.0.0.0/16", "10.0.0.1/24", "1.0.0.0/8"]
+    items = [ipv4.init_ip(s) for s in addresses]
+    actual = [str(o) for o in sorted(items)]
+    assert actual == ["1.0.0.0/8", "10.0.0.0/16", "10.0.0.1/24", "10.0.0.2/24", "::1/128"]
+    assert sorted(items, key=ipv4.sort_key) == sorted(items)
+
+
+def test__eq__():
+    """IPv4.__eq__() __hash__()."""
+    assert IPv4("10.0.0.1/24") == IPv4("10.0.0.1/24")
+    assert IPv4("10.0.0.1/24") != IPv4("10.0.0.0/24")
+    assert IPv4("0.0.0.1/32") != IPv6("::1/32")
+    assert IPv4("10.0.0.1/24") != "10.0.0.1/24"
+    assert len({IPv4("10.0.0.1/24"), IPv4("10.0.0.1/24"), IPv4("10.0.0.1/25")}) == 2
+    assert not hasattr(IPv4("10.0.0.1/24"), "__dict__")
@@ -2,7 +2,9 @@
 
 """Unittests foragers."""
 import inspect
+from datetime import datetime, timezone
 from pathlib import Path
+from urllib.parse import unquote
 from unittest.mock import Mock
 from unittest.mock import patch, mock_open
 
@@ -76,16 +78,31 @@ def test__init(nbf: NbForager):
         "verify",
         "limit",
         "url_length",
+        "batch_size",
         "threads",
         "interval",
+        "preflight",
+        "rate_limit",
+        "burst",
+        "max_in_flight",
         "timeout",
         "max_retries",
         "sleep",
+        "max_sleep",
+        "retry_statuses",
+        "deadline",
         "strict",
+        "http_cache",
+        "http_cache_ttl",
+        "http_cache_size",
+        "http_cache_dir",
         "extended_get",
+        "id_cache_ttl",
         "default_get",
         "loners",
         "cache",
+        "compression",
+        "compresslevel",
         "kwargs",
     ]
     assert actual == expected
@@ -98,14 +115,21 @@ def test__init(nbf: NbForager):
     assert nbf.api.ipam.aggregates.verify is True
     assert nbf.api.ipam.aggregates.limit == 1000
     assert nbf.api.ipam.aggregates.url_length == 2047
+    assert nbf.api.ipam.aggregates.batch_size == 100
     assert nbf.api.ipam.aggregates.threads == 1
     assert nbf.api.ipam.aggregates.interval == 0.0
+    assert nbf.api.ipam.aggregates.preflight is True
+    assert nbf.api.ipam.aggregates.rate_limit == 0.0
+    assert nbf.api.ipam.aggregates.burst == 1
+    assert nbf.api.ipam.aggregates.max_in_flight == 0
     assert nbf.api.ipam.aggregates.timeout == 60
     assert nbf.api.ipam.aggregates.max_retries == 0
     assert nbf.api.ipam.aggregates.sleep == 10
     assert nbf.api.ipam.aggregates._default_get == {}
     assert nbf.api.ipam.aggregates._loners == ["q", "prefix"]
     assert nbf.cache == "netbox.pickle"
+    assert nbf.compression == ""
+    assert nbf.compresslevel == 0
 
     params = {
         "host": "netbox",
@@ -222,6 +246,11 @@ def test__copy(nbf: NbForager):
     copy_ = nbf.copy()
     assert nbf.count() == 1
     assert copy_.count() == 1
+    assert copy_.api._session is nbf.api._session
+    assert copy_.api._executor is nbf.api._executor
+    assert copy_.api._pacer is nbf.api._pacer
+    assert copy_.api._limiter is nbf.api._limiter
+    assert copy_.api.ipam.vrfs._executor is nbf.api._executor
 
     nbf.root.ipam.vrfs.update(objects.vrf_d([2]))
     copy_.root.ipam.vrfs.update(objects.vrf_d([3, 4]))
@@ -239,13 +268,35 @@ def test__read_cache(nbf: NbForager):
     tree.ipam.vrfs.update(objects.vrf_d([1]))  # pylint: disable=E1101
     meta = {"write_time": "2000-12-31 23:59:59"}
     return_value = {"tree": tree.model_dump(), "status": {"meta": meta}}
-    patch("pathlib.Path.open", mock_open()).start()
-    patch("pickle.load", return_value=return_value).start()
-    assert nbf.root.ipam.vrfs == {}
+    with patch("pathlib.Path.open", mock_open(read_data=b"")), \
+            patch("pickle.load", return_value=return_value):
+        assert nbf.root.ipam.vrfs == {}
 
-    nbf.read_cache()
-    assert nbf.root.ipam.vrfs[1]["id"] == 1
-    assert nbf.status["meta"] == meta
+        nbf.read_cache()
+        assert nbf.root.ipam.vrfs[1]["id"] == 1
+        assert nbf.status["meta"] == meta
+
+
+def test__read_cache__models(tmp_path: Path):
+    """NbForager.read_cache(models)."""
+    cache = str(tmp_path / "netbox.pickle")
+    nbf = NbForager(host="netbox", cache=cache)
+    nbf.root.ipam.vrfs.update(objects.vrf_d([1]))
+    nbf.root.dcim.sites.update({1: {"id": 1, "name": "SITE1"}})
+    nbf.write_cache()
+
+    nbf = NbForager(host="netbox", cache=cache)
+    nbf.read_cache(models=["ipam.vrfs"])
+    assert nbf.root.dcim.lazy_models() == ["sites"]
+    assert nbf.dcim.sites.count() == 1
+    assert nbf.root.dcim.lazy_models() == []
+    assert nbf.ipam.vrfs.count() == 1
+
+    nbf = NbForager(host="netbox", cache=cache)
+    nbf.read_cache(models=[])
+    nbf.clear()
+    assert nbf.root.dcim.lazy_models() == []
+    assert nbf.count() == 0
 
 
 def test__write_cache(nbf: NbForager, monkeypatch: MonkeyPatch):
@@ -256,6 +307,83 @@ def test__write_cache(nbf: NbForager, monkeypatch: MonkeyPatch):
     nbf.write_cache()
 
 
+def test__sync(nbf: NbForager, monkeypatch: MonkeyPatch):
+    """NbForager.sync()."""
+    monkeypatch.setattr(NbForager, "_write_cache", Mock())
+    nbf.root.ipam.vrfs.update(objects.vrf_d([1, 2, 3]))
+    nbf.root.virtualization.interfaces.update(
+        {1: {"id": 1, "name": "eth0", "url": "https://netbox/api/virtualization/interfaces/1/"}}
+    )
+    nbf.root.set_loaded("dcim.sites")  # requested, no objects
+    nbf.status = {"meta": {"write_time": "2000-12-31 23:59:59"}}
+    since = "2000-12-31T23:58:59+00:00"
+
+    with requests_mock.Mocker() as mock:
+        mock.get("https://netbox/api/status/", json={},
+                 headers={"Date": "Mon, 01 Jan 2001 00:00:00 GMT"})
+        mock.get("https://netbox/api/ipam/vrfs/", json={"results": [
+            {"id": 2, "name": "VRF 22", "url": "https://netbox/api/ipam/vrfs/2/"},
+            {"id": 4, "name": "VRF 4", "url": "https://netbox/api/ipam/vrfs/4/"},
+        ]})
+        mock.get("https://netbox/api/virtualization/interfaces/", json={"results": []})
+        mock.get("https://netbox/api/dcim/sites/", json={"results": [
+            {"id": 1, "name": "SITE1", "url": "https://netbox/api/dcim/sites/1/"},
+        ]})
+        mock.get("https://netbox/api/extras/object-changes/?action=delete", json={"results": [
+            {"id": 1, "changed_object_type": "ipam.vrf", "changed_object_id": 3,
+             "url": "https://netbox/api/extras/object-changes/1/"},
+            {"id": 2, "changed_object_type": "virtualization.vminterface", "changed_object_id": 1,
+             "url": "https://netbox/api/extras/object-changes/2/"},
+            {"id": 3, "changed_object_type": "dcim.device", "changed_object_id": 1,
+             "url": "https://netbox/api/extras/object-changes/3/"},
+        ]})
+        nbf.sync()
+        urls = [unquote(r.url) for r in mock.request_history if "status" not in r.path]
+
+    assert len(urls) == 4
+    assert all(f"={since}" in s for s in urls)
+    assert sorted(nbf.root.ipam.vrfs) == [1, 2, 4]
+    assert nbf.root.ipam.vrfs[2]["name"] == "VRF 22"
+    assert nbf.root.virtualization.interfaces == {}
+    assert list(nbf.root.dcim.sites) == [1]
+    write_time = NbForager._write_cache.call_args.kwargs["write_time"]  # type: ignore
+    assert write_time == datetime(2001, 1, 1, tzinfo=timezone.utc)
+
+
+def test__write_cache__meta(nbf: NbForager, monkeypatch: MonkeyPatch):
+    """NbForager._write_cache() meta, the requested models without objects are included."""
+    monkeypatch.setattr(NbCache, "write_cache", Mock())
+    nbf.root.ipam.vrfs.update(objects.vrf_d([1]))
+    nbf.root.set_loaded("dcim.sites")
+    nbf.root.tenancy.set_lazy("tenants", dict)
+    nbf.write_cache()
+
+    meta = nbf.status["meta"]
+    assert meta["models"] == ["dcim.sites", "ipam.vrfs", "tenancy.tenants"]
+    write_time = datetime.fromisoformat(meta["write_time"])
+    assert write_time.tzinfo is not None
+    assert nbf.root.tenancy.lazy_models() == ["tenants"]
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2000-12-31 23:59:59", datetime(2000, 12, 31, 23, 59, 59, tzinfo=timezone.utc)),
+    ("2000-12-31T23:59:59+00:00", datetime(2000, 12, 31, 23, 59, 59, tzinfo=timezone.utc)),
+    ("2001-01-01T02:59:59+03:00", datetime(2000, 12, 31, 23, 59, 59, tzinfo=timezone.utc)),
+])
+def test__parse_time(value, expected):
+    """nb_forager._parse_time()."""
+    actual = nb_forager._parse_time(value)
+    assert actual == expected
+
+
+def test__sync__no_cache(tmp_path: Path):
+    """NbForager.sync() without cache write_time."""
+    nbf = NbForager(host="netbox", cache=str(tmp_path / "netbox.pickle"))
+    nbf.root.ipam.vrfs.update(objects.vrf_d([1]))
+    with pytest.raises(ValueError):
+        nbf.sync()
+
+
 def test__get_status(nbf: NbForager):
     """NbForager.get_status()."""
     with requests_mock.Mocker() as mock:
@@ -355,6 +483,7 @@ def test__print_warnings(nbf_r: NbForager, caplog):
     ({"cache": "/sub/dir", "name": None, "host": "host"}, r"\sub\dir\host.pickle"),
     ({"cache": "/sub/dir", "name": "name", "host": None}, r"\sub\dir\name.pickle"),
     ({"cache": "/sub/dir", "name": "name", "host": "host"}, r"\sub\dir\name.host.pickle"),
+    ({"cache": "name.jsonl", "name": "name", "host": "host"}, "name.jsonl"),
 ])
 def test__make_cache_path(kwargs, expected):
     """nb_foragers.make_cache_path()."""
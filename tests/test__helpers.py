@@ -6,6 +6,7 @@ from typing import Any
 import pytest
 
 from netbox3 import helpers as h, NbForager
+from netbox3.nb_tree import NbTree
 
 IP1 = "10.0.0.1/24"
 IP2 = "10.0.0.2/24"
@@ -58,6 +59,44 @@ def test__model_to_attr(model, expected):
     assert actual == expected
 
 
+@pytest.mark.parametrize("model, expected", [
+    ("", ""),
+    ("devices", "device"),
+    ("ip_addresses", "ipaddress"),
+    ("prefixes", "prefix"),
+    ("journal_entries", "journalentry"),
+    ("virtual_chassis", "virtualchassis"),
+    ("object_changes", "objectchange"),
+])
+def test__attr_to_content_type(model, expected):
+    """helpers.attr_to_content_type()"""
+    actual = h.attr_to_content_type(model)
+    assert actual == expected
+
+
+@pytest.mark.parametrize("app, model, expected", [
+    ("dcim", "devices", "dcim.device"),
+    ("ipam", "ip_addresses", "ipam.ipaddress"),
+    ("users", "permissions", "users.objectpermission"),
+    ("users", "users", "auth.user"),
+    ("virtualization", "interfaces", "virtualization.vminterface"),
+])
+def test__content_type(app, model, expected):
+    """helpers.content_type()"""
+    actual = h.content_type(app, model)
+    assert actual == expected
+
+
+def test__content_type__all():
+    """helpers.CONTENT_TYPES covers all NbTree models."""
+    actual = sorted(h.CONTENT_TYPES)
+    tree = NbTree()
+    expected = sorted(f"{a}.{m}" for a in tree.apps() for m in getattr(tree, a).models())
+    assert actual == expected
+    with pytest.raises(KeyError):
+        h.content_type("ipam", "typo")
+
+
 @pytest.mark.parametrize("nb_objects, expected", [
     ([], []),
     ([{"url": "a"}], ["a"]),
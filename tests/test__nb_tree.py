@@ -1,6 +1,10 @@
 # pylint: disable=E0237,E1101,W0212
 
 """Unittests nb_tree.py."""
+import pickle
+import threading
+import time
+from copy import copy, deepcopy
 from typing import Any
 
 import pytest
@@ -25,6 +29,110 @@ def test__insert_tree():
     assert dst.ipam.vrfs[1]["id"] == 2
 
 
+def test__insert_tree__lazy():
+    """models.tree.insert_tree() lazy models are not loaded."""
+    src = NbTree()
+    src.ipam.set_lazy("vrfs", lambda: objects.vrf_d([1]))
+    dst = NbTree()
+
+    nb_tree.insert_tree(src=src, dst=dst)
+    assert src.ipam.lazy_models() == ["vrfs"]
+    assert dst.ipam.lazy_models() == ["vrfs"]
+    assert dst.ipam.vrfs[1]["id"] == 1
+    assert dst.ipam.lazy_models() == []
+    assert src.ipam.lazy_models() == ["vrfs"]
+
+
+def test__insert_tree__loaded():
+    """models.tree.insert_tree() loaded models without objects are inserted."""
+    src = NbTree()
+    src.set_loaded("ipam.vrfs", "dcim.sites")
+    dst = NbTree()
+    dst.set_loaded("ipam.vlans")
+
+    nb_tree.insert_tree(src=src, dst=dst)
+    assert src.loaded_models() == ["dcim.sites", "ipam.vrfs"]
+    assert dst.loaded_models() == ["dcim.sites", "ipam.vlans", "ipam.vrfs"]
+
+
+def test__set_lazy():
+    """BaseTree.set_lazy()"""
+    tree = NbTree()
+    tree.ipam.vrfs.update(objects.vrf_d([2]))
+    tree.ipam.vrfs[2]["name"] = "VRF22"
+    tree.ipam.set_lazy("vrfs", lambda: objects.vrf_d([1, 2]))
+    assert tree.ipam.lazy_models() == ["vrfs"]
+    assert tree.ipam.count() == 2
+    assert tree.ipam.lazy_models() == []
+    assert [d["name"] for d in tree.ipam.vrfs.values()] == ["VRF22", "VRF1"]
+
+    tree.ipam.set_lazy("vrfs", lambda: objects.vrf_d([3]))
+    tree.ipam.clear_lazy()
+    assert list(tree.ipam.vrfs) == [2, 1]
+
+    with pytest.raises(ValueError):
+        tree.ipam.set_lazy("typo", dict)
+
+
+def test__set_lazy__threads():
+    """BaseTree.__getattribute__() concurrent access waits for the single load."""
+    tree = NbTree()
+    calls = []
+    started = threading.Event()
+
+    def load():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return objects.vrf_d([1])
+
+    tree.ipam.set_lazy("vrfs", load)
+    lengths = {}
+
+    def access(idx: int):
+        if idx:
+            started.wait(1)
+        lengths[idx] = len(tree.ipam.vrfs)
+
+    threads = [threading.Thread(target=access, args=(i,)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert lengths == {0: 1, 1: 1, 2: 1}
+    assert calls == [1]
+    assert tree.ipam.lazy_models() == []
+
+
+def test__set_lazy__error():
+    """BaseTree.__getattribute__() the loader is kept if the load raises an error."""
+    tree = NbTree()
+    errors = [OSError("cache"), OSError("cache")]
+
+    def load():
+        if errors:
+            raise errors.pop()
+        return objects.vrf_d([1])
+
+    tree.ipam.set_lazy("vrfs", load)
+    for _ in range(2):
+        with pytest.raises(OSError):
+            _ = tree.ipam.vrfs
+        assert tree.ipam.lazy_models() == ["vrfs"]
+    assert list(tree.ipam.vrfs) == [1]
+    assert tree.ipam.lazy_models() == []
+
+
+def test__lazy_loader():
+    """nb_tree.LazyLoader copy and pickle."""
+    loader = nb_tree.LazyLoader(nb_tree.LazyLoader(dict))
+    assert loader.load is dict
+    assert loader() == {}
+    for copied in [copy(loader), deepcopy(loader), pickle.loads(pickle.dumps(loader))]:
+        assert copied.load is dict
+        assert copied.lock is not loader.lock
+
+
 def test__count():
     """NbTree.count()"""
     tree = NbTree()
@@ -227,12 +335,41 @@ def test__join_tree__circuit_terminations():
     assert root.dcim.interfaces[1]["cable"].get("a_terminations") is None
 
 
+def test__join_tree__in_place():
+    """nb_tree.join_tree(in_place)."""
+    root = NbTree()
+    tenant = {k: v for k, v in objects.TENANT1.items() if k in ["id", "url", "name", "tags"]}
+    tenant["custom_fields"] = {"env": {"values": [1, 2]}}
+    root.tenancy.tenants = {d["id"]: d for d in [tenant]}
+    tag = {k: v for k, v in objects.TAG1.items() if k in ["id", "url", "name", "color"]}
+    root.extras.tags = {d["id"]: d for d in [tag]}
+
+    # structural sharing
+    tree = nb_tree.join_tree(tree=root)
+    tenant_ = tree.tenancy.tenants[1]
+    assert tenant_["tags"][0]["color"] == "aa1409"
+    assert tenant_ is not tenant
+    assert tenant_["custom_fields"] is not tenant["custom_fields"]
+    assert tenant_["custom_fields"]["env"] is tenant["custom_fields"]["env"]
+    assert tenant["tags"][0].get("color") is None
+
+    # in place
+    generation = root.generation
+    tree = nb_tree.join_tree(tree=root, in_place=True)
+    assert tree is root
+    assert root.generation > generation
+    assert tenant["tags"][0]["color"] == "aa1409"
+
+
 @pytest.mark.parametrize("urls, expected, errors", [
     ([], [], []),
     (["/api/ipam/vrfs/1"], [], []),
     (["/api/ipam/vrfs/9"], ["/api/ipam/vrfs/9"], []),
     (["/api/typo/vrfs/1"], [], [True]),
     (["/api/ipam/typo/1"], [], [True]),
+    (["/api/ipam/vrfs/9", "/api/ipam/vrfs/1", "/api/ipam/vrfs/9/"],
+     ["/api/ipam/vrfs/9", "/api/ipam/vrfs/9"], []),
+    (["/api/typo/vrfs/1", "/api/typo/vrfs/1"], [], [True, True]),
 ])
 def test__missed_urls(
         caplog,
@@ -244,3 +381,63 @@ def test__missed_urls(
     assert actual == expected
     logs = [record.levelname == "ERROR" for record in caplog.records]
     assert logs == errors
+
+
+def test__url_index():
+    """nb_tree.UrlIndex."""
+    tree = objects.full_tree()
+    index = nb_tree.UrlIndex(tree)
+
+    url = "/api/ipam/ip-addresses/1/"
+    assert index.get(url) is tree.ipam.ip_addresses[1]
+    assert index.get(url) is tree.ipam.ip_addresses[1]
+    assert index._urls[url] == (tree.ipam.ip_addresses, 1)
+    assert index.get("https://netbox/api/ipam/ip-addresses/9/") == {}
+    assert index.get("/api/ipam/l2vpns/typo") == {}  # empty model
+    assert index.model("ipam", "ip_addresses") is tree.ipam.ip_addresses
+
+    with pytest.raises(AttributeError):
+        index.get("/api/typo/ip-addresses/1")
+    with pytest.raises(ValueError):
+        index.get("/api/ipam/ip-addresses/typo")
+    assert "/api/ipam/ip-addresses/typo" not in index._urls
+
+
+def test__url_index__build():
+    """nb_tree.UrlIndex.build()."""
+    tree = NbTree()
+    tree.dcim.devices.update({  # pylint: disable=E1101
+        1: {"id": 1, "url": "https://netbox/api/dcim/devices/1/"},
+        2: {"id": 2, "url": "https://netbox/api/dcim/devices/2/"},
+        3: {"id": 3, "url": "https://netbox/api/dcim/devices/03/"},
+        4: {"id": 4},
+    })
+    tree.ipam.vrfs.update({  # pylint: disable=E1101
+        1: {"id": 1, "url": "/api/ipam/vrfs/1"},
+        2: {"id": 2, "url": "https://netbox/api/ipam/prefixes/2/"},
+    })
+    index = nb_tree.UrlIndex(tree)
+    index.build()
+    assert list(index._urls) == [
+        "https://netbox/api/dcim/devices/1/",
+        "https://netbox/api/dcim/devices/2/",
+        "/api/ipam/vrfs/1",
+    ]
+    devices = tree.dcim.devices  # pylint: disable=E1101
+    assert index.get("https://netbox/api/dcim/devices/2/") is devices[2]
+    assert index.get("https://netbox/api/dcim/devices/03/") is devices[3]
+    assert index.get("https://netbox/api/ipam/prefixes/2/") == {}
+
+
+@pytest.mark.parametrize("url, app, model, id_, expected", [
+    ("https://netbox/api/dcim/devices/1/", "dcim", "devices", 1,
+     ("https://netbox/api/dcim/devices/", "/")),
+    ("/api/ipam/ip-addresses/10", "ipam", "ip_addresses", 10, ("/api/ipam/ip-addresses/", "")),
+    ("https://netbox/api/dcim/devices/1/", "dcim", "devices", 2, ("", "")),
+    ("https://netbox/api/dcim/devices/1/", "dcim", "sites", 1, ("", "")),
+    ("https://netbox/api/dcim/devices/01/", "dcim", "devices", 1, ("", "")),
+])
+def test__url_template(url, app, model, id_, expected):
+    """nb_tree._url_template()."""
+    actual = nb_tree._url_template(url=url, app=app, model=model, id_=id_)
+    assert actual == expected